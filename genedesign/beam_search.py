@@ -0,0 +1,161 @@
+import time
+import numpy as np
+from genedesign.checkers.gc_checker import GC_CODES
+from genedesign.checkers.hairpin_checker import CHUNK_SIZE, MIN_STEM, MIN_LOOP, MAX_LOOP
+from genedesign.segment_evaluator import FORBIDDEN_SCORES, PROMOTER_SCORES, HAIRPIN_SCORES, GC_SCORES
+from genedesign.seq_utils.dna_encoding import CODONS, codon_ids_to_codes, decode_codons, reverse_complement_codes
+from genedesign.seq_utils.hairpin_counter import kmer_codes, find_hairpins_batch
+
+# Cost of an extension failing a check: the score a Monte Carlo segment loses by failing it
+FORBIDDEN_COST = FORBIDDEN_SCORES[0] - FORBIDDEN_SCORES[1]
+PROMOTER_COST = PROMOTER_SCORES[0] - PROMOTER_SCORES[1]
+HAIRPIN_COST = HAIRPIN_SCORES[0] - HAIRPIN_SCORES[1]
+GC_COST = GC_SCORES[0] - GC_SCORES[1]
+
+# Codon usage costs: per rare codon, per natural-log unit of usage frequency, per repeat of a recent codon
+RARE_CODON_COST = 40
+FREQUENCY_COST = 10
+REPEAT_CODON_COST = 5
+REPEAT_SPAN = 10  # Number of preceding codons checked for repeats
+
+CONTEXT_CODONS = -(-CHUNK_SIZE // 3)  # Codons covering a hairpin chunk, the widest window any check looks at
+SIGNATURE_CODONS = 4  # Partial CDSs ending in the same codons compete for a single beam slot
+
+class BeamSearchEngine:
+    """
+    Designs the codons of a peptide by beam search, as an alternative to the Monte Carlo windows of
+    TranscriptDesigner.
+
+    The search keeps the beam_width lowest-cost partial CDSs and extends each by every synonymous
+    codon of the next amino acid, one codon at a time. An extension is charged for what it adds at
+    the end of the sequence: forbidden sites and promoter windows (either strand) ending in the new
+    codon, new hairpins in a last 50 bp already holding one, GC content of the last 50 bp out of
+    bounds, and the usage of the new codon (rarity, low frequency, repeats of recent codons). Ties
+    are broken by codon frequency, so the search is deterministic. Once time_budget seconds have
+    passed, the beam narrows to the single best path for the rest of the peptide.
+
+    As in dynamic programming over codon positions, partial CDSs ending in the same last
+    SIGNATURE_CODONS codons are merged, keeping the cheapest. Without this, the beam fills up with
+    variants differing only in codons far behind, which matter little to the checks still to come.
+
+    Attributes:
+        beam_width (int): Number of partial CDSs kept after each codon.
+        time_budget (float or None): Seconds after which the search turns greedy, None for no limit.
+    """
+
+    def __init__(self, forbidden_checker, promoter_checker, codon_checker, gc_checker, codon_weights,
+                 beam_width=16, time_budget=None):
+        """
+        Parameters:
+            forbidden_checker, promoter_checker, codon_checker, gc_checker: The initiated checkers.
+            codon_weights (dict): Maps each amino acid to its (codon, frequency) pairs.
+            beam_width (int): Number of partial CDSs kept after each codon.
+            time_budget (float or None): Seconds after which the search turns greedy, None for no limit.
+        """
+        self.forbidden_checker = forbidden_checker
+        self.promoter_checker = promoter_checker
+        self.gc_checker = gc_checker
+        self.beam_width = beam_width
+        self.time_budget = time_budget
+
+        # Synonymous codon ids of each amino acid, most frequent first
+        self.options = {aa: np.array([CODONS.index(codon) for codon, _ in sorted(codons, key=lambda c: -c[1])])
+                        for aa, codons in codon_weights.items()}
+        self.codon_costs = (RARE_CODON_COST * codon_checker.rare_by_id
+                            - FREQUENCY_COST * np.log(codon_checker.frequency_by_id))
+
+    def run(self, peptide):
+        """
+        Designs the codons of the peptide sequence.
+
+        Parameters:
+            peptide (str): The peptide sequence.
+
+        Returns:
+            list: One codon per amino acid, without a stop codon.
+
+        Raises:
+            ValueError: If the peptide holds an amino acid without codons, as the Monte Carlo engine does.
+        """
+        unknown = next((aa for aa in peptide if aa not in self.options), None)
+        if unknown is not None:
+            raise ValueError(f"Unknown amino acid '{unknown}' in peptide.")
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+
+        # Per step, the parent beam index and codon id of every beam entry, to trace the best path back
+        parents, choices = [], []
+        context = np.zeros((1, 0), dtype=np.int64)
+        costs = np.zeros(1)
+        for aa in peptide:
+            options = self.options[aa]
+            width = self.beam_width if deadline is None or time.monotonic() < deadline else 1
+
+            parent = np.repeat(np.arange(len(context)), len(options))
+            codon_ids = np.tile(options, len(context))
+            extended = np.hstack([context[parent], codon_ids[:, None]])[:, -CONTEXT_CODONS:]
+            totals = costs[parent] + self.extension_costs(extended)
+
+            # The cheapest extension of each signature, cheapest first
+            order = np.argsort(totals, kind='stable')
+            signatures = extended[order, -SIGNATURE_CODONS:] @ (64 ** np.arange(min(SIGNATURE_CODONS, extended.shape[1])))
+            keep = order[np.sort(np.unique(signatures, return_index=True)[1])[:width]]
+            context, costs = extended[keep], totals[keep]
+            parents.append(parent[keep])
+            choices.append(codon_ids[keep])
+
+        # Trace the lowest-cost entry back through the steps
+        path = []
+        entry = 0
+        for parent, codon_ids in zip(reversed(parents), reversed(choices)):
+            path.append(codon_ids[entry])
+            entry = parent[entry]
+        return decode_codons(np.array(path[::-1], dtype=np.int64))
+
+    def extension_costs(self, context):
+        """
+        Costs of the last codon of each row of context, given the codons before it.
+
+        Parameters:
+            context (np.ndarray): (n, length) codon ids, the new codon last.
+
+        Returns:
+            np.ndarray: The cost of each extension.
+        """
+        new_codons = context[:, -1]
+        costs = self.codon_costs[new_codons].copy()
+        costs += REPEAT_CODON_COST * (context[:, -REPEAT_SPAN - 1:-1] == new_codons[:, None]).sum(axis=1)
+
+        codes = codon_ids_to_codes(context)
+        length = codes.shape[1]
+
+        # Forbidden sites ending in the new codon
+        found = np.zeros(len(codes), dtype=bool)
+        for k, table in self.forbidden_checker.kmer_tables.items():
+            if length >= k:
+                found |= table[kmer_codes(codes[:, -(k + 2):], k)[0]].any(axis=1)
+        costs += FORBIDDEN_COST * found
+
+        # Promoter windows ending in the new codon, on either strand
+        frame = self.promoter_checker.sliding_frame
+        if length >= frame:
+            tail = codes[:, -(frame + 2):]
+            scores = np.maximum(self.promoter_checker.window_scores(tail).max(axis=1),
+                                self.promoter_checker.window_scores(reverse_complement_codes(tail)).max(axis=1))
+            costs += PROMOTER_COST * (scores >= self.promoter_checker.threshold)
+
+        # Hairpins whose second stem ends in the new codon, when the last 50 bp hold more than one
+        chunk = codes[:, -CHUNK_SIZE:]
+        width = chunk.shape[1]
+        total_pairs = np.zeros(len(codes), dtype=np.int64)
+        new_pairs = np.zeros(len(codes), dtype=np.int64)
+        for d, pairs in find_hairpins_batch(chunk, MIN_STEM, MIN_LOOP, MAX_LOOP):
+            total_pairs += pairs.sum(axis=1)
+            new_pairs += pairs[:, max(0, width - 2 - MIN_STEM - d):].sum(axis=1)
+        costs += HAIRPIN_COST * np.where(total_pairs > 1, new_pairs, 0)
+
+        # GC content of the last 50 bp
+        if width >= CHUNK_SIZE:
+            gc_content = GC_CODES[chunk].sum(axis=1) / width
+            costs += GC_COST * ((gc_content < self.gc_checker.min_gc) | (gc_content > self.gc_checker.max_gc))
+
+        return costs
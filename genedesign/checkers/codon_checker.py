@@ -1,6 +1,24 @@
 import sys
-import csv
 from collections import Counter  # Import Counter for counting codons
+from dataclasses import dataclass
+from typing import Mapping
+import numpy as np
+from genedesign import reference_data
+from genedesign.seq_utils.dna_encoding import CODONS
+
+@dataclass(frozen=True)
+class CodonState:
+    """
+    Codon usage state for a fixed list of leading codons, produced by CodonChecker.prepare.
+
+    Attributes:
+        codon_counts (Counter): Occurrences of each codon in the prefix.
+        total_codons (int): Number of codons in the prefix.
+        cai_product (float): Product of the usage frequencies of the prefix codons.
+    """
+    codon_counts: Counter
+    total_codons: int
+    cai_product: float
 
 class CodonChecker:
     """
@@ -21,31 +39,33 @@ class CodonChecker:
         - cai_value (float): CAI value.
     """
 
-    codon_frequencies: dict[str, float]
+    codon_frequencies: Mapping[str, float]
     rare_codons: list[str]
     rare_codon_threshold: float
+    diversity_threshold: float
+    rare_codon_limit: int
+    cai_threshold: float
+    frequency_by_id: np.ndarray
+    rare_by_id: np.ndarray
 
     def initiate(self) -> None:
         """
-        Loads codon usage data from a file and sets up the codon frequencies and rare codons.
+        Sets up the codon frequencies and rare codons from the shared codon usage table.
         """
-        codon_usage_file = 'genedesign/data/codon_usage.txt'
-        self.codon_frequencies = {}
-        self.rare_codons = []
+        usage = reference_data.codon_usage()
+        self.codon_frequencies = usage.frequencies
         self.rare_codon_threshold = 0.1  # Threshold for rare codon frequency
+        self.rare_codons = [codon for codon, freq in self.codon_frequencies.items() if freq < self.rare_codon_threshold]
 
-        with open(codon_usage_file, 'r') as f:
-            reader = csv.reader(f, delimiter='\t')
-            for row in reader:
-                if len(row) < 4:
-                    continue  # Skip invalid rows
-                codon = row[0].strip()
-                usage_freq = float(row[2].strip())
-                self.codon_frequencies[codon] = usage_freq
-                
-                # Identify rare codons
-                if usage_freq < self.rare_codon_threshold:
-                    self.rare_codons.append(codon)
+        # Thresholds a CDS must meet to be above board
+        self.diversity_threshold = 0.5
+        self.rare_codon_limit = 3
+        self.cai_threshold = 0.2
+
+        # Usage frequency and rarity of each codon id (see seq_utils.dna_encoding.CODONS), from the shared
+        # table's frequencies with the 0.01 that run assumes for codons missing from the table
+        self.frequency_by_id = np.nan_to_num(usage.frequency_by_id, nan=0.01)
+        self.rare_by_id = usage.frequency_by_id < self.rare_codon_threshold
 
     def run(self, cds: list[str]) -> tuple[bool, float, int, float]:
         """
@@ -75,13 +95,89 @@ class CodonChecker:
         cai_value = cai_product ** (1 / len(cai_numerators)) if cai_numerators else 0.0
 
         # Apply thresholds to determine if the codons are above board
-        diversity_threshold = 0.5
-        rare_codon_limit = 3
-        cai_threshold = 0.2
+        codons_above_board = (codon_diversity >= self.diversity_threshold and
+                              rare_codon_count <= self.rare_codon_limit and
+                              cai_value >= self.cai_threshold)
+
+        return codons_above_board, codon_diversity, rare_codon_count, cai_value
+
+    def prepare(self, prefix: list[str]) -> CodonState:
+        """
+        Tallies a fixed list of leading codons so that CDSs sharing it can be checked with run_incremental.
+
+        :param prefix: List of codons that every later CDS starts with.
+        :return: CodonState with the codon counts and CAI product of the prefix.
+        """
+        cai_product = 1
+        for codon in prefix:
+            cai_product *= self.codon_frequencies.get(codon, 0.01)
+        return CodonState(Counter(prefix), len(prefix), cai_product)
+
+    def run_incremental(self, state: CodonState, codons: list[str]) -> tuple[bool, float, int, float]:
+        """
+        Equivalent to run(prefix + codons), but only tallies the appended codons.
+
+        :param state: The state returned by prepare(prefix).
+        :param codons: List of codons following the prefix.
+        :return: Tuple containing a boolean, codon diversity, rare codon count, and CAI score.
+        """
+        total_codons = state.total_codons + len(codons)
+        if total_codons == 0:
+            return False, 0.0, 0, 0.0
+
+        codon_counts = state.codon_counts.copy()
+        codon_counts.update(codons)
+        codon_diversity = len(codon_counts) / total_codons
+        rare_codon_count = sum(codon_counts[codon] for codon in self.rare_codons if codon in codon_counts)
+
+        cai_product = state.cai_product
+        for codon in codons:
+            cai_product *= self.codon_frequencies.get(codon, 0.01)
+        cai_value = cai_product ** (1 / total_codons)
 
-        codons_above_board = (codon_diversity >= diversity_threshold and
-                              rare_codon_count <= rare_codon_limit and
-                              cai_value >= cai_threshold)
+        codons_above_board = (codon_diversity >= self.diversity_threshold and
+                              rare_codon_count <= self.rare_codon_limit and
+                              cai_value >= self.cai_threshold)
+
+        return codons_above_board, codon_diversity, rare_codon_count, cai_value
+
+    def run_incremental_batch(self, state: CodonState, codon_ids: np.ndarray) -> tuple:
+        """
+        Vectorized run_incremental for a batch of codon lists of equal length.
+
+        :param state: The state returned by prepare(prefix); its codons must be ACGT triplets.
+        :param codon_ids: (n, length) codon ids (see seq_utils.dna_encoding.CODONS) following the prefix.
+        :return: Tuple of arrays with the boolean, codon diversity, rare codon count, and CAI score of each list.
+        """
+        n, length = codon_ids.shape
+        total_codons = state.total_codons + length
+        if total_codons == 0:
+            return np.zeros(n, dtype=bool), np.zeros(n), np.zeros(n, dtype=np.int64), np.zeros(n)
+
+        # Count the distinct codons: each appended codon is new unless seen in the prefix or earlier in its list
+        seen = np.zeros(len(CODONS), dtype=bool)
+        seen[[CODONS.index(codon) for codon in state.codon_counts]] = True
+        distinct = np.full(n, len(state.codon_counts), dtype=np.int64)
+        for k in range(length):
+            new = ~seen[codon_ids[:, k]]
+            for earlier in range(k):
+                new &= codon_ids[:, k] != codon_ids[:, earlier]
+            distinct += new
+        codon_diversity = distinct / total_codons
+
+        prefix_rare = sum(count for codon, count in state.codon_counts.items() if codon in self.rare_codons)
+        rare_codon_count = prefix_rare + self.rare_by_id[codon_ids].sum(axis=1)
+
+        cai_product = np.full(n, state.cai_product)
+        for k in range(length):
+            cai_product = cai_product * self.frequency_by_id[codon_ids[:, k]]
+        # Python's float power, as in run_incremental; NumPy's vectorized power may differ in the last bit
+        exponent = 1 / total_codons
+        cai_value = np.array([product ** exponent for product in cai_product.tolist()])
+
+        codons_above_board = ((codon_diversity >= self.diversity_threshold) &
+                              (rare_codon_count <= self.rare_codon_limit) &
+                              (cai_value >= self.cai_threshold))
 
         return codons_above_board, codon_diversity, rare_codon_count, cai_value
 
@@ -1,8 +1,47 @@
+from dataclasses import dataclass
+import numpy as np
 from genedesign.seq_utils.reverse_complement import reverse_complement
+from genedesign.seq_utils.aho_corasick import AhoCorasick
+from genedesign.seq_utils.dna_encoding import encode_dna
+from genedesign.seq_utils.hairpin_counter import kmer_codes
+
+@dataclass(frozen=True)
+class ForbiddenSite:
+    """
+    An occurrence of a forbidden site.
+
+    Attributes:
+        position (int): Start of the occurrence on the forward strand.
+        site (str): The forbidden sequence, as listed in the checker.
+        strand (str): '+' if the site reads on the forward strand, '-' if on the reverse strand
+            (its reverse complement occurs on the forward strand).
+    """
+    position: int
+    site: str
+    strand: str
+
+@dataclass(frozen=True)
+class ForbiddenState:
+    """
+    Forbidden-site state for a fixed prefix, produced by ForbiddenSequenceChecker.prepare.
+
+    Attributes:
+        hits (tuple): The ForbiddenSite occurrences inside the prefix.
+        matcher_state (int): The automaton state after scanning the prefix.
+        length (int): The length of the prefix.
+        tail (str): The end of the prefix that a site reaching past it can start in.
+    """
+    hits: tuple
+    matcher_state: int
+    length: int
+    tail: str = ""
 
 class ForbiddenSequenceChecker:
     def __init__(self):
         self.forbidden = []
+        self.forbidden_rc = []
+        self.matcher = None
+        self.kmer_tables = {}
 
     def initiate(self):
         # Populate forbidden sequences
@@ -26,17 +65,125 @@ class ForbiddenSequenceChecker:
             "GCGGCCGC",  # NotI
             "AAGCTT",    # HindIII
         ]
+        # A site on the reverse strand is the reverse complement of the site on the forward strand
+        self.forbidden_rc = [reverse_complement(site) for site in self.forbidden]
+
+        # Compile both strands of every site into one automaton, so a single pass over the forward
+        # strand finds them all; the payload is (index into forbidden, strand)
+        patterns = [(site, (idx, '+')) for idx, site in enumerate(self.forbidden)]
+        patterns += [(site_rc, (idx, '-')) for idx, site_rc in enumerate(self.forbidden_rc)]
+        self.matcher = AhoCorasick(patterns)
+
+        # For batches: per site length k, a lookup table over 2-bit k-mer codes flagging the sites of
+        # either strand; the extra last entry is hit by k-mers with unknown bases (code -1)
+        for site, _ in patterns:
+            k = len(site)
+            if k not in self.kmer_tables:
+                self.kmer_tables[k] = np.zeros(4 ** k + 1, dtype=bool)
+            self.kmer_tables[k][kmer_codes(encode_dna(site), k)[0][0]] = True
 
     def run(self, dnaseq):
-        # Use the reverse_complement function from seq_utils
-        rc = reverse_complement(dnaseq)
-        combined = (dnaseq + "x" + rc).upper()
+        """
+        Checks a DNA sequence for forbidden sites on either strand.
+
+        Parameters:
+            dnaseq (str): The DNA sequence to check.
+
+        Returns:
+            tuple: (bool, str or None)
+                - True and None if no forbidden site is found.
+                - False and the first site of the forbidden list that is present otherwise.
+        """
+        return self._verdict(self.find_sites(dnaseq))
+
+    def find_sites(self, dnaseq):
+        """
+        Reports every forbidden site occurrence in a DNA sequence, on both strands.
+
+        Parameters:
+            dnaseq (str): The DNA sequence to scan.
+
+        Returns:
+            list: ForbiddenSite occurrences ordered by position.
+        """
+        hits, _ = self.matcher.scan(dnaseq.upper())
+        return self._to_sites(hits)
+
+    def prepare(self, prefix):
+        """
+        Scans a fixed prefix once so that sequences sharing it can be checked with run_incremental.
+
+        Parameters:
+            prefix (str): The DNA sequence that every later query starts with.
+
+        Returns:
+            ForbiddenState: The sites found in the prefix and the automaton state to resume from.
+        """
+        prefix = prefix.upper()
+        hits, matcher_state = self.matcher.scan(prefix)
+        longest = max(self.kmer_tables, default=1)
+        return ForbiddenState(tuple(self._to_sites(hits)), matcher_state, len(prefix), prefix[max(0, len(prefix) - longest + 1):])
+
+    def find_sites_incremental(self, state, suffix):
+        """
+        Equivalent to find_sites(prefix + suffix), but only scans the suffix, resuming the automaton
+        where the prefix left it.
+
+        Parameters:
+            state (ForbiddenState): The state returned by prepare(prefix).
+            suffix (str): The DNA sequence following the prefix.
+
+        Returns:
+            list: ForbiddenSite occurrences ordered by position.
+        """
+        hits, _ = self.matcher.scan(suffix.upper(), state.matcher_state, state.length)
+        return sorted(state.hits + tuple(self._to_sites(hits)), key=lambda hit: hit.position)
+
+    def run_incremental(self, state, suffix):
+        """
+        Equivalent to run(prefix + suffix), but only scans the suffix.
+
+        Parameters:
+            state (ForbiddenState): The state returned by prepare(prefix).
+            suffix (str): The DNA sequence following the prefix.
+
+        Returns:
+            tuple: (bool, str or None), as for run.
+        """
+        return self._verdict(self.find_sites_incremental(state, suffix))
+
+    def run_incremental_batch(self, state, codes):
+        """
+        Vectorized pass/fail of run_incremental for a batch of suffixes of equal length.
+
+        Parameters:
+            state (ForbiddenState): The state returned by prepare(prefix).
+            codes (np.ndarray): (n, length) base codes of the suffixes (see seq_utils.dna_encoding).
+
+        Returns:
+            np.ndarray: True for each suffix with no forbidden site in prefix + suffix.
+        """
+        if state.hits:
+            return np.zeros(len(codes), dtype=bool)
+
+        # Only the sites ending in the suffix remain to be found
+        tail = np.broadcast_to(encode_dna(state.tail), (len(codes), len(state.tail)))
+        region = np.hstack([tail, codes])
+        found = np.zeros(len(codes), dtype=bool)
+        for k, table in self.kmer_tables.items():
+            found |= table[kmer_codes(region, k)[0]].any(axis=1)
+        return ~found
 
-        for site in self.forbidden:
-            if site in combined:
-                return False, site
+    def _to_sites(self, hits):
+        sites = [ForbiddenSite(position, self.forbidden[idx], strand) for position, (idx, strand) in hits]
+        sites.sort(key=lambda hit: hit.position)
+        return sites
 
-        return True, None
+    def _verdict(self, sites):
+        # Report the first site of the forbidden list that is present, whatever its position
+        if not sites:
+            return True, None
+        return False, min(sites, key=lambda hit: self.forbidden.index(hit.site)).site
 
 def main():
     checker = ForbiddenSequenceChecker()
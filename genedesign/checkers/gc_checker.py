@@ -1,3 +1,8 @@
+import numpy as np
+
+# Base code (see seq_utils.dna_encoding) -> 1 for G and C
+GC_CODES = np.array([0, 1, 1, 0, 0], dtype=np.int64)
+
 class GCContentChecker:
     def __init__(self, min_gc=0.45, max_gc=0.55):
         """
@@ -26,3 +31,53 @@ class GCContentChecker:
         is_within_bounds = self.min_gc <= gc_content <= self.max_gc
         return is_within_bounds, gc_content
 
+
+    def prepare(self, prefix: str) -> tuple[int, int]:
+        """
+        Counts the GC bases of a fixed prefix so that sequences sharing it can be checked with run_incremental.
+
+        Parameters:
+            prefix (str): The DNA sequence that every later query starts with.
+
+        Returns:
+            tuple: (int, int) with the GC count and the length of the prefix.
+        """
+        return prefix.count('G') + prefix.count('C'), len(prefix)
+
+    def run_incremental(self, state: tuple[int, int], suffix: str) -> tuple[bool, float]:
+        """
+        Equivalent to run(prefix + suffix), but only counts the bases of the suffix.
+
+        Parameters:
+            state (tuple): The state returned by prepare(prefix).
+            suffix (str): The DNA sequence following the prefix.
+
+        Returns:
+            tuple: (bool, float), as for run.
+        """
+        prefix_gc, prefix_len = state
+        length = prefix_len + len(suffix)
+        if not length:
+            return False, 0.0
+
+        gc_content = (prefix_gc + suffix.count('G') + suffix.count('C')) / length
+        return self.min_gc <= gc_content <= self.max_gc, gc_content
+
+    def run_incremental_batch(self, state: tuple[int, int], codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized run_incremental for a batch of suffixes of equal length.
+
+        Parameters:
+            state (tuple): The state returned by prepare(prefix).
+            codes (np.ndarray): (n, length) base codes of the suffixes (see seq_utils.dna_encoding).
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) with the pass/fail and the GC content of each suffix.
+        """
+        prefix_gc, prefix_len = state
+        length = prefix_len + codes.shape[1]
+        if not length:
+            return np.zeros(len(codes), dtype=bool), np.zeros(len(codes))
+
+        gc_content = (prefix_gc + GC_CODES[codes].sum(axis=1)) / length
+        return (self.min_gc <= gc_content) & (gc_content <= self.max_gc), gc_content
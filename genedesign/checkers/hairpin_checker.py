@@ -1,11 +1,36 @@
-from genedesign.seq_utils.hairpin_counter import hairpin_counter
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+from genedesign.seq_utils.hairpin_counter import find_hairpins, format_hairpins, find_hairpins_batch
+from genedesign.seq_utils.dna_encoding import encode_dna
+
+CHUNK_SIZE = 50  # 50 bp window
+OVERLAP = 25     # Overlap by 25 bp
+MIN_STEM = 3     # Minimum number of bases in the stem
+MIN_LOOP = 4     # Minimum number of bases in the loop
+MAX_LOOP = 9     # Maximum number of bases in the loop
+
+@dataclass(frozen=True)
+class HairpinState:
+    """
+    Hairpin state for a fixed prefix, produced by prepare_hairpin_state.
+
+    Attributes:
+        prefix (str): The prefix.
+        pairs (tuple): The (i, j) stem pairs lying entirely inside the prefix.
+    """
+    prefix: str
+    pairs: tuple
 
 def hairpin_checker(dna):
     """
     Checks for bad hairpin structures in the DNA sequence by splitting it into 50 bp chunks with
-    an overlap of 25 bp, and passing each chunk to hairpin_counter. If any chunk has more than
+    an overlap of 25 bp and counting the hairpins of each chunk. If any chunk has more than
     1 hairpin, it returns False and the problematic hairpin string. Otherwise, it returns True and None.
 
+    The stem pairs of the whole sequence are found in a single pass and then assigned to the chunks
+    containing both stems, so overlapping chunks do not analyze the same bases twice.
+
     Parameters:
         dna (str): The DNA sequence to analyze.
 
@@ -14,26 +39,139 @@ def hairpin_checker(dna):
             - True and None if no problematic hairpins are found.
             - False and the problematic hairpin string if more than one hairpin is found in any chunk.
     """
-    chunk_size = 50  # 50 bp window
-    overlap = 25     # Overlap by 25 bp
-    min_stem = 3     # Minimum number of bases in the stem
-    min_loop = 4     # Minimum number of bases in the loop
-    max_loop = 9     # Maximum number of bases in the loop
-    
-    # Iterate over the sequence in 50 bp chunks with 25 bp overlap
-    for i in range(0, len(dna) - chunk_size + 1, overlap):
-        chunk = dna[i:i + chunk_size]
-        
-        # Get the count of hairpins and the hairpin string from hairpin_counter
-        hairpin_count, hairpin_string = hairpin_counter(chunk, min_stem, min_loop, max_loop)
-        
-        # If more than 1 hairpin is found, return False and the problematic hairpin string
-        if hairpin_count > 1:
-            return False, hairpin_string
-    
-    # If no problematic hairpin chunk is found, return True and None
+    return _check_chunks(dna, find_hairpins(dna, MIN_STEM, MIN_LOOP, MAX_LOOP))
+
+def hairpin_chunk_counts(dna):
+    """
+    Counts the hairpins of every 50 bp chunk (overlapping by 25 bp) checked by hairpin_checker.
+
+    Parameters:
+        dna (str): The DNA sequence to analyze.
+
+    Returns:
+        list: The hairpin count of the chunk starting at k * 25 bp, for each chunk k.
+    """
+    return _chunk_counts(len(dna), find_hairpins(dna, MIN_STEM, MIN_LOOP, MAX_LOOP))
+
+def crowded_hairpins(dna):
+    """
+    Finds the hairpins that make hairpin_checker fail: the stem pairs of every chunk holding more than one.
+
+    Parameters:
+        dna (str): The DNA sequence to analyze.
+
+    Returns:
+        list: The (i, j) start positions of the two stems of each such hairpin, ordered by i and then j.
+    """
+    pairs = find_hairpins(dna, MIN_STEM, MIN_LOOP, MAX_LOOP)
+    crowded = set()
+    for chunk, count in enumerate(_chunk_counts(len(dna), pairs)):
+        if count > 1:
+            start = chunk * OVERLAP
+            crowded.update((i, j) for i, j in pairs if i >= start and j + MIN_STEM <= start + CHUNK_SIZE)
+    return sorted(crowded)
+
+def _chunk_counts(length, pairs):
+    """Assigns (i, j) stem pairs to the chunks containing both stems and counts them per chunk."""
+    counts = [0] * len(range(0, length - CHUNK_SIZE + 1, OVERLAP))
+    for i, j in pairs:
+        # A chunk contains the pair when it starts at or before i and ends at or after the second stem
+        first = max(0, -((CHUNK_SIZE - j - MIN_STEM) // OVERLAP))
+        for chunk in range(first, min(i // OVERLAP + 1, len(counts))):
+            counts[chunk] += 1
+    return counts
+
+def _check_chunks(dna, pairs):
+    """Applies the hairpin_checker verdict to the stem pairs of dna, ordered by i and then j."""
+    for chunk, count in enumerate(_chunk_counts(len(dna), pairs)):
+        if count > 1:
+            start = chunk * OVERLAP
+            chunk_pairs = [(i, j) for i, j in pairs if i >= start and j + MIN_STEM <= start + CHUNK_SIZE]
+            return False, format_hairpins(dna, chunk_pairs, MIN_STEM)
     return True, None
 
+def prepare_hairpin_state(prefix):
+    """
+    Finds the stem pairs inside a fixed prefix once so that sequences sharing it can be checked
+    with hairpin_checker_incremental.
+
+    Parameters:
+        prefix (str): The DNA sequence that every later query starts with.
+
+    Returns:
+        HairpinState: The prefix and the stem pairs found inside it.
+    """
+    return HairpinState(prefix, tuple(find_hairpins(prefix, MIN_STEM, MIN_LOOP, MAX_LOOP)))
+
+def prefix_fails_hairpins(state):
+    """
+    Returns True if the prefix of the state alone has a chunk with more than one hairpin, so that
+    hairpin_checker_incremental fails whatever the suffix.
+    """
+    return any(count > 1 for count in _chunk_counts(len(state.prefix), state.pairs))
+
+def hairpin_checker_incremental(state, suffix):
+    """
+    Equivalent to hairpin_checker(prefix + suffix), but only searches for stem pairs that reach
+    into the suffix; pairs inside the prefix come from the state.
+
+    Parameters:
+        state (HairpinState): The state returned by prepare_hairpin_state(prefix).
+        suffix (str): The DNA sequence following the prefix.
+
+    Returns:
+        tuple: (bool, str or None), as for hairpin_checker.
+    """
+    dna = state.prefix + suffix
+    boundary = len(state.prefix)
+    # A pair reaches the suffix when its second stem ends past the boundary, which needs the first
+    # stem to start at most (2 * stem + max loop - 1) bases before it
+    reach = 2 * MIN_STEM + MAX_LOOP - 1
+    new_pairs = [(i, j) for i, j in find_hairpins(dna, MIN_STEM, MIN_LOOP, MAX_LOOP, boundary - reach)
+                 if j + MIN_STEM > boundary]
+    return _check_chunks(dna, sorted(state.pairs + tuple(new_pairs)))
+
+def hairpin_checker_batch(state, codes):
+    """
+    Vectorized pass/fail of hairpin_checker_incremental for a batch of suffixes of equal length.
+
+    Parameters:
+        state (HairpinState): The state returned by prepare_hairpin_state(prefix).
+        codes (np.ndarray): (n, length) base codes of the suffixes (see seq_utils.dna_encoding).
+
+    Returns:
+        np.ndarray: True for each suffix where no chunk of prefix + suffix has more than 1 hairpin.
+    """
+    boundary = len(state.prefix)
+    length = boundary + codes.shape[1]
+    reach = 2 * MIN_STEM + MAX_LOOP - 1
+    offset = max(0, boundary - reach)
+    head = encode_dna(state.prefix[offset:])
+    region = np.hstack([np.broadcast_to(head, (len(codes), len(head))), codes])
+
+    # Chunk counts of the prefix pairs plus those of the pairs reaching into each suffix
+    counts = np.tile(np.array(_chunk_counts(length, state.pairs), dtype=np.int64), (len(codes), 1))
+    for d, pairs in find_hairpins_batch(region, MIN_STEM, MIN_LOOP, MAX_LOOP):
+        counts += pairs @ _chunk_membership(offset, pairs.shape[1], d, boundary, length)
+    return (counts <= 1).all(axis=1)
+
+@lru_cache(maxsize=1024)
+def _chunk_membership(offset, n_starts, d, boundary, length):
+    """
+    (first stem start, chunk) matrix assigning the pairs (offset + i, offset + i + d) that reach past
+    boundary to the chunks containing them, as _chunk_counts does.
+    """
+    n_chunks = len(range(0, length - CHUNK_SIZE + 1, OVERLAP))
+    membership = np.zeros((n_starts, n_chunks), dtype=np.int64)
+    for start in range(n_starts):
+        i = offset + start
+        j = i + d
+        if j + MIN_STEM > boundary:
+            first = max(0, -((CHUNK_SIZE - j - MIN_STEM) // OVERLAP))
+            membership[start, first:min(i // OVERLAP + 1, n_chunks)] = 1
+    membership.setflags(write=False)
+    return membership
+
 # Example usage
 if __name__ == "__main__":
     result, hairpin = hairpin_checker("AAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAACCCCAAAAAAAGGGGAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA")
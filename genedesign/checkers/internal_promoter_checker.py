@@ -1,5 +1,33 @@
 import math
-from genedesign.seq_utils.reverse_complement import reverse_complement
+from dataclasses import dataclass
+import numpy as np
+from genedesign.seq_utils.dna_encoding import encode_dna, reverse_complement_codes, UNKNOWN
+
+# Separates the sequence from its reverse complement when both strands are scanned in one pass
+SEPARATOR = np.array([UNKNOWN], dtype=np.uint8)
+
+# Complements bases in a string, leaving other characters unchanged
+COMPLEMENT_TABLE = str.maketrans("ACGT", "TGCA")
+
+@dataclass(frozen=True)
+class PromoterState:
+    """
+    PWM state for a fixed prefix, produced by PromoterChecker.prepare.
+
+    Attributes:
+        prefix (str): The upper-cased prefix.
+        prefix_rc (str): The reverse complement of the prefix, which ends the scanned sequence.
+        codes (np.ndarray): Base codes of the prefix.
+        rc_codes (np.ndarray): Base codes of prefix_rc.
+        head_hit (int or None): Start of the first promoter window lying inside the prefix.
+        tail_hit (int or None): Start, within prefix_rc, of the first promoter window lying inside it.
+    """
+    prefix: str
+    prefix_rc: str
+    codes: np.ndarray
+    rc_codes: np.ndarray
+    head_hit: int
+    tail_hit: int
 
 class PromoterChecker:
     """
@@ -9,8 +37,12 @@ class PromoterChecker:
     to scan a sequence of DNA and evaluate whether a constitutive promoter is present. The `run` method
     evaluates both the input sequence and its reverse complement.
 
+    Scoring is vectorized with NumPy: sequences are encoded once as base codes and the scores of all
+    windows are gathered from the PWM in one pass, for a single sequence or for a batch of them.
+
     Attributes:
         pwm: A 2D list representing the Position Weight Matrix (PWM) used to score sequences.
+        pwm_array: The PWM as a (29, 5) array indexed by [position, base code]; unknown bases score 0.
     """
 
     def __init__(self):
@@ -19,6 +51,9 @@ class PromoterChecker:
         The PWM will be computed later in the initiate method.
         """
         self.pwm = None
+        self.pwm_array = None
+        self.sliding_frame = 29  # The sliding window size is 29 nucleotides.
+        self.threshold = 9.134   # A threshold score for detecting promoter activity.
 
     def initiate(self):
         """
@@ -48,6 +83,13 @@ class PromoterChecker:
                 w = (math.log((freq + math.sqrt(total) * prob_base) / (total + math.sqrt(total)) / prob_base)) / math.log(2)
                 self.pwm[y][x] = w
 
+        # Position-major copy of the PWM with a zero column for unknown bases (and the strand separator)
+        self.pwm_array = np.zeros((ncols, 5))
+        self.pwm_array[:, :4] = np.array(self.pwm).T
+        self._positions = np.arange(ncols)
+        self._window_index = np.empty((0, ncols), dtype=np.intp)
+        self._empty_state = self.prepare("")
+
     def run(self, seq):
         """
         Checks if the given DNA sequence contains a constitutive sigma70 promoter.
@@ -63,27 +105,165 @@ class PromoterChecker:
                 - bool: True if no promoter is found, False if a promoter is found.
                 - str: The promoter sequence if found, None otherwise.
         """
-        # Convert the sequence to uppercase and compute its reverse complement.
-        seq = seq.upper()
-        rc = reverse_complement(seq)
-        combined = seq + "x" + rc  # Concatenate the original sequence and its reverse complement.
-
-        sliding_frame = 29  # The sliding window size is 29 nucleotides.
-        threshold = 9.134   # A threshold score for detecting promoter activity.
-
-        # Slide over the sequence and calculate the score for each window.
-        for i in range(len(combined) - sliding_frame + 1):
-            score = 0.0
-            partseq = combined[i:i + sliding_frame]
-            for x, base in enumerate(partseq):
-                # Map the base to its corresponding row in the PWM
-                y = {'A': 0, 'C': 1, 'G': 2, 'T': 3}.get(base, -1)
-                if y != -1:
-                    score += self.pwm[y][x]
-            # If the score exceeds the threshold, the sequence likely contains a constitutive promoter.
-            if score >= threshold:
-                return False, partseq  # Promoter found, return the sequence
-        return True, None  # No promoter detected in the sequence
+        return self.run_incremental(self._empty_state, seq)
+
+    def scan(self, seq):
+        """
+        Finds the best scoring promoter window of a DNA sequence on either strand.
+
+        Parameters:
+            seq (str): A DNA sequence to scan.
+
+        Returns:
+            tuple: (float, int or None, str or None)
+                - The maximum window score (-inf if the sequence is shorter than the PWM).
+                - The start of that window on the forward strand.
+                - '+' if the window reads on the forward strand, '-' if on the reverse strand.
+        """
+        scores, positions, strands = self.scan_batch([seq])
+        if positions[0] < 0:
+            return float('-inf'), None, None
+        return float(scores[0]), int(positions[0]), str(strands[0])
+
+    def scan_batch(self, seqs):
+        """
+        Finds the best scoring promoter window of every sequence of a batch in one vectorized call.
+
+        Parameters:
+            seqs (list): DNA sequences to scan; they may have different lengths.
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray, np.ndarray) with, for each sequence, the maximum window score
+            (-inf if shorter than the PWM), its start on the forward strand (-1 if none) and its strand
+            ('+' or '-', '' if none).
+        """
+        frame = self.sliding_frame
+        lengths = np.array([len(seq) for seq in seqs])
+        width = max(int(lengths.max(initial=0)), frame)
+
+        # Encode the batch into a matrix padded with unknown bases
+        codes = np.full((len(seqs), width), UNKNOWN, dtype=np.uint8)
+        for row, seq in enumerate(seqs):
+            codes[row, :len(seq)] = encode_dna(seq.upper())
+        # Reversing the padded rows puts the padding first: rc window j starts at n - j - frame forward
+        rc_codes = reverse_complement_codes(codes)
+
+        starts = np.arange(width - frame + 1)
+        forward = self.window_scores(codes)
+        forward[starts[None, :] > (lengths[:, None] - frame)] = -np.inf
+        reverse = self.window_scores(rc_codes)
+        reverse[starts[None, :] < (width - lengths[:, None])] = -np.inf
+
+        scores = np.concatenate([forward, reverse], axis=1)
+        best = scores.argmax(axis=1)
+        max_scores = scores[np.arange(len(seqs)), best]
+        on_forward = best < len(starts)
+        positions = np.where(on_forward, best, width - (best - len(starts)) - frame)
+        found = np.isfinite(max_scores)
+        return (max_scores, np.where(found, positions, -1),
+                np.where(found, np.where(on_forward, '+', '-'), ''))
+
+    def prepare(self, prefix):
+        """
+        Scores the windows inside a fixed prefix once so that sequences sharing it can be checked
+        with run_incremental.
+
+        Parameters:
+            prefix (str): The DNA sequence that every later query starts with.
+
+        Returns:
+            PromoterState: The encoded prefix and the first promoter windows found inside it.
+        """
+        prefix = prefix.upper()
+        codes = encode_dna(prefix)
+        rc_codes = reverse_complement_codes(codes)
+        return PromoterState(prefix, prefix.translate(COMPLEMENT_TABLE)[::-1], codes, rc_codes,
+                             self._first_hit(codes), self._first_hit(rc_codes))
+
+    def run_incremental(self, state, suffix):
+        """
+        Equivalent to run(prefix + suffix), but only scores the windows overlapping the suffix; the
+        windows lying inside the prefix or its reverse complement were scored by prepare.
+
+        The sequence is scanned as in the original sliding window: the sequence, a separator and its
+        reverse complement are scored as one string, in that order, and the first window reaching the
+        threshold is reported.
+
+        Parameters:
+            state (PromoterState): The state returned by prepare(prefix).
+            suffix (str): The DNA sequence following the prefix.
+
+        Returns:
+            tuple: (bool, str or None), as for run.
+        """
+        frame = self.sliding_frame
+        suffix = suffix.upper()
+        suffix_codes = encode_dna(suffix)
+        middle = np.concatenate([suffix_codes, SEPARATOR, reverse_complement_codes(suffix_codes)])
+
+        # Scanned sequence: prefix + middle + prefix_rc; windows touching middle start after offset
+        offset = max(0, len(state.prefix) - (frame - 1))
+        region = np.concatenate([state.codes[offset:], middle, state.rc_codes[:frame - 1]])
+
+        hit = state.head_hit
+        if hit is None:
+            hit = self._first_hit(region)
+            if hit is not None:
+                hit += offset
+            elif state.tail_hit is not None:
+                hit = len(state.prefix) + len(middle) + state.tail_hit
+        if hit is None:
+            return True, None
+
+        combined = state.prefix + suffix + "x" + suffix.translate(COMPLEMENT_TABLE)[::-1] + state.prefix_rc
+        return False, combined[hit:hit + frame]
+
+    def run_incremental_batch(self, state, codes):
+        """
+        Vectorized pass/fail of run_incremental for a batch of suffixes of equal length.
+
+        Parameters:
+            state (PromoterState): The state returned by prepare(prefix).
+            codes (np.ndarray): (n, length) base codes of the suffixes (see seq_utils.dna_encoding).
+
+        Returns:
+            np.ndarray: True for each suffix with no promoter in prefix + suffix, on either strand.
+        """
+        if state.head_hit is not None or state.tail_hit is not None:
+            return np.zeros(len(codes), dtype=bool)
+
+        # Same scanned region as run_incremental, one row per suffix
+        frame = self.sliding_frame
+        offset = max(0, len(state.prefix) - (frame - 1))
+        n = len(codes)
+        region = np.hstack([np.broadcast_to(state.codes[offset:], (n, len(state.codes) - offset)),
+                            codes, np.broadcast_to(SEPARATOR, (n, 1)), reverse_complement_codes(codes),
+                            np.broadcast_to(state.rc_codes[:frame - 1], (n, min(frame - 1, len(state.rc_codes))))])
+        return ~(self.window_scores(region) >= self.threshold).any(axis=1)
+
+    def window_scores(self, codes):
+        """
+        Scores every window of an encoded sequence, or of every row of a 2D array of them.
+
+        Parameters:
+            codes (np.ndarray): Base codes (see seq_utils.dna_encoding), with the sequence along the last axis.
+
+        Returns:
+            np.ndarray: The PWM score of the window starting at each position.
+        """
+        n_windows = codes.shape[-1] - self.sliding_frame + 1
+        if n_windows <= 0:
+            return np.empty(codes.shape[:-1] + (0,))
+        # Gather the bases of every window through a cached (window, position) index matrix
+        if len(self._window_index) < n_windows:
+            self._window_index = np.arange(n_windows)[:, None] + self._positions
+        windows = codes[..., self._window_index[:n_windows]]
+        return self.pwm_array[self._positions, windows].sum(axis=-1)
+
+    def _first_hit(self, codes):
+        """Start of the first window reaching the threshold, or None."""
+        hits = np.flatnonzero(self.window_scores(codes) >= self.threshold)
+        return int(hits[0]) if hits.size else None
 
 
 if __name__ == "__main__":
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import asdict
+from genedesign import reference_data
+from genedesign.models.rbs_option import RBSOption
+from genedesign.models.transcript import Transcript
+
+DEFAULT_MAX_ENTRIES = 10000  # Designs kept before the least recently used ones are evicted
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class DesignCache:
+    """
+    A persistent, size-bounded LRU cache of designed transcripts in a local SQLite database.
+
+    A design is keyed by everything it depends on (see design_key): the peptide, the state of the
+    designer's random stream when the design started, the ignored RBS options, the design parameters
+    and checker settings, and digests of the data files and of the genedesign sources. Entries
+    therefore never go stale: a changed input gives a new key, and old entries age out of the LRU.
+    Each entry also stores the random stream state after the design, so a designer served from the
+    cache continues exactly as if it had designed the transcript itself.
+
+    Several processes may share one cache file; SQLite serializes their writes.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Opens (creating if needed) the cache database.
+
+        Parameters:
+            path (str): The SQLite database file.
+            max_entries (int): Number of designs kept before evicting the least recently used.
+        """
+        if max_entries < 1:
+            raise ValueError("The design cache must hold at least one entry.")
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS designs (key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                                " last_used REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS designs_last_used ON designs (last_used)")
+
+    def get(self, key):
+        """
+        Returns the cached design of the key, marking it as recently used.
+
+        Returns:
+            tuple: (Transcript, dict) the transcript and the random stream state after its design, or
+            None if the key is not cached.
+        """
+        row = self.connection.execute("SELECT value FROM designs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.connection.execute("UPDATE designs SET last_used = ? WHERE key = ?", (time.time(), key))
+        value = json.loads(row[0])
+        return Transcript(RBSOption(**value['rbs']), value['peptide'], value['codons']), value['rng_state']
+
+    def put(self, key, transcript, rng_state):
+        """
+        Stores a design, evicting the least recently used designs beyond max_entries.
+
+        Parameters:
+            key (str): The design key.
+            transcript (Transcript): The designed transcript.
+            rng_state (dict): The random stream state after the design.
+        """
+        value = json.dumps({'rbs': asdict(transcript.rbs), 'peptide': transcript.peptide,
+                            'codons': list(transcript.codons), 'rng_state': rng_state})
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute("INSERT OR REPLACE INTO designs VALUES (?, ?, ?)", (key, value, time.time()))
+            self.connection.execute("DELETE FROM designs WHERE key IN (SELECT key FROM designs ORDER BY last_used DESC"
+                                    " LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM designs").fetchone()[0]
+
+    def clear(self):
+        """Removes every cached design."""
+        self.connection.execute("DELETE FROM designs")
+
+    def close(self):
+        self.connection.close()
+
+def design_settings(designer):
+    """
+    Returns a digest of everything other than the peptide, random stream and ignores that a design of
+    the initiated TranscriptDesigner depends on: its parameters, its checker settings, and the
+    contents of its data files and of the genedesign sources.
+    """
+    codon_checker = designer.codon_checker
+    settings = (designer.engine, designer.beam_width, designer.window_size, designer.downstream_size,
+                designer.max_attempts, designer.first_batch_size, designer.preamble_codons_count,
+                designer.window_memo_size > 0, designer.adaptive_search, designer.min_progress,
+                designer.mutants_per_round,
+                tuple(designer.forbidden_checker.forbidden), designer.promoter_checker.threshold,
+                codon_checker.rare_codon_threshold, codon_checker.diversity_threshold,
+                codon_checker.rare_codon_limit, codon_checker.cai_threshold,
+                designer.gc_checker.min_gc, designer.gc_checker.max_gc,
+                designer.codon_usage_file, designer.rbs_chooser.merged_data_file)
+    # Hashing the settings and reading the files costs more than a cache hit, so it is done once per settings
+    digest = _settings_digests.get(settings)
+    if digest is None:
+        files = [reference_data.file_digest(path) for path in settings[-2:]]
+        payload = json.dumps([settings, files, source_digest()])
+        digest = _settings_digests[settings] = hashlib.sha256(payload.encode()).hexdigest()
+    return digest
+
+# design_settings digest of each settings tuple seen in this process
+_settings_digests = {}
+
+def design_key(settings, peptide, rng_state, ignores):
+    """
+    Returns the cache key of one design.
+
+    Parameters:
+        settings (str): The design_settings digest of the designer.
+        peptide (str): The peptide sequence.
+        rng_state (dict): The state of the designer's random stream before the design (the bit
+            generator state), which stands for the seed and every draw made since.
+        ignores (set): The ignored RBS options.
+    """
+    ignored = sorted((rbs.gene_name, rbs.utr) for rbs in ignores)
+    payload = json.dumps([settings, peptide, rng_state, ignored], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def source_digest():
+    """SHA-256 of the genedesign Python sources, computed once per process."""
+    return reference_data.load_once('source_digest', PACKAGE_DIR, _read_source_digest)
+
+def _read_source_digest(package_dir):
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(root, name)
+                digest.update(os.path.relpath(path, package_dir).encode())
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
@@ -9,15 +9,36 @@ class OperonDesigner:
     Constructs a DNA sequence for a (co)cistronic operon based on a Composition object that specifies an engineered organism.
     """
 
-    def __init__(self):
+    def __init__(self, workers: int = 1, optimal_rbs: bool = None):
+        """
+        Parameters:
+            workers (int): Number of processes designing the transcripts of an operon concurrently;
+                1 designs them one after another in this process.
+            optimal_rbs (bool): Whether to assign the RBSs of all transcripts together at the least
+                total score (see RBSChooser.assign) rather than greedily in protein order. Defaults
+                to True in the parallel mode (workers > 1) and False otherwise.
+        """
         self.td = None
+        self.workers = workers
+        self.optimal_rbs = workers > 1 if optimal_rbs is None else optimal_rbs
+        self.executor = None
 
     def initiate(self) -> None:
         """
-        Initializes the TranscriptDesigner.
+        Initializes the TranscriptDesigner, and its worker processes in the parallel mode.
         """
         self.td = TranscriptDesigner()
         self.td.initiate()
+        if self.workers > 1:
+            self.executor = self.td.make_executor(self.workers)
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes of the parallel mode.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
 
     def run(self, comp: Composition) -> Operon:
         """
@@ -33,12 +54,13 @@ class OperonDesigner:
         organism = comp.host
         
         mRNAs = []
-        ignores = set()  # To track RBS options to ignore
         
-        for peptide in proteins:
-            mrna = self.td.run(peptide, ignores)
-            ignores.add(mrna.rbs)  # Avoid repeated RBS
-            mRNAs.append(mrna)
+        # Design all transcripts together, each with a different RBS
+        for result in self.td.run_batch(proteins, distinct_rbs=True, optimal_rbs=self.optimal_rbs,
+                                        executor=self.executor):
+            if result.error:
+                raise result.error
+            mRNAs.append(result.transcript)
         
         return Operon(mRNAs, comp.promoter, comp.terminator)
 
@@ -0,0 +1,158 @@
+import json
+import time
+from functools import wraps
+
+# Methods timed by instrument, per component of a TranscriptDesigner
+DESIGNER_STAGES = ('design_codons', 'monte_carlo_window', 'run', 'run_batch')
+EVALUATOR_STAGES = ('set_preamble', 'evaluate_batch', 'check_hairpins_batch')
+CHECKER_STAGES = ('run', 'run_incremental_batch')
+RBS_STAGES = ('run', 'run_batch', 'assign', 'hairpin_scores', 'hairpin_scores_batch', 'edit_distances')
+BEAM_STAGES = ('run', 'extension_costs')
+
+# Histogram of the number of candidates scored per Monte Carlo window
+ATTEMPTS_PER_WINDOW = 'attempts_per_window'
+
+class Profiler:
+    """
+    Call counts, cumulative times and histograms of the stages of a design.
+
+    Nothing is measured until instrument attaches the profiler to a designer: the instrumented
+    methods are wrapped on that designer's instances only, so designers that are not instrumented
+    (and the classes themselves) run the original code at no cost. Times are inclusive, so a stage
+    also counts the stages it calls.
+
+    Attributes:
+        calls (dict): Number of calls of each stage.
+        seconds (dict): Cumulative wall-clock seconds of each stage.
+        histograms (dict): Per histogram, the number of observations of each int value.
+    """
+
+    def __init__(self):
+        self.calls = {}
+        self.seconds = {}
+        self.histograms = {}
+
+    def record(self, stage, seconds):
+        """Counts one call of stage that took the given seconds."""
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def observe(self, histogram, value):
+        """Counts one observation of the int value in the histogram."""
+        counts = self.histograms.setdefault(histogram, {})
+        counts[value] = counts.get(value, 0) + 1
+
+    def timed(self, stage, function):
+        """
+        Returns function wrapped to record each of its calls as stage.
+
+        Parameters:
+            stage (str): The name of the stage.
+            function (callable): The function to time.
+        """
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.record(stage, time.perf_counter() - start)
+        wrapper.profiled = True
+        return wrapper
+
+    def to_dict(self):
+        """
+        Returns the measurements as a JSON-serializable dict: per stage its calls, total and mean time,
+        and per histogram its counts keyed by the value as a string.
+        """
+        return {
+            'stages': {stage: {'calls': self.calls[stage], 'total_s': self.seconds[stage],
+                               'mean_ms': 1000 * self.seconds[stage] / self.calls[stage]}
+                       for stage in sorted(self.calls)},
+            'histograms': {name: {str(value): count for value, count in sorted(counts.items())}
+                           for name, counts in sorted(self.histograms.items())},
+        }
+
+    def merge(self, data):
+        """
+        Adds measurements exported by to_dict, for instance those of a worker process.
+
+        Parameters:
+            data (dict): The to_dict output to add.
+        """
+        for stage, stats in data['stages'].items():
+            self.calls[stage] = self.calls.get(stage, 0) + stats['calls']
+            self.seconds[stage] = self.seconds.get(stage, 0.0) + stats['total_s']
+        for name, counts in data['histograms'].items():
+            histogram = self.histograms.setdefault(name, {})
+            for value, count in counts.items():
+                histogram[int(value)] = histogram.get(int(value), 0) + count
+
+    def drain(self):
+        """Returns the measurements as to_dict does and starts over from zero."""
+        data = self.to_dict()
+        self.calls, self.seconds, self.histograms = {}, {}, {}
+        return data
+
+    def save(self, path):
+        """Writes the measurements to path as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+def instrument_methods(profiler, obj, methods, prefix=None):
+    """
+    Wraps the given methods of one object (not of its class) to record their calls in profiler,
+    as '<prefix>.<method>' with the class name as default prefix. Missing or already wrapped methods
+    are skipped.
+    """
+    prefix = prefix or type(obj).__name__
+    for name in methods:
+        method = getattr(obj, name, None)
+        if method is None or getattr(method, 'profiled', False):
+            continue
+        setattr(obj, name, profiler.timed(f"{prefix}.{name}", method))
+
+def instrument(designer, profiler=None):
+    """
+    Attaches a profiler to an initiated TranscriptDesigner: its design stages, segment evaluator,
+    checkers, RBS chooser and beam search engine are timed, and the number of candidates scored by
+    each Monte Carlo window is counted in the ATTEMPTS_PER_WINDOW histogram.
+
+    Parameters:
+        designer (TranscriptDesigner): The designer to instrument.
+        profiler (Profiler): The profiler to record to, a new one by default.
+
+    Returns:
+        Profiler: The profiler.
+    """
+    if getattr(designer.monte_carlo_window, 'profiled', False):
+        raise ValueError("TranscriptDesigner is already instrumented.")
+    profiler = profiler or Profiler()
+    evaluator = designer.segment_evaluator
+
+    # Count the candidates each window scores through the evaluator it calls
+    attempts = [0]
+    evaluate_batch = evaluator.evaluate_batch
+    def counting_evaluate_batch(window_ids, *args, **kwargs):
+        attempts[0] += len(window_ids)
+        return evaluate_batch(window_ids, *args, **kwargs)
+    evaluator.evaluate_batch = counting_evaluate_batch
+
+    monte_carlo_window = designer.monte_carlo_window
+    def counting_monte_carlo_window(*args, **kwargs):
+        attempts[0] = 0
+        try:
+            return monte_carlo_window(*args, **kwargs)
+        finally:
+            profiler.observe(ATTEMPTS_PER_WINDOW, attempts[0])
+    designer.monte_carlo_window = counting_monte_carlo_window
+
+    instrument_methods(profiler, designer, DESIGNER_STAGES, 'TranscriptDesigner')
+    instrument_methods(profiler, evaluator, EVALUATOR_STAGES, 'SegmentEvaluator')
+    for checker in (evaluator.forbidden_checker, evaluator.promoter_checker, evaluator.codon_checker,
+                    evaluator.gc_checker):
+        instrument_methods(profiler, checker, CHECKER_STAGES)
+    instrument_methods(profiler, designer.rbs_chooser, RBS_STAGES, 'RBSChooser')
+    if designer.beam_search is not None:
+        instrument_methods(profiler, designer.beam_search, BEAM_STAGES, 'BeamSearchEngine')
+    return profiler
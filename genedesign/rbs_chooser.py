@@ -1,45 +1,288 @@
 import csv
-import pandas as pd  # type: ignore
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+import numpy as np
+from genedesign import reference_data
 from genedesign.models.rbs_option import RBSOption
 from genedesign.seq_utils.Translate import Translate
-from genedesign.seq_utils.hairpin_counter import hairpin_counter
-from genedesign.seq_utils.calc_edit_distance import calculate_edit_distance
-from typing import Set
+from genedesign.seq_utils.hairpin_counter import count_hairpins, find_hairpins_batch
+from genedesign.seq_utils.calc_edit_distance import EditDistanceIndex
+from genedesign.seq_utils.dna_encoding import encode_dna, UNKNOWN
+from typing import List, Optional, Set, Tuple
 import logging
 
+# Hairpin parameters used to score the UTR/CDS junction (the hairpin_counter defaults)
+MIN_STEM = 3
+MIN_LOOP = 4
+MAX_LOOP = 9
+
+# A stem pair crossing the UTR/CDS junction lies within this many bases on either side of it
+JUNCTION = 2 * MIN_STEM + MAX_LOOP - 1
+
+CACHE_SIZE = 1024  # Number of CDS heads and peptide heads memoized by each cache
+BATCH_SIZE = 256   # Number of CDS heads whose junctions are scanned together
+
+RBS_LIBRARY_VERSION = 1  # Bump whenever the content of the precompiled RBS library changes
+
+@dataclass(frozen=True)
+class RBSLibrary:
+    """
+    The RBS options of a merged data file with their precomputed features, as compiled by
+    compile_rbs_library.
+
+    Attributes:
+        options (tuple): The RBS options, in scoring order (sorted by gene name, UTR and CDS, so
+            that ties break the same way in every process).
+        utr_hairpins (np.ndarray): Read-only hairpin count inside each UTR.
+        utr_tails (np.ndarray): Read-only (option, JUNCTION) base codes of the end of each UTR, whose
+            stems can pair across the UTR/CDS junction, left-padded with UNKNOWN.
+    """
+    options: Tuple[RBSOption, ...]
+    utr_hairpins: np.ndarray
+    utr_tails: np.ndarray
+
+def compile_rbs_library(merged_data_file: str) -> RBSLibrary:
+    """
+    Builds the RBS library of a merged data CSV file: translates the first six amino acids of every
+    CDS and computes the UTR features that do not depend on the designed CDS.
+
+    Parameters:
+        merged_data_file (str): The CSV file with the locus tag in the first column and gene, UTR and CDS columns.
+
+    Returns:
+        RBSLibrary: The compiled library.
+    """
+    table = reference_data.rbs_table(merged_data_file)
+    translator = Translate()
+    translator.initiate()
+    # Translate the first 18 bases (first 6 amino acids) of every CDS at once
+    first_six_aas = translator.run_batch([cds[:18] for cds in table.cdss])
+    options = {RBSOption(utr=utr, cds=cds, gene_name=gene_name, first_six_aas=aas)
+               for utr, cds, gene_name, aas in zip(table.utrs, table.cdss, table.genes, first_six_aas)}
+    options = tuple(sorted(options, key=lambda rbs: (rbs.gene_name, rbs.utr, rbs.cds)))
+
+    utr_hairpins = np.array([count_hairpins(rbs.utr, MIN_STEM, MIN_LOOP, MAX_LOOP) for rbs in options], dtype=np.int64)
+    utr_tails = np.full((len(options), JUNCTION), UNKNOWN, dtype=np.uint8)
+    for row, rbs in enumerate(options):
+        tail = rbs.utr[-JUNCTION:]
+        utr_tails[row, JUNCTION - len(tail):] = encode_dna(tail)
+    utr_hairpins.setflags(write=False)
+    utr_tails.setflags(write=False)
+    return RBSLibrary(options, utr_hairpins, utr_tails)
+
+def rbs_library_file(merged_data_file: str) -> str:
+    """Returns the path of the precompiled library of a merged data file, next to it."""
+    return os.path.splitext(merged_data_file)[0] + '.rbslib'
+
+def save_rbs_library(library: RBSLibrary, merged_data_file: str) -> None:
+    """
+    Writes the precompiled library of a merged data file, stamped with the library version and a
+    digest of the file it was compiled from. The library holds only built-in types (strings,
+    ints, bytes), so it can be read back without pandas or NumPy pickles.
+
+    Parameters:
+        library (RBSLibrary): The library compiled from merged_data_file.
+        merged_data_file (str): The CSV file the library was compiled from.
+    """
+    payload = {
+        'version': RBS_LIBRARY_VERSION,
+        'source_digest': reference_data.file_digest(merged_data_file),
+        'options': [(rbs.utr, rbs.cds, rbs.gene_name, rbs.first_six_aas) for rbs in library.options],
+        'utr_hairpins': library.utr_hairpins.tolist(),
+        'utr_tails': library.utr_tails.tobytes(),
+    }
+    # Processes starting together may all recompile a stale library, so each writes its own temporary
+    # file and atomically replaces the library with it
+    path = rbs_library_file(merged_data_file)
+    f = tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.',
+                                    suffix='.tmp', delete=False)
+    try:
+        with f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.chmod(f.name, 0o644)  # NamedTemporaryFile creates files only their owner can read
+        os.replace(f.name, path)
+    except BaseException:
+        os.remove(f.name)
+        raise
+
+def load_rbs_library(merged_data_file: str = reference_data.MERGED_DATA_FILE) -> RBSLibrary:
+    """
+    Returns the RBS library of a merged data file, loaded once per process. The precompiled library
+    next to the file is used when its version and source digest match; otherwise the library is
+    compiled from the CSV file and saved for the next start, if the directory is writable.
+
+    Parameters:
+        merged_data_file (str): The CSV file with the locus tag in the first column and gene, UTR and CDS columns.
+
+    Returns:
+        RBSLibrary: The shared library.
+    """
+    return reference_data.load_once('rbs_library', merged_data_file, _read_rbs_library)
+
+def _read_rbs_library(merged_data_file):
+    try:
+        with open(rbs_library_file(merged_data_file), 'rb') as f:
+            payload = pickle.load(f)
+    except Exception:
+        payload = None  # Missing, truncated or otherwise unreadable: compiled again below
+
+    if (isinstance(payload, dict) and payload.get('version') == RBS_LIBRARY_VERSION
+            and payload.get('source_digest') == reference_data.file_digest(merged_data_file)):
+        options = tuple(RBSOption(utr=utr, cds=cds, gene_name=gene_name, first_six_aas=aas)
+                        for utr, cds, gene_name, aas in payload['options'])
+        utr_hairpins = np.array(payload['utr_hairpins'], dtype=np.int64)
+        utr_hairpins.setflags(write=False)
+        # frombuffer views the immutable bytes, so the array is read-only already
+        utr_tails = np.frombuffer(payload['utr_tails'], dtype=np.uint8).reshape(len(options), JUNCTION)
+        return RBSLibrary(options, utr_hairpins, utr_tails)
+
+    library = compile_rbs_library(merged_data_file)
+    try:
+        save_rbs_library(library, merged_data_file)
+    except OSError:
+        pass  # A read-only installation compiles the library at every start instead
+    return library
+
 class RBSChooser:
     """
     A class to select the best Ribosome Binding Site (RBS) for a given coding sequence (CDS),
     using a default merged data file unless specified otherwise.
     """
-    rbs_options = set()  # Class variable to hold all RBS options
-
     def __init__(self, merged_data_file: str = "genedesign/data/merged_data.csv"):
         self.translator = Translate()
         self.translator.initiate()
         self.merged_data_file = merged_data_file
 
+        # Loaded by initiate: the options, in scoring order, and their UTR features
+        self.rbs_options = frozenset()
+        self.options = []
+        self.utr_hairpins = None
+        self.utr_tails = None
+        self.peptide_index = None
+
+        # Per-option scores memoized by the first 30 bases of the CDS and by its first six amino acids
+        self.hairpin_cache = OrderedDict()
+        self.distance_cache = OrderedDict()
+
     def initiate(self):
         """
-        Populates the RBS options from the merged data CSV file, treating the first column as locus_tag.
+        Loads the RBS options of the merged data CSV file and their precomputed UTR features from the
+        precompiled RBS library, and indexes the options' first six amino acids for edit distances.
         """
-        df = pd.read_csv(self.merged_data_file, index_col=0)
-        
-        # Iterate over rows and create RBSOptions
-        for locus_tag, row in df.iterrows():
-            utr = row['UTR']
-            cds = row['CDS']
-            gene_name = row['gene']
-            
-            # Translate the first 18 bases (first 6 amino acids)
-            first_six_aas = self.translator.run(cds[:18])
-            rbs_option = RBSOption(
-                utr=utr,
-                cds=cds,
-                gene_name=gene_name,
-                first_six_aas=first_six_aas
-            )
-            RBSChooser.rbs_options.add(rbs_option)
+        library = load_rbs_library(self.merged_data_file)
+        self.rbs_options = frozenset(library.options)
+        self.options = list(library.options)
+        self.utr_hairpins = library.utr_hairpins
+        self.utr_tails = library.utr_tails
+        self.peptide_index = EditDistanceIndex([rbs.first_six_aas for rbs in self.options])
+        self.hairpin_cache.clear()
+        self.distance_cache.clear()
+
+    def hairpin_scores(self, cds: str) -> np.ndarray:
+        """
+        Counts the hairpins of rbs.utr + cds[:30] for every option, memoized by cds[:30].
+
+        Only the stems crossing the junction are counted per option; the UTR-internal hairpins were
+        counted by initiate and the CDS-internal ones are the same for every option.
+
+        Parameters:
+            cds (str): The coding DNA sequence.
+
+        Returns:
+            np.ndarray: The hairpin count of each option, in the order of self.options.
+        """
+        return self.hairpin_scores_batch([cds])[0]
+
+    def hairpin_scores_batch(self, cds_list: List[str]) -> np.ndarray:
+        """
+        Counts the hairpins of rbs.utr + cds[:30] for every option and every CDS, scanning the junctions
+        of all CDS heads missing from the cache together.
+
+        Parameters:
+            cds_list (List[str]): The coding DNA sequences.
+
+        Returns:
+            np.ndarray: (len(cds_list), len(self.options)) hairpin counts, options in the order of self.options.
+        """
+        heads = [cds[:30] for cds in cds_list]
+        scores = {}
+        for head in heads:
+            cached = _cache_get(self.hairpin_cache, head)
+            if cached is not None:
+                scores[head] = cached
+        missing = [head for head in dict.fromkeys(heads) if head not in scores]
+
+        for start in range(0, len(missing), BATCH_SIZE):
+            block = missing[start:start + BATCH_SIZE]
+            cds_codes = np.full((len(block), JUNCTION), UNKNOWN, dtype=np.uint8)
+            for row, head in enumerate(block):
+                cds_codes[row, :min(len(head), JUNCTION)] = encode_dna(head[:JUNCTION])
+
+            # One junction row per (CDS head, option) pair
+            junctions = np.hstack([np.tile(self.utr_tails, (len(block), 1)),
+                                   np.repeat(cds_codes, len(self.options), axis=0)])
+            crossing = np.zeros(len(junctions), dtype=np.int64)
+            for distance, pairs in find_hairpins_batch(junctions, MIN_STEM, MIN_LOOP, MAX_LOOP):
+                # Count the pairs whose first stem starts in the UTR and second stem reaches into the CDS
+                first = max(0, JUNCTION - MIN_STEM + 1 - distance)
+                crossing += pairs[:, first:JUNCTION].sum(axis=1)
+
+            for head, head_crossing in zip(block, crossing.reshape(len(block), len(self.options))):
+                scores[head] = self.utr_hairpins + head_crossing + count_hairpins(head, MIN_STEM, MIN_LOOP, MAX_LOOP)
+                _cache_put(self.hairpin_cache, head, scores[head])
+
+        return np.array([scores[head] for head in heads], dtype=np.int64).reshape(len(heads), len(self.options))
+
+    def edit_distances(self, first_six_aas: str) -> np.ndarray:
+        """
+        Computes the edit distance between each option's first six amino acids and the given ones,
+        memoized by the peptide.
+
+        Parameters:
+            first_six_aas (str): The first six amino acids of the CDS.
+
+        Returns:
+            np.ndarray: The edit distance of each option, in the order of self.options.
+        """
+        distances = _cache_get(self.distance_cache, first_six_aas)
+        if distances is None:
+            distances = self.peptide_index.distances(first_six_aas)
+            _cache_put(self.distance_cache, first_six_aas, distances)
+        return distances
+
+    def top_k(self, cds: str, k: int, ignores: Set[RBSOption] = frozenset()) -> List[RBSOption]:
+        """
+        Selects the k best RBS options for the given CDS, best first; ties keep the order of self.options.
+
+        The score of an option is its hairpin count plus the edit distance between its first six amino
+        acids and those of the CDS, computed for every option at once by edit_distances.
+
+        Parameters:
+            cds (str): The coding DNA sequence for which RBS options are to be selected.
+            k (int): The number of options to return.
+            ignores (Set[RBSOption]): A set of RBS options to ignore during selection.
+
+        Returns:
+            List[RBSOption]: Up to k options, ordered by increasing score.
+        """
+        first_six_aas_cds = self.translator.run(cds[:18])
+        return self._select(self.hairpin_scores(cds), first_six_aas_cds, k, ignores)
+
+    def _select(self, hairpins, first_six_aas_cds, k, ignores):
+        # The edit distances to every option come from one query of the peptide index, memoized by peptide
+        scores = hairpins + self.edit_distances(first_six_aas_cds)
+        selected = []
+        for idx in np.argsort(scores, kind='stable'):
+            rbs = self.options[idx]
+            if rbs in ignores:
+                continue
+            selected.append(rbs)
+            if len(selected) == k:
+                break
+        return selected
 
     def run(self, cds: str, ignores: Set[RBSOption]) -> RBSOption:
         """
@@ -52,32 +295,142 @@ class RBSChooser:
         Returns:
             RBSOption: The selected RBSOption object that best fits the given CDS.
         """
-        # Exclude ignored RBS options
-        valid_rbs_options = [rbs for rbs in RBSChooser.rbs_options if rbs not in ignores]
+        # Final score combines hairpin count and peptide similarity (edit distance between first six amino acids)
+        best = self.top_k(cds, 1, ignores)
+        if not best:
+            raise ValueError("No valid RBS options found after scoring.")
+        return best[0]
 
-        # Evaluate secondary structure (hairpin count) for each valid option
-        rbs_hairpin_scores = []
-        for rbs in valid_rbs_options:
-            combined_seq = rbs.utr + cds[:30]
-            hairpin_count, _ = hairpin_counter(combined_seq)
-            rbs_hairpin_scores.append((rbs, hairpin_count))
+    def run_batch(self, cds_list: List[str], ignores: Set[RBSOption] = frozenset(),
+                  distinct: bool = False, optimal: bool = False) -> List[Optional[RBSOption]]:
+        """
+        Executes the RBS selection process for several CDSs, scoring their hairpins together.
 
-        # Peptide similarity comparison (edit distance between first six amino acids)
-        rbs_scores = []
-        first_six_aas_cds = self.translator.run(cds[:18])
-        for rbs, hairpin_count in rbs_hairpin_scores:
-            edit_distance = calculate_edit_distance(rbs.first_six_aas, first_six_aas_cds)
-            # Final score combines hairpin count and edit distance
-            final_score = hairpin_count + edit_distance
-            rbs_scores.append((rbs, final_score))
+        Parameters:
+            cds_list (List[str]): The coding DNA sequences for which an RBS is to be selected.
+            ignores (Set[RBSOption]): A set of RBS options to ignore during selection.
+            distinct (bool): If True, no option is selected for two CDSs.
+            optimal (bool): With distinct, select the distinct options of least total score with assign
+                instead of letting each CDS take the best option left by the ones before it.
+
+        Returns:
+            List[Optional[RBSOption]]: The selected RBSOption of each CDS, None where no valid option is left.
+        """
+        if distinct and optimal:
+            return self.assign(cds_list, ignores)
 
-        # Sort RBS options by final score (lower score is better)
-        rbs_scores.sort(key=lambda x: x[1])
+        hairpins = self.hairpin_scores_batch(cds_list)
+        first_six_aas = self.translator.run_batch([cds[:18] for cds in cds_list])
 
-        if not rbs_scores:
-            raise ValueError("No valid RBS options found after scoring.")
-        
-        # Return the RBS with the best (lowest) score
+        ignores = set(ignores)
+        selected = []
+        for row, first_six_aas_cds in enumerate(first_six_aas):
+            best = self._select(hairpins[row], first_six_aas_cds, 1, ignores)
+            rbs = best[0] if best else None
+            if distinct and rbs is not None:
+                ignores.add(rbs)
+            selected.append(rbs)
+        return selected
+
+    def assign(self, cds_list: List[str], ignores: Set[RBSOption] = frozenset()) -> List[Optional[RBSOption]]:
+        """
+        Selects a different RBS option for each CDS, minimizing the total score over all CDSs (a
+        minimum-cost matching over the CDS x option score matrix). Unlike distinct selection in
+        run_batch, the result does not depend on the order of the CDSs and its total score is never
+        worse.
+
+        Parameters:
+            cds_list (List[str]): The coding DNA sequences for which an RBS is to be selected.
+            ignores (Set[RBSOption]): A set of RBS options to ignore during selection.
+
+        Returns:
+            List[Optional[RBSOption]]: The selected RBSOption of each CDS, None where no valid option is left.
+        """
+        if not cds_list:
+            return []
+        first_six_aas = self.translator.run_batch([cds[:18] for cds in cds_list])
+        scores = self.hairpin_scores_batch(cds_list) + np.stack([self.edit_distances(aas) for aas in first_six_aas])
+
+        # Ignored options, and padding options when there are more CDSs than options, cost more than
+        # any assignment of valid options
+        valid = np.array([rbs not in ignores for rbs in self.options], dtype=bool)
+        unavailable = int(scores.max()) * len(cds_list) + 1
+        costs = np.full((len(cds_list), max(len(self.options), len(cds_list))), unavailable, dtype=np.int64)
+        costs[:, :len(self.options)] = np.where(valid, scores, unavailable)
+
+        selected = []
+        for row, column in enumerate(min_cost_assignment(costs)):
+            selected.append(self.options[column] if costs[row, column] < unavailable else None)
+        return selected
+
+def min_cost_assignment(costs: np.ndarray) -> List[int]:
+    """
+    Solves the assignment problem with the Hungarian algorithm (shortest augmenting paths with
+    potentials, O(n^2 m)): a distinct column for each row minimizing the total cost.
+
+    Parameters:
+        costs (np.ndarray): (n, m) finite costs, with n <= m.
+
+    Returns:
+        List[int]: The column assigned to each row. Among optimal assignments, the search prefers
+        lower column indices.
+    """
+    n, m = costs.shape
+    # Potentials of rows and columns, the row matched to each column and the augmenting path, all
+    # 1-based with column 0 as the virtual start of each path
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)
+    way = np.zeros(m + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[column] = True
+            matched_row = match[column]
+            free = ~used
+            slack = np.concatenate(([np.inf], costs[matched_row - 1] - u[matched_row] - v[1:]))
+            improved = free & (slack < min_slack)
+            min_slack[improved] = slack[improved]
+            way[improved] = column
+            candidates = np.where(free, min_slack, np.inf)
+            next_column = int(np.argmin(candidates))
+            delta = candidates[next_column]
+            u[match[used]] += delta
+            v[used] -= delta
+            min_slack[free] -= delta
+            column = next_column
+            if match[column] == 0:
+                break
+        # Flip the matches along the augmenting path
+        while column:
+            previous = way[column]
+            match[column] = match[previous]
+            column = previous
+
+    assignment = [0] * n
+    for column in range(1, m + 1):
+        if match[column]:
+            assignment[match[column] - 1] = column - 1
+    return assignment
+
+def _cache_get(cache, key):
+    """Looks up a memoized value, marking it as most recently used."""
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
 
-        return rbs_scores[0][0]  
+def _cache_put(cache, key, value):
+    """Memoizes a read-only value, evicting the least recently used one beyond CACHE_SIZE."""
+    value.setflags(write=False)
+    cache[key] = value
+    if len(cache) > CACHE_SIZE:
+        cache.popitem(last=False)
 
+if __name__ == "__main__":
+    # Recompile the precompiled RBS library after editing the merged data file
+    save_rbs_library(compile_rbs_library(reference_data.MERGED_DATA_FILE), reference_data.MERGED_DATA_FILE)
+    print(f"Wrote {rbs_library_file(reference_data.MERGED_DATA_FILE)}")
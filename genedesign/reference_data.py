@@ -0,0 +1,140 @@
+import csv
+import hashlib
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, Tuple
+import numpy as np
+from genedesign.seq_utils.dna_encoding import CODONS
+
+CODON_USAGE_FILE = "genedesign/data/codon_usage.txt"
+MERGED_DATA_FILE = "genedesign/data/merged_data.csv"
+
+@dataclass(frozen=True)
+class CodonUsage:
+    """
+    A codon usage table, as loaded by codon_usage.
+
+    Attributes:
+        frequencies (Mapping): Usage frequency of each codon among its synonymous codons.
+        amino_acids (Mapping): Amino acid encoded by each codon.
+        codon_weights (Mapping): The (codon, frequency) pairs of each amino acid, in file order.
+        frequency_by_id (np.ndarray): Read-only frequency of each codon id (see seq_utils.dna_encoding.CODONS),
+            NaN for codons missing from the table.
+    """
+    frequencies: Mapping[str, float]
+    amino_acids: Mapping[str, str]
+    codon_weights: Mapping[str, Tuple[Tuple[str, float], ...]]
+    frequency_by_id: np.ndarray
+
+@dataclass(frozen=True)
+class RBSTable:
+    """
+    The RBS source genes, as loaded by rbs_table; entry i of every field describes the same gene.
+
+    Attributes:
+        locus_tags (tuple): The locus tag of each gene.
+        genes (tuple): The gene names.
+        utrs (tuple): The 5' UTR sequences.
+        cdss (tuple): The coding sequences.
+    """
+    locus_tags: Tuple[str, ...]
+    genes: Tuple[str, ...]
+    utrs: Tuple[str, ...]
+    cdss: Tuple[str, ...]
+
+# Loaded datasets of this process, by (kind, absolute path)
+_registry = {}
+
+def load_once(kind: str, path: str, loader):
+    """
+    Returns the dataset of the given kind loaded from path, calling loader(path) only the first time.
+
+    Parameters:
+        kind (str): The kind of dataset, so that different datasets built from one file do not collide.
+        path (str): The file the dataset is loaded from.
+        loader (callable): Loads the dataset from the path; the result must not be modified afterwards.
+
+    Returns:
+        The shared dataset.
+    """
+    key = (kind, os.path.abspath(path))
+    data = _registry.get(key)
+    if data is None:
+        data = _registry[key] = loader(path)
+    return data
+
+def codon_usage(path: str = CODON_USAGE_FILE) -> CodonUsage:
+    """
+    Returns the codon usage table of the file, loading it on the first call of the process.
+
+    Parameters:
+        path (str): The tab-separated codon usage file (codon, amino acid, frequency, ...).
+
+    Returns:
+        CodonUsage: The shared, immutable table.
+    """
+    return load_once('codon_usage', path, _read_codon_usage)
+
+def rbs_table(path: str = MERGED_DATA_FILE) -> RBSTable:
+    """
+    Returns the RBS source genes of the file, loading it on the first call of the process.
+
+    Parameters:
+        path (str): The CSV file with the locus tag in the first column and gene, UTR and CDS columns.
+
+    Returns:
+        RBSTable: The shared, immutable table.
+    """
+    return load_once('rbs_table', path, _read_rbs_table)
+
+def file_digest(path: str) -> str:
+    """
+    Returns the SHA-256 digest of the file's content, reading it on the first call of the process.
+
+    Parameters:
+        path (str): The file.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    return load_once('digest', path, _read_file_digest)
+
+def preload() -> None:
+    """
+    Loads the default datasets. Called before starting worker processes, so that forked workers
+    inherit them instead of each reading and parsing the files again.
+    """
+    from genedesign.rbs_chooser import load_rbs_library  # The RBS library builds on this module
+    codon_usage()
+    load_rbs_library()
+
+def _read_file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _read_codon_usage(path):
+    frequencies, amino_acids, codon_weights = {}, {}, {}
+    with open(path, 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3:
+                codon, aa, freq = parts[0], parts[1], float(parts[2])
+                frequencies[codon] = freq
+                amino_acids[codon] = aa
+                codon_weights.setdefault(aa, []).append((codon, freq))
+
+    frequency_by_id = np.array([frequencies.get(codon, np.nan) for codon in CODONS])
+    frequency_by_id.setflags(write=False)
+    return CodonUsage(MappingProxyType(frequencies), MappingProxyType(amino_acids),
+                      MappingProxyType({aa: tuple(codons) for aa, codons in codon_weights.items()}),
+                      frequency_by_id)
+
+def _read_rbs_table(path):
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        columns = {name: idx for idx, name in enumerate(header)}
+        rows = list(reader)
+    return RBSTable(tuple(row[0] for row in rows), tuple(row[columns['gene']] for row in rows),
+                    tuple(row[columns['UTR']] for row in rows), tuple(row[columns['CDS']] for row in rows))
@@ -0,0 +1,292 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from genedesign.checkers.hairpin_checker import (hairpin_checker, prepare_hairpin_state, hairpin_checker_incremental,
+                                                 hairpin_checker_batch, crowded_hairpins, prefix_fails_hairpins,
+                                                 MIN_STEM)
+from genedesign.seq_utils.dna_encoding import codon_ids_to_codes, encode_dna, reverse_complement_codes
+
+# Evaluation modes: ACCEPT stops at the first failing checker, SCORE runs them all and scores the segment
+ACCEPT = "accept"
+SCORE = "score"
+
+# (pass, fail) score of each pass/fail checker, and the score of failing codon usage
+FORBIDDEN_SCORES = (30, -50)
+PROMOTER_SCORES = (30, -50)
+HAIRPIN_SCORES = (50, -100)
+GC_SCORES = (20, -30)
+CODON_FAIL_SCORE = -100
+
+@dataclass(frozen=True)
+class SegmentEvaluation:
+    """
+    The outcome of evaluating one candidate segment.
+
+    Attributes:
+        passed (bool): True if the segment passed every checker.
+        checks (dict): Pass/fail of each checker that ran ('forbidden', 'promoter', 'hairpin', 'codon', 'gc').
+        metrics (dict): The values reported by the checkers that ran (forbidden_site, promoter, hairpins,
+            codon_diversity, rare_codon_count, cai, gc_content).
+        score (int or None): The segment score in SCORE mode, None in ACCEPT mode.
+    """
+    passed: bool
+    checks: dict
+    metrics: dict
+    score: Optional[int]
+
+def score_checks(forbidden_passed, promoter_passed, hairpin_passed, codon_result, gc_passed):
+    """
+    Combines checker outcomes into the score used to rank Monte Carlo candidates.
+
+    Parameters:
+        forbidden_passed (bool): Whether the forbidden sequence check passed.
+        promoter_passed (bool): Whether the internal promoter check passed.
+        hairpin_passed (bool): Whether the hairpin check passed.
+        codon_result (tuple): The (codons_above_board, diversity, rare_codons, cai) tuple of the codon checker.
+        gc_passed (bool): Whether the GC content check passed.
+
+    Returns:
+        int: The score of the segment; higher is better.
+    """
+    score = 0
+    score += FORBIDDEN_SCORES[0] if forbidden_passed else FORBIDDEN_SCORES[1]
+    score += PROMOTER_SCORES[0] if promoter_passed else PROMOTER_SCORES[1]
+    score += HAIRPIN_SCORES[0] if hairpin_passed else HAIRPIN_SCORES[1]
+
+    codons_above_board, diversity, rare_codons, cai = codon_result
+    if codons_above_board:
+        score += int(diversity * 50) + int(cai * 100) - rare_codons * 10
+    else:
+        score += CODON_FAIL_SCORE
+
+    score += GC_SCORES[0] if gc_passed else GC_SCORES[1]
+    return score
+
+def score_checks_batch(forbidden_passed, promoter_passed, hairpin_passed, codon_result, gc_passed):
+    """
+    Vectorized score_checks over arrays of checker outcomes, one entry per segment.
+
+    Returns:
+        np.ndarray: The int64 score of each segment.
+    """
+    codons_above_board, diversity, rare_codons, cai = codon_result
+    # Truncating casts match int() on the non-negative diversity and CAI terms
+    codon_scores = (diversity * 50).astype(np.int64) + (cai * 100).astype(np.int64) - rare_codons * 10
+    return (np.where(forbidden_passed, *FORBIDDEN_SCORES) + np.where(promoter_passed, *PROMOTER_SCORES)
+            + np.where(hairpin_passed, *HAIRPIN_SCORES) + np.where(codons_above_board, codon_scores, CODON_FAIL_SCORE)
+            + np.where(gc_passed, *GC_SCORES))
+
+class SegmentEvaluator:
+    """
+    Evaluates Monte Carlo candidates for one window of TranscriptDesigner incrementally.
+
+    A candidate segment is the fixed preamble (the last codons already designed) followed by the
+    window and downstream codons being sampled. set_preamble prepares each checker once for the
+    preamble; every candidate then only rescans the sampled bases plus the overlap each checker
+    needs across the boundary (up to 28 bp for the promoter PWM, 7 bp for forbidden sites and
+    14 bp for hairpin stems).
+    """
+
+    def __init__(self, forbidden_checker, promoter_checker, codon_checker, gc_checker):
+        self.forbidden_checker = forbidden_checker
+        self.promoter_checker = promoter_checker
+        self.codon_checker = codon_checker
+        self.gc_checker = gc_checker
+
+    def set_preamble(self, preamble_codons):
+        """
+        Prepares the checkers for a new fixed preamble.
+
+        Parameters:
+            preamble_codons (list): The codons preceding the window.
+        """
+        preamble_seq = ''.join(preamble_codons)
+        self.forbidden_state = self.forbidden_checker.prepare(preamble_seq)
+        self.promoter_state = self.promoter_checker.prepare(preamble_seq)
+        self.hairpin_state = prepare_hairpin_state(preamble_seq)
+        self.codon_state = self.codon_checker.prepare(list(preamble_codons))
+        self.gc_state = self.gc_checker.prepare(preamble_seq)
+
+    def evaluate(self, window_codons, downstream_codons, mode=SCORE):
+        """
+        Evaluates preamble + window + downstream with every checker in a single pass.
+
+        Parameters:
+            window_codons (list): The sampled window codons.
+            downstream_codons (list): The sampled downstream codons.
+            mode (str): ACCEPT to stop at the first failing checker, SCORE for the full breakdown and score.
+
+        Returns:
+            SegmentEvaluation: The outcome of the checkers that ran, their metrics and, in SCORE mode, the score.
+        """
+        tail = ''.join(window_codons) + ''.join(downstream_codons)
+        return self._evaluate([
+            ('forbidden', lambda: self.forbidden_checker.run_incremental(self.forbidden_state, tail)),
+            ('promoter', lambda: self.promoter_checker.run_incremental(self.promoter_state, tail)),
+            ('hairpin', lambda: hairpin_checker_incremental(self.hairpin_state, tail)),
+            ('codon', lambda: self.codon_checker.run_incremental(self.codon_state, window_codons)),
+            ('gc', lambda: self.gc_checker.run_incremental(self.gc_state, tail)),
+        ], mode)
+
+    def evaluate_batch(self, window_ids, downstream_ids, ignored=()):
+        """
+        Evaluates many candidates for preamble + window + downstream at once with the batched checkers.
+
+        Parameters:
+            window_ids (np.ndarray): (n, window length) codon ids (see seq_utils.dna_encoding.CODONS).
+            downstream_ids (np.ndarray): (n, downstream length) codon ids.
+            ignored (collection): Pass/fail checkers ('forbidden', 'promoter', 'hairpin', 'gc') that count
+                as passed, such as those that fail for every candidate (see unavoidable_failures).
+
+        Returns:
+            tuple: (np.ndarray, np.ndarray) with, for each candidate, whether it passed every checker and
+            its score, as evaluate gives them in SCORE mode.
+        """
+        codes = codon_ids_to_codes(np.hstack([window_ids, downstream_ids]))
+        forbidden_passed = self.forbidden_checker.run_incremental_batch(self.forbidden_state, codes)
+        promoter_passed = self.promoter_checker.run_incremental_batch(self.promoter_state, codes)
+        hairpin_passed = self.check_hairpins_batch(codes)
+        codon_result = self.codon_checker.run_incremental_batch(self.codon_state, window_ids)
+        gc_passed, _ = self.gc_checker.run_incremental_batch(self.gc_state, codes)
+        if ignored:
+            # Ignored checkers count as passed, so they reject no candidate and drop out of the scores
+            forbidden_passed = forbidden_passed | ('forbidden' in ignored)
+            promoter_passed = promoter_passed | ('promoter' in ignored)
+            hairpin_passed = hairpin_passed | ('hairpin' in ignored)
+            gc_passed = gc_passed | ('gc' in ignored)
+
+        passed = forbidden_passed & promoter_passed & hairpin_passed & codon_result[0] & gc_passed
+        return passed, score_checks_batch(forbidden_passed, promoter_passed, hairpin_passed, codon_result, gc_passed)
+
+    def check_hairpins_batch(self, codes):
+        """Runs the batched hairpin check of the candidates' 2-bit codes after the preamble."""
+        return hairpin_checker_batch(self.hairpin_state, codes)
+
+    def unavoidable_failures(self, tail_gc_range=None):
+        """
+        Returns the checkers that fail for every candidate after the current preamble: those failing
+        inside the preamble itself (a forbidden site, a promoter window on either strand, a hairpin
+        chunk with more than one hairpin), and the GC content when no candidate can bring it in range.
+
+        Parameters:
+            tail_gc_range (tuple): Optional (min, max, length) GC base counts reachable by the candidates
+                and their length in bases, to check the GC content.
+
+        Returns:
+            list: The names of those checkers ('forbidden', 'promoter', 'hairpin', 'gc').
+        """
+        failures = []
+        if self.forbidden_state.hits:
+            failures.append('forbidden')
+        if self.promoter_state.head_hit is not None or self.promoter_state.tail_hit is not None:
+            failures.append('promoter')
+        if prefix_fails_hairpins(self.hairpin_state):
+            failures.append('hairpin')
+        if tail_gc_range is not None:
+            prefix_gc, prefix_len = self.gc_state
+            min_gc, max_gc, length = tail_gc_range
+            total = prefix_len + length
+            if total and ((prefix_gc + min_gc) / total > self.gc_checker.max_gc
+                          or (prefix_gc + max_gc) / total < self.gc_checker.min_gc):
+                failures.append('gc')
+        return failures
+
+    def failing_codons(self, window_codons, downstream_codons, ignored=()):
+        """
+        Locates the failures of one candidate after the preamble, for targeted mutation.
+
+        The codons reported are those overlapping a forbidden site, a promoter window or a stem of a
+        hairpin in an over-full chunk; the rare window codons when there are too many of them; and every
+        window codon when codon diversity or CAI fails, as no single codon is to blame. The GC content
+        has no position and is left to the caller.
+
+        Parameters:
+            window_codons (list): The window codons of the candidate.
+            downstream_codons (list): The downstream codons of the candidate.
+            ignored (collection): Checkers whose failures are not located, as in evaluate_batch.
+
+        Returns:
+            list: The sorted indices, in window + downstream codons, of the codons to mutate; empty if
+            the candidate passes.
+        """
+        evaluation = self.evaluate(window_codons, downstream_codons, SCORE)
+        checks = {name: passed or name in ignored for name, passed in evaluation.checks.items()}
+        tail = ''.join(window_codons) + ''.join(downstream_codons)
+        boundary = len(self.hairpin_state.prefix)
+        n_codons = len(window_codons) + len(downstream_codons)
+
+        # Base spans of the failures, in preamble + tail coordinates
+        spans = []
+        if not checks['forbidden']:
+            spans += [(site.position, site.position + len(site.site))
+                      for site in self.forbidden_checker.find_sites_incremental(self.forbidden_state, tail)]
+        if not checks['promoter']:
+            codes = encode_dna(self.hairpin_state.prefix + tail)
+            frame, threshold = self.promoter_checker.sliding_frame, self.promoter_checker.threshold
+            spans += [(start, start + frame)
+                      for start in np.flatnonzero(self.promoter_checker.window_scores(codes) >= threshold)]
+            spans += [(len(codes) - start - frame, len(codes) - start) for start in
+                      np.flatnonzero(self.promoter_checker.window_scores(reverse_complement_codes(codes)) >= threshold)]
+        if not checks['hairpin']:
+            for i, j in crowded_hairpins(self.hairpin_state.prefix + tail):
+                spans += [(i, i + MIN_STEM), (j, j + MIN_STEM)]
+
+        indices = set()
+        for start, end in spans:
+            if end > boundary:
+                indices.update(range(max(0, start - boundary) // 3, min(n_codons, (end - boundary + 2) // 3)))
+        if not checks['codon']:
+            rare = [k for k, codon in enumerate(window_codons) if codon in self.codon_checker.rare_codons]
+            too_many_rare = evaluation.metrics['rare_codon_count'] > self.codon_checker.rare_codon_limit
+            indices.update(rare if too_many_rare and rare else range(len(window_codons)))
+        return sorted(indices)
+
+    def evaluate_segment(self, segment, codons, mode=SCORE):
+        """
+        Evaluates a complete segment from scratch, without the prepared preamble.
+
+        Parameters:
+            segment (str): The DNA sequence of the segment.
+            codons (list): The codons checked for codon usage.
+            mode (str): ACCEPT to stop at the first failing checker, SCORE for the full breakdown and score.
+
+        Returns:
+            SegmentEvaluation: The outcome of the checkers that ran, their metrics and, in SCORE mode, the score.
+        """
+        return self._evaluate([
+            ('forbidden', lambda: self.forbidden_checker.run(segment)),
+            ('promoter', lambda: self.promoter_checker.run(segment)),
+            ('hairpin', lambda: hairpin_checker(segment)),
+            ('codon', lambda: self.codon_checker.run(codons)),
+            ('gc', lambda: self.gc_checker.run(segment)),
+        ], mode)
+
+    def _evaluate(self, checks, mode):
+        if mode not in (ACCEPT, SCORE):
+            raise ValueError(f"Unknown evaluation mode '{mode}'.")
+
+        results = {}
+        for name, check in checks:
+            results[name] = check()
+            if mode == ACCEPT and not results[name][0]:
+                break
+
+        metrics = {}
+        if 'forbidden' in results:
+            metrics['forbidden_site'] = results['forbidden'][1]
+        if 'promoter' in results:
+            metrics['promoter'] = results['promoter'][1]
+        if 'hairpin' in results:
+            metrics['hairpins'] = results['hairpin'][1]
+        if 'codon' in results:
+            _, metrics['codon_diversity'], metrics['rare_codon_count'], metrics['cai'] = results['codon']
+        if 'gc' in results:
+            metrics['gc_content'] = results['gc'][1]
+
+        checks_passed = {name: result[0] for name, result in results.items()}
+        score = None
+        if mode == SCORE:
+            score = score_checks(results['forbidden'][0], results['promoter'][0], results['hairpin'][0],
+                                 results['codon'], results['gc'][0])
+        return SegmentEvaluation(len(results) == len(checks) and all(checks_passed.values()),
+                                 checks_passed, metrics, score)
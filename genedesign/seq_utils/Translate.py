@@ -1,4 +1,12 @@
+from bisect import bisect_left
 from dataclasses import dataclass
+from typing import List
+import numpy as np
+from genedesign.seq_utils.dna_encoding import BASES, CODONS, UNKNOWN, encode_dna
+
+STOP = ord('*')  # Amino acid byte of stop codons in the translation table
+CODON_WEIGHTS = np.array([16, 4, 1], dtype=np.uint8)  # 2-bit base codes of a codon -> table index
+SCALAR_MAX_LENGTH = 120  # Bases up to which run looks codons up one by one instead of using NumPy
 
 @dataclass
 class Translate:
@@ -7,8 +15,13 @@ class Translate:
 
     Attributes:
         codon_table (dict): Maps each DNA codon to its corresponding single-letter amino acid code.
+        translation_table (np.ndarray): The amino acid byte of each codon (STOP for stop codons), indexed by
+            the codon's 2-bit base codes (first base in the high bits).
+        codon_letters (dict): The amino acid letter of each codon ('*' for stop codons), for short sequences.
     """
     codon_table: dict = None
+    translation_table: np.ndarray = None
+    codon_letters: dict = None
 
     def initiate(self) -> None:
         """
@@ -33,6 +46,13 @@ class Translate:
             "GGT": "G", "GGC": "G", "GGA": "G", "GGG": "G"
         }
 
+        self.translation_table = np.zeros(64, dtype=np.uint8)
+        for codon, amino_acid in self.codon_table.items():
+            index = sum(BASES.index(base) * weight for base, weight in zip(codon, CODON_WEIGHTS.tolist()))
+            self.translation_table[index] = STOP if amino_acid == "Stop" else ord(amino_acid)
+        self.codon_letters = {codon: chr(self.translation_table[index])
+                              for index, codon in enumerate(CODONS)}
+
     def run(self, dna_sequence: str) -> str:
         """
         Translates a DNA sequence into a protein sequence using the codon table.
@@ -49,19 +69,78 @@ class Translate:
         if len(dna_sequence) % 3 != 0:
             raise ValueError("The DNA sequence length must be a multiple of 3.")
 
-        protein = []
-        for i in range(0, len(dna_sequence), 3):
-            codon = dna_sequence[i:i+3]
-            if codon not in self.codon_table:
-                raise ValueError(f"Invalid codon '{codon}' encountered in DNA sequence.")
-            amino_acid = self.codon_table[codon]
-            if amino_acid == "Stop":
-                if i + 3 != len(dna_sequence):
+        # Short sequences, such as the CDS starts the RBS chooser translates, are looked up codon by codon
+        # as NumPy's per-call setup costs more than the lookups; invalid codons take the general path
+        if len(dna_sequence) <= SCALAR_MAX_LENGTH:
+            letters = self.codon_letters
+            try:
+                amino_acids = ''.join([letters[dna_sequence[i:i + 3]] for i in range(0, len(dna_sequence), 3)])
+            except KeyError:
+                amino_acids = None
+            if amino_acids is not None:
+                return self._end_at_stop(amino_acids, dna_sequence)
+
+        # Translate the codons before the first one with an unknown base
+        codes = encode_dna(dna_sequence)
+        unknown = np.flatnonzero(codes == UNKNOWN)
+        valid = len(codes) if not unknown.size else int(unknown[0]) - int(unknown[0]) % 3
+        amino_acids = self.translation_table[codes[:valid].reshape(-1, 3) @ CODON_WEIGHTS].tobytes().decode('ascii')
+        protein = self._end_at_stop(amino_acids, dna_sequence)
+        if len(protein) == len(amino_acids) and valid < len(dna_sequence):
+            raise ValueError(f"Invalid codon '{dna_sequence[valid:valid + 3]}' encountered in DNA sequence.")
+        return protein
+
+    @staticmethod
+    def _end_at_stop(amino_acids, dna_sequence):
+        """Returns the amino acids before the first stop, checking that the stop codon ends dna_sequence."""
+        stop = amino_acids.find('*')
+        if stop < 0:
+            return amino_acids
+        if 3 * (stop + 1) != len(dna_sequence):
+            raise ValueError("Untranslated sequence after stop codon.")
+        return amino_acids[:stop]
+
+    def run_batch(self, dna_sequences: List[str]) -> List[str]:
+        """
+        Translates several DNA sequences in one pass over their concatenated codons.
+
+        Parameters:
+            dna_sequences (List[str]): The DNA sequences to translate.
+
+        Returns:
+            List[str]: The amino acid sequence of each DNA sequence.
+
+        Raises:
+            ValueError: For the first sequence that run would reject, with the same message.
+        """
+        codes = encode_dna(''.join(seq for seq in dna_sequences if len(seq) % 3 == 0))
+        amino_acids = self.translation_table[(codes.reshape(-1, 3) & 3) @ CODON_WEIGHTS]
+
+        # Codons that end translation, either by raising (unknown bases) or at a stop
+        invalid = set((np.flatnonzero(codes == UNKNOWN) // 3).tolist())
+        events = sorted(invalid.union(np.flatnonzero(amino_acids == STOP).tolist()))
+
+        proteins = []
+        start = 0
+        for dna_sequence in dna_sequences:
+            if len(dna_sequence) % 3 != 0:
+                raise ValueError("The DNA sequence length must be a multiple of 3.")
+            end = start + len(dna_sequence) // 3
+
+            stop = end
+            k = bisect_left(events, start)
+            if k < len(events) and events[k] < end:
+                stop = events[k]
+                if stop in invalid:
+                    offset = 3 * (stop - start)
+                    raise ValueError(f"Invalid codon '{dna_sequence[offset:offset + 3]}' encountered in DNA sequence.")
+                if stop + 1 != end:
                     raise ValueError("Untranslated sequence after stop codon.")
-                break
-            protein.append(amino_acid)
 
-        return ''.join(protein)
+            proteins.append(amino_acids[start:stop].tobytes().decode('ascii'))
+            start = end
+
+        return proteins
 
 def main():
     # Example usage
@@ -0,0 +1,87 @@
+from collections import deque
+
+class AhoCorasick:
+    """
+    Matches many patterns against a text in a single left-to-right pass using the Aho-Corasick
+    algorithm. The patterns are compiled once into a deterministic automaton whose states can be
+    carried between calls, so a long text can be scanned piece by piece.
+
+    Attributes:
+        transitions (list): transitions[state] maps a character to the next state; characters not in
+            the map lead back to the root state 0.
+        outputs (list): outputs[state] lists the (pattern length, payload) of every pattern ending in that state.
+    """
+
+    def __init__(self, patterns):
+        """
+        Compiles the automaton.
+
+        Parameters:
+            patterns (list): (pattern, payload) tuples; the payload is reported with every occurrence.
+        """
+        self.transitions = [{}]
+        self.outputs = [[]]
+
+        # Build the trie of all patterns
+        for pattern, payload in patterns:
+            state = 0
+            for char in pattern:
+                if char not in self.transitions[state]:
+                    self.transitions.append({})
+                    self.outputs.append([])
+                    self.transitions[state][char] = len(self.transitions) - 1
+                state = self.transitions[state][char]
+            self.outputs[state].append((len(pattern), payload))
+
+        # Breadth-first, follow the failure links to complete the transitions and outputs of each state
+        alphabet = {char for pattern, _ in patterns for char in pattern}
+        fail = [0] * len(self.transitions)
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            self.outputs[state] = self.outputs[state] + self.outputs[fail[state]]
+            for char in alphabet:
+                child = self.transitions[state].get(char)
+                if child is None:
+                    target = self.transitions[fail[state]].get(char, 0)
+                    if target:
+                        self.transitions[state][char] = target
+                else:
+                    fail[child] = self.transitions[fail[state]].get(char, 0)
+                    queue.append(child)
+
+    def scan(self, text, state=0, offset=0):
+        """
+        Scans a text, reporting every pattern occurrence.
+
+        Parameters:
+            text (str): The text to scan.
+            state (int): The state to resume from, as returned by a previous scan of the preceding text.
+            offset (int): Position of the first character of text in the whole sequence being scanned.
+
+        Returns:
+            tuple: (list, int)
+                - (position, payload) for each occurrence, ordered by end position, where position is
+                  the start of the occurrence (which may precede text when resuming).
+                - The state after the last character, to resume scanning the text that follows.
+        """
+        transitions = self.transitions
+        outputs = self.outputs
+        hits = []
+        for pos, char in enumerate(text, offset + 1):
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                hits.extend((pos - length, payload) for length, payload in outputs[state])
+        return hits, state
+
+    def find_all(self, text):
+        """
+        Reports every pattern occurrence in a text.
+
+        Parameters:
+            text (str): The text to scan.
+
+        Returns:
+            list: (position, payload) for each occurrence, ordered by end position.
+        """
+        return self.scan(text)[0]
@@ -1,6 +1,10 @@
+import numpy as np
+
 def calculate_edit_distance(s1, s2):
     """
-    Compute the edit distance between two strings using a dynamic programming approach based on the Smith-Waterman algorithm for local alignment.
+    Compute the edit distance between two strings using the bit-parallel algorithm of Myers (1999), in the
+    global form given by Hyyrö (2001). Each column of the dynamic programming matrix is held as bit vectors of
+    vertical deltas, one bit per character of s1, so no matrix is allocated.
 
     Parameters:
         s1 (str): The first string to compare.
@@ -9,25 +13,108 @@ def calculate_edit_distance(s1, s2):
     Returns:
         int: The edit distance between the two strings, defined as the minimum number of edits (insertions, deletions, or substitutions) required to transform one string into the other.
     """
-    s1_len = len(s1)
-    s2_len = len(s2)
-    dist = [[0] * (s2_len + 1) for _ in range(s1_len + 1)]
-
-    # Initialize distances for transformations involving empty strings
-    for i in range(s1_len + 1):
-        dist[i][0] = i
-    for j in range(s2_len + 1):
-        dist[0][j] = j
-
-    # Compute distances
-    for i in range(1, s1_len + 1):
-        for j in range(1, s2_len + 1):
-            if s1[i - 1] == s2[j - 1]:
-                dist[i][j] = dist[i - 1][j - 1]
-            else:
-                dist[i][j] = 1 + min(dist[i - 1][j], dist[i][j - 1], dist[i - 1][j - 1])
-
-    return dist[s1_len][s2_len]
+    if not s1:
+        return len(s2)
+
+    # Bit mask of the positions of each character in s1
+    peq = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << len(s1)) - 1
+    high = 1 << (len(s1) - 1)
+    pv, mv, score = mask, 0, len(s1)
+    for char in s2:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # The first row of the matrix grows by one per character of s2
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+    return score
+
+class EditDistanceIndex:
+    """
+    Computes the edit distance from one query to many short target strings at once.
+
+    The bit vectors of calculate_edit_distance are kept for all targets side by side in NumPy uint64
+    arrays, with each target as the pattern, so one pass over the query characters updates every target.
+    Targets longer than 64 characters fall back to calculate_edit_distance.
+
+    Attributes:
+        targets (list): The target strings, in the order of the returned distances.
+    """
+
+    WORD_BITS = 64
+
+    def __init__(self, targets):
+        """
+        Precomputes the character masks of the targets.
+
+        Parameters:
+            targets (list): The target strings.
+        """
+        self.targets = list(targets)
+        lengths = np.array([len(target) for target in self.targets], dtype=np.int64)
+        self.lengths = lengths
+        self.long_targets = np.nonzero(lengths > self.WORD_BITS)[0]
+        short = (lengths > 0) & (lengths <= self.WORD_BITS)
+
+        # Bits [0, len) set for each short target, and its highest bit
+        self.masks = np.zeros(len(self.targets), dtype=np.uint64)
+        self.highs = np.zeros(len(self.targets), dtype=np.uint64)
+        for idx in np.nonzero(short)[0]:
+            self.masks[idx] = (1 << int(lengths[idx])) - 1
+            self.highs[idx] = 1 << (int(lengths[idx]) - 1)
+
+        self.peq = {}
+        for idx in np.nonzero(short)[0]:
+            for pos, char in enumerate(self.targets[idx]):
+                if char not in self.peq:
+                    self.peq[char] = np.zeros(len(self.targets), dtype=np.uint64)
+                self.peq[char][idx] |= np.uint64(1 << pos)
+        self.no_match = np.zeros(len(self.targets), dtype=np.uint64)
+
+    def distances(self, query):
+        """
+        Computes the edit distance between every target and the query.
+
+        Parameters:
+            query (str): The string to compare against the targets.
+
+        Returns:
+            np.ndarray: int64 edit distances, one per target.
+        """
+        masks = self.masks
+        one = np.uint64(1)
+        pv, mv = masks.copy(), np.zeros_like(masks)
+        scores = self.lengths.copy()
+        for char in query:
+            eq = self.peq.get(char, self.no_match)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & masks)
+            mh = pv & xh
+            scores += (ph & self.highs) != 0
+            scores -= (mh & self.highs) != 0
+            ph = ((ph << one) | one) & masks
+            mh = (mh << one) & masks
+            pv = mh | (~(xv | ph) & masks)
+            mv = ph & xv
+
+        # Empty targets are all insertions
+        scores[self.lengths == 0] = len(query)
+        for idx in self.long_targets:
+            scores[idx] = calculate_edit_distance(self.targets[idx], query)
+        return scores
 
 def main():
     # Example usage
@@ -0,0 +1,119 @@
+import numpy as np
+from genedesign.seq_utils.dna_encoding import CODONS
+
+def build_alias_table(weights):
+    """
+    Builds the Walker alias table of a discrete distribution (with the construction of Vose, 1991).
+
+    Slot i of the table keeps outcome i with probability prob[i] and otherwise gives outcome alias[i],
+    so a draw takes one uniform slot and one biased coin, whatever the number of outcomes.
+
+    Parameters:
+        weights (list): The non-negative weight of each outcome, not all zero.
+
+    Returns:
+        tuple: (np.ndarray, np.ndarray) the float prob and int alias of each slot.
+    """
+    n = len(weights)
+    scaled = np.asarray(weights, dtype=float) * n / sum(weights)
+    prob = np.ones(n)
+    alias = np.arange(n)
+    small = [i for i in range(n) if scaled[i] < 1]
+    large = [i for i in range(n) if scaled[i] >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less], alias[less] = scaled[less], more
+        # The outcome topping up the slot gives away the rest of that slot
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+    # Whatever is left is full up to rounding errors
+    return prob, alias
+
+class CodonSampler:
+    """
+    Draws synonymous codons with the usage frequencies of each amino acid, through one Walker alias
+    table per amino acid.
+
+    The sampler holds no random state: every draw takes a NumPy Generator, so threads or processes
+    each pass their own stream (for instance from np.random.SeedSequence(seed).spawn) and stay
+    reproducible whatever the others do.
+
+    Attributes:
+        amino_acids (list): The amino acids, in the order of the table rows.
+        codon_ids (np.ndarray): (amino acid, slot) codon ids (see seq_utils.dna_encoding.CODONS).
+        prob (np.ndarray): (amino acid, slot) probability of keeping the codon of the slot.
+        alias (np.ndarray): (amino acid, slot) slot of the codon drawn otherwise.
+        sizes (np.ndarray): Number of codons of each amino acid.
+    """
+
+    def __init__(self, codon_weights):
+        """
+        Builds the alias tables.
+
+        Parameters:
+            codon_weights (dict): Maps each amino acid to its (codon, frequency) pairs, as loaded from
+                the codon usage file.
+        """
+        self.amino_acids = list(codon_weights)
+        width = max(len(codons) for codons in codon_weights.values())
+        self.codon_ids = np.zeros((len(self.amino_acids), width), dtype=np.int64)
+        self.prob = np.ones((len(self.amino_acids), width))
+        self.alias = np.zeros((len(self.amino_acids), width), dtype=np.int64)
+        self.sizes = np.array([len(codon_weights[aa]) for aa in self.amino_acids], dtype=np.int64)
+        for row, aa in enumerate(self.amino_acids):
+            codons, weights = zip(*codon_weights[aa])
+            size = len(codons)
+            self.codon_ids[row, :size] = [CODONS.index(codon) for codon in codons]
+            self.prob[row, :size], self.alias[row, :size] = build_alias_table(weights)
+
+        # Byte -> table row lookup, -1 for characters that are not amino acids of the table
+        self._rows = np.full(256, -1, dtype=np.int64)
+        for row, aa in enumerate(self.amino_acids):
+            self._rows[ord(aa)] = row
+
+    def rows(self, peptide):
+        """
+        Returns the table row of each amino acid of the peptide.
+
+        Parameters:
+            peptide (str): The peptide sequence.
+
+        Returns:
+            np.ndarray: One row index per amino acid.
+        """
+        rows = self._rows[np.frombuffer(peptide.encode('ascii', 'replace'), dtype=np.uint8)]
+        if rows.size and rows.min() < 0:
+            raise ValueError(f"Unknown amino acid '{peptide[int(np.argmin(rows))]}' in peptide.")
+        return rows
+
+    def sample(self, peptide, count, rng):
+        """
+        Draws count codon choices for every amino acid of the peptide at once.
+
+        Parameters:
+            peptide (str): The peptide sequence (or any string of amino acids).
+            count (int): Number of independent draws.
+            rng (np.random.Generator): The random stream to draw from.
+
+        Returns:
+            np.ndarray: (count, len(peptide)) codon ids.
+        """
+        rows = self.rows(peptide)
+        # The integer part of a scaled uniform picks the slot, its fractional part flips the coin
+        scaled = rng.random((count, len(rows))) * self.sizes[rows]
+        slots = np.minimum(scaled.astype(np.int64), self.sizes[rows] - 1)
+        slots = np.where(scaled - slots < self.prob[rows, slots], slots, self.alias[rows, slots])
+        return self.codon_ids[rows, slots]
+
+    def sample_one(self, aa, rng):
+        """
+        Draws one codon for the amino acid.
+
+        Parameters:
+            aa (str): The amino acid.
+            rng (np.random.Generator): The random stream to draw from.
+
+        Returns:
+            str: The codon.
+        """
+        return CODONS[self.sample(aa, 1, rng)[0, 0]]
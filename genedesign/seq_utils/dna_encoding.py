@@ -0,0 +1,64 @@
+import numpy as np
+
+BASES = "ACGT"  # Base codes 0-3, in the order of the PWM rows
+UNKNOWN = 4     # Code of any other character
+
+# Byte -> base code lookup table
+_CODES = np.full(256, UNKNOWN, dtype=np.uint8)
+for _code, _base in enumerate(BASES):
+    _CODES[ord(_base)] = _code
+
+# Base code -> code of the complementary base
+COMPLEMENT = np.array([3, 2, 1, 0, UNKNOWN], dtype=np.uint8)
+
+def encode_dna(dna_sequence: str) -> np.ndarray:
+    """
+    Encodes an upper-case DNA sequence as an array of base codes (A=0, C=1, G=2, T=3, anything else 4).
+
+    Parameters:
+        dna_sequence (str): The DNA sequence to encode.
+
+    Returns:
+        np.ndarray: uint8 array with one code per base.
+    """
+    return _CODES[np.frombuffer(dna_sequence.encode('ascii', 'replace'), dtype=np.uint8)]
+
+def reverse_complement_codes(codes: np.ndarray) -> np.ndarray:
+    """
+    Returns the reverse complement of an encoded DNA sequence (or of each row of a 2D array).
+
+    Parameters:
+        codes (np.ndarray): Base codes as returned by encode_dna.
+
+    Returns:
+        np.ndarray: Base codes of the reverse complement.
+    """
+    return COMPLEMENT[codes[..., ::-1]]
+
+# All 64 codons, indexed by their 2-bit codes (first base in the high bits), and their base codes
+CODONS = [first + second + third for first in BASES for second in BASES for third in BASES]
+CODON_CODES = np.array([[BASES.index(base) for base in codon] for codon in CODONS], dtype=np.uint8)
+
+def decode_codons(codon_ids) -> list:
+    """
+    Decodes codon ids (indices into CODONS) to codon strings.
+
+    Parameters:
+        codon_ids (np.ndarray): 1D array of codon ids.
+
+    Returns:
+        list: The codons.
+    """
+    return [CODONS[codon_id] for codon_id in codon_ids.tolist()]
+
+def codon_ids_to_codes(codon_ids: np.ndarray) -> np.ndarray:
+    """
+    Expands codon ids (indices into CODONS) to the base codes of the sequence they spell.
+
+    Parameters:
+        codon_ids (np.ndarray): Codon ids, with the codons along the last axis.
+
+    Returns:
+        np.ndarray: uint8 base codes, three per codon.
+    """
+    return CODON_CODES[codon_ids].reshape(codon_ids.shape[:-1] + (3 * codon_ids.shape[-1],))
@@ -1,10 +1,120 @@
-from genedesign.seq_utils.reverse_complement import reverse_complement
+from bisect import bisect_left
+import numpy as np
+
+# 2-bit code of each base; the complement of a base code b is 3 - b
+BASE_BITS = {'A': 0, 'C': 1, 'G': 2, 'T': 3}
+
+def stem_index(sequence, min_stem=3):
+    """
+    Encodes every stem-sized k-mer of a sequence once and indexes the positions of each k-mer.
+
+    Parameters:
+        sequence (str): The DNA sequence to analyze.
+        min_stem (int): Length of the stems (k-mers).
+
+    Returns:
+        tuple: (list, dict)
+            - rc_codes[i]: the 2-bit code of the reverse complement of the k-mer starting at i,
+              or -1 if that k-mer is incomplete or contains a non-ACGT base.
+            - positions: maps each k-mer code to the ascending list of positions it starts at.
+    """
+    mask = (1 << (2 * min_stem)) - 1
+    high_shift = 2 * (min_stem - 1)
+    code = rc_code = valid = 0
+    rc_codes = []
+    positions = {}
+    for end, base in enumerate(sequence):
+        bits = BASE_BITS.get(base)
+        if bits is None:
+            code = rc_code = valid = 0
+        else:
+            # Roll the k-mer code forward, and its reverse complement backward
+            code = ((code << 2) | bits) & mask
+            rc_code = (rc_code >> 2) | ((3 - bits) << high_shift)
+            valid += 1
+        if end >= min_stem - 1:
+            if valid >= min_stem:
+                rc_codes.append(rc_code)
+                positions.setdefault(code, []).append(end - min_stem + 1)
+            else:
+                rc_codes.append(-1)
+    return rc_codes, positions
+
+def count_hairpins(sequence, min_stem=3, min_loop=4, max_loop=9):
+    """
+    Counts the potential hairpin structures in a DNA sequence, as hairpin_counter does, without
+    building the hairpin string.
+
+    For each first stem, the complementary second stems are looked up in the k-mer index, so the
+    cost is linear in the sequence length.
+
+    Parameters:
+        sequence (str): The DNA sequence to analyze.
+        min_stem (int): Minimum number of bases in the stem for stable hairpin.
+        min_loop (int): Minimum number of bases in the loop.
+        max_loop (int): Maximum number of bases in the loop.
+
+    Returns:
+        int: The count of potential hairpin structures.
+    """
+    rc_codes, positions = stem_index(sequence, min_stem)
+    count = 0
+    for i, rc_code in enumerate(rc_codes):
+        partners = positions.get(rc_code)
+        if partners:
+            count += (bisect_left(partners, i + min_stem + max_loop + 1)
+                      - bisect_left(partners, i + min_stem + min_loop))
+    return count
+
+def find_hairpins(sequence, min_stem=3, min_loop=4, max_loop=9, start=0):
+    """
+    Lists the stem pairs that hairpin_counter counts, as (i, j) positions of the two stems.
+
+    Parameters:
+        sequence (str): The DNA sequence to analyze.
+        min_stem (int): Minimum number of bases in the stem for stable hairpin.
+        min_loop (int): Minimum number of bases in the loop.
+        max_loop (int): Maximum number of bases in the loop.
+        start (int): Only report pairs whose first stem starts at or after this position.
+
+    Returns:
+        list: (i, j) tuples ordered by i and then j, where sequence[i:i+min_stem] is the reverse
+        complement of sequence[j:j+min_stem].
+    """
+    rc_codes, positions = stem_index(sequence, min_stem)
+    pairs = []
+    for i in range(max(start, 0), len(rc_codes)):
+        partners = positions.get(rc_codes[i])
+        if partners:
+            lo = bisect_left(partners, i + min_stem + min_loop)
+            hi = bisect_left(partners, i + min_stem + max_loop + 1)
+            pairs.extend((i, j) for j in partners[lo:hi])
+    return pairs
+
+def format_hairpins(sequence, pairs, min_stem=3):
+    """
+    Builds the linear representation of hairpins, one 'Hairpin n: stem1(loop)stem2' line per stem pair.
+
+    Parameters:
+        sequence (str): The DNA sequence the pairs were found in.
+        pairs (list): (i, j) stem pairs as returned by find_hairpins.
+        min_stem (int): Length of the stems.
+
+    Returns:
+        str: The hairpin lines, or None if there are no pairs.
+    """
+    if not pairs:
+        return None
+    return ''.join(f"Hairpin {count}: {sequence[i:i+min_stem]}({sequence[i+min_stem:j]}){sequence[j:j+min_stem]}\n"
+                   for count, (i, j) in enumerate(pairs, start=1))
 
 def hairpin_counter(sequence, min_stem=3, min_loop=4, max_loop=9):
     """
     Counts the number of potential hairpin structures in a DNA sequence and returns a simple linear
     representation of the hairpins (stem1(loop)stem2_rc), or None if no hairpins are found.
 
+    Callers that only need the count should use count_hairpins, which skips building the string.
+
     Parameters:
         sequence (str): The DNA sequence to analyze.
         min_stem (int): Minimum number of bases in the stem for stable hairpin.
@@ -16,34 +126,55 @@ def hairpin_counter(sequence, min_stem=3, min_loop=4, max_loop=9):
             - The count of potential hairpin structures.
             - A single string showing the detected hairpins in the format 'stem1(loop)stem2_rc', or None if no hairpins are found.
     """
-    count = 0
-    seq_len = len(sequence)
-    hairpin_string = ""
+    pairs = find_hairpins(sequence, min_stem, min_loop, max_loop)
+    return len(pairs), format_hairpins(sequence, pairs, min_stem)
 
-    # Iterate through each base to consider it as a start of a stem
-    for i in range(seq_len):
-        # Only consider end points that would fit within the loop constraints
-        for j in range(i + min_stem + min_loop, min(i + min_stem + max_loop + 1, seq_len)):
-            stem1 = sequence[i:i+min_stem]
-            stem2 = sequence[j:j+min_stem]
 
-            # Check if the stems are complementary (reverse complement match)
-            stem2_rc = reverse_complement(stem2)
-
-            if stem1 == stem2_rc:
-                count += 1
+def kmer_codes(codes, min_stem=3):
+    """
+    Vectorized k-mer encoding of base codes (see seq_utils.dna_encoding) for one sequence or a batch.
 
-                # Extract the loop sequence
-                loop = sequence[i+min_stem:j]
+    Parameters:
+        codes (np.ndarray): Base codes, with the sequence along the last axis.
+        min_stem (int): Length of the stems (k-mers).
 
-                # Create the linear representation (now correctly reversed for output)
-                hairpin_representation = f"{stem1}({loop}){stem2}"
+    Returns:
+        tuple: (np.ndarray, np.ndarray) with, for the k-mer starting at each position, its 2-bit code
+        and the code of its reverse complement; k-mers containing an unknown base get -1 and -2
+        so that they never pair.
+    """
+    n_kmers = codes.shape[-1] - min_stem + 1
+    shape = codes.shape[:-1] + (max(n_kmers, 0),)
+    code = np.zeros(shape, dtype=np.int64)
+    rc_code = np.zeros(shape, dtype=np.int64)
+    valid = np.ones(shape, dtype=bool)
+    for k in range(min_stem):
+        bits = codes[..., k:k + shape[-1]].astype(np.int64)
+        code = (code << 2) | bits
+        rc_code |= (3 - bits) << (2 * k)
+        valid &= bits < 4
+    code[~valid] = -1
+    rc_code[~valid] = -2
+    return code, rc_code
+
+def find_hairpins_batch(codes, min_stem=3, min_loop=4, max_loop=9):
+    """
+    Vectorized find_hairpins over base codes of one sequence or a batch of equal-length sequences.
 
-                # Append the linear hairpin representation to the string
-                hairpin_string += f"Hairpin {count}: {hairpin_representation}\n"
+    Parameters:
+        codes (np.ndarray): Base codes, with the sequence along the last axis.
+        min_stem (int): Minimum number of bases in the stem for stable hairpin.
+        min_loop (int): Minimum number of bases in the loop.
+        max_loop (int): Maximum number of bases in the loop.
 
-    # Return count and the formatted hairpin string, or None if no hairpins found
-    return count, hairpin_string if count > 0 else None
+    Returns:
+        list: (d, mask) for each stem distance d = j - i, where mask[..., i] is True when (i, i + d)
+        is a stem pair.
+    """
+    code, rc_code = kmer_codes(codes, min_stem)
+    n_kmers = code.shape[-1]
+    return [(d, code[..., :n_kmers - d] == rc_code[..., d:])
+            for d in range(min_stem + min_loop, min(min_stem + max_loop + 1, n_kmers))]
 
 
 def main():
@@ -0,0 +1,395 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from genedesign import reference_data
+from genedesign.transcript_designer import TranscriptDesigner
+from genedesign.operon_designer import OperonDesigner
+from genedesign.transcript_to_seq import transcript_to_seq
+from genedesign.operon_to_seq import operon_to_seq
+from genedesign.models.composition import Composition
+from genedesign.models.host import Host
+
+DEFAULT_SEED = 42          # Seed of requests that do not give one, so equal requests get equal designs
+LATENCY_WINDOW = 1000      # Number of recent latencies kept per endpoint for the percentiles
+MAX_BODY_SIZE = 1 << 20    # Largest accepted request body, in bytes
+
+STATUS_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                  413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+class RequestError(Exception):
+    """A request the server rejects, with the HTTP status to answer."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ServerMetrics:
+    """
+    Request and batching metrics of a DesignServer.
+
+    Attributes:
+        started (float): time.monotonic() at startup.
+        requests (dict): Per endpoint, the number of requests and of failed requests.
+        latencies (dict): Per endpoint, the latencies in seconds of the last LATENCY_WINDOW requests.
+        batch_sizes (deque): The sizes of the last LATENCY_WINDOW transcript batches.
+        batches (int): Number of transcript batches dispatched.
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = {}
+        self.latencies = {}
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self.batches = 0
+
+    def record_request(self, endpoint, latency, failed):
+        counts = self.requests.setdefault(endpoint, {'count': 0, 'errors': 0})
+        counts['count'] += 1
+        counts['errors'] += int(failed)
+        self.latencies.setdefault(endpoint, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def record_batch(self, size):
+        self.batches += 1
+        self.batch_sizes.append(size)
+
+    def snapshot(self, queue_depth=0, batches_in_flight=0):
+        """
+        Returns the metrics as a JSON-serializable dict.
+
+        Parameters:
+            queue_depth (int): Number of transcript requests waiting for a batch.
+            batches_in_flight (int): Number of batches being designed.
+        """
+        endpoints = {}
+        for endpoint, counts in self.requests.items():
+            latencies = sorted(self.latencies[endpoint])
+            endpoints[endpoint] = dict(counts, latency_ms={
+                'mean': 1000 * sum(latencies) / len(latencies),
+                'p50': 1000 * _percentile(latencies, 0.50),
+                'p95': 1000 * _percentile(latencies, 0.95),
+                'p99': 1000 * _percentile(latencies, 0.99),
+                'max': 1000 * latencies[-1],
+            })
+        return {
+            'uptime_s': time.monotonic() - self.started,
+            'endpoints': endpoints,
+            'batches': {
+                'count': self.batches,
+                'mean_size': sum(self.batch_sizes) / len(self.batch_sizes) if self.batch_sizes else 0.0,
+                'max_size': max(self.batch_sizes, default=0),
+            },
+            'queue_depth': queue_depth,
+            'batches_in_flight': batches_in_flight,
+        }
+
+def _percentile(sorted_values, fraction):
+    """The value below which the given fraction of sorted_values lies (nearest rank)."""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+class DesignServer:
+    """
+    A long-lived asyncio design server over HTTP (TCP or Unix socket) with JSON bodies.
+
+    Design runs in a pool of worker processes, each holding an initiated TranscriptDesigner and
+    OperonDesigner for its whole life, so requests do not pay for initiation. Transcript requests
+    arriving together are grouped into batches of up to max_batch peptides (waiting at most
+    batch_window seconds for more), and each batch is designed with one TranscriptDesigner.run_batch
+    call in a worker. Every request is designed from its own seed (DEFAULT_SEED if it gives none),
+    so the result does not depend on how requests were batched.
+
+    Endpoints:
+        POST /design/transcript  {"peptide": str, "seed": int (optional)}
+        POST /design/operon      {"proteins": [str], "promoter": str, "terminator": str, "seed": int (optional)}
+        GET  /metrics            Request counts, latency percentiles and batching metrics
+        GET  /health             {"status": "ok"}
+    """
+
+    def __init__(self, workers=1, max_batch=16, batch_window=0.005, designer_settings=None):
+        """
+        Parameters:
+            workers (int): Number of worker processes.
+            max_batch (int): Largest number of peptides designed in one batch.
+            batch_window (float): Seconds a batch waits for more requests once a worker is free.
+            designer_settings (dict): Keyword arguments of the workers' TranscriptDesigner.
+        """
+        self.workers = workers
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.designer_settings = designer_settings or {}
+        self.metrics = ServerMetrics()
+        self.executor = None
+        self.server = None
+        self._queue = None
+        self._slots = None
+        self._batch_loop_task = None
+        self._batches = set()
+
+    async def start(self, host="127.0.0.1", port=8134, path=None):
+        """
+        Starts the worker pool and listens on host:port, or on the Unix socket path if given.
+
+        Returns:
+            asyncio.AbstractServer: The listening server.
+        """
+        # Forked workers inherit the reference data instead of each loading it again
+        reference_data.preload()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_server_worker,
+                                            initargs=(self.designer_settings,))
+        # Start every worker now rather than on the first requests
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self.executor, _ping) for _ in range(self.workers)])
+
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batch_loop_task = asyncio.ensure_future(self._batch_loop())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        else:
+            self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        """Stops listening, cancels the batching and shuts the worker pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self._batch_loop_task is not None:
+            self._batch_loop_task.cancel()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+    async def design_transcript(self, peptide, seed=DEFAULT_SEED):
+        """
+        Designs the transcript of a peptide in the next batch.
+
+        Returns:
+            dict: The transcript (see transcript_to_dict), or {'error': message} if the design failed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((peptide, seed, future))
+        return await future
+
+    async def design_operon(self, proteins, promoter, terminator, seed=DEFAULT_SEED):
+        """
+        Designs an operon in a worker, its transcripts with distinct, jointly assigned RBSs.
+
+        Returns:
+            dict: The transcripts and sequence of the operon, or {'error': message} if the design failed.
+        """
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, _design_operon_in_worker, proteins, promoter, terminator, seed)
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            # Requests keep queueing while every worker is busy
+            await self._slots.acquire()
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.ensure_future(self._run_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch):
+        self.metrics.record_batch(len(batch))
+        try:
+            tasks = [(peptide, seed) for peptide, seed, _ in batch]
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _design_transcripts_in_worker, tasks)
+        except Exception as e:
+            results = [{'error': f"Design worker failed: {e}"}] * len(batch)
+        finally:
+            self._slots.release()
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                start = time.monotonic()
+                status, payload = await self._respond(method, path, body)
+                if path.startswith('/design/'):
+                    self.metrics.record_request(path, time.monotonic() - start, status != 200)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                _write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except RequestError as e:
+            _write_response(writer, e.status, {'error': str(e)}, False)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, method, path, body):
+        """Routes a request, returning (status, JSON payload)."""
+        routes = {
+            '/design/transcript': ('POST', self._transcript_endpoint),
+            '/design/operon': ('POST', self._operon_endpoint),
+            '/metrics': ('GET', self._metrics_endpoint),
+            '/health': ('GET', self._health_endpoint),
+        }
+        if path not in routes:
+            return 404, {'error': f"Unknown path '{path}'."}
+        expected_method, endpoint = routes[path]
+        if method != expected_method:
+            return 405, {'error': f"{path} expects {expected_method}."}
+        try:
+            params = json.loads(body) if body else {}
+            if not isinstance(params, dict):
+                raise ValueError("The request body must be a JSON object.")
+            result = await endpoint(params)
+        except (ValueError, KeyError, TypeError) as e:
+            return 400, {'error': f"Invalid request: {e}"}
+        return (422 if 'error' in result else 200), result
+
+    async def _transcript_endpoint(self, params):
+        return await self.design_transcript(_string(params, 'peptide'), _seed(params))
+
+    async def _operon_endpoint(self, params):
+        proteins = params['proteins']
+        if not isinstance(proteins, list) or not all(isinstance(protein, str) for protein in proteins):
+            raise ValueError("'proteins' must be a list of strings.")
+        return await self.design_operon(proteins, _string(params, 'promoter'), _string(params, 'terminator'),
+                                        _seed(params))
+
+    async def _metrics_endpoint(self, params):
+        return self.metrics.snapshot(self._queue.qsize(), len(self._batches))
+
+    async def _health_endpoint(self, params):
+        return {'status': 'ok'}
+
+def _string(params, key):
+    value = params[key]
+    if not isinstance(value, str):
+        raise ValueError(f"'{key}' must be a string.")
+    return value
+
+def _seed(params):
+    seed = params.get('seed', DEFAULT_SEED)
+    if not isinstance(seed, int) or isinstance(seed, bool) or seed < 0:
+        raise ValueError("'seed' must be a non-negative integer.")
+    return seed
+
+async def _read_request(reader):
+    """Reads one HTTP/1.1 request, returning (method, path, headers, body), or None at end of stream."""
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise RequestError(400, "Malformed request line.")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise RequestError(400, "Invalid Content-Length.")
+    if length > MAX_BODY_SIZE:
+        raise RequestError(413, f"Request bodies are limited to {MAX_BODY_SIZE} bytes.")
+    body = await reader.readexactly(length) if length else b''
+    return method.upper(), target.split('?', 1)[0], headers, body
+
+def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {STATUS_REASONS[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+
+def transcript_to_dict(transcript):
+    """
+    The JSON form of a Transcript: its peptide, RBS, codons, CDS and mRNA sequence (UTR in lower case).
+    """
+    return {
+        'peptide': transcript.peptide,
+        'rbs': {'gene_name': transcript.rbs.gene_name, 'utr': transcript.rbs.utr},
+        'codons': list(transcript.codons),
+        'cds': ''.join(transcript.codons),
+        'sequence': transcript_to_seq(transcript),
+    }
+
+# Per-process designers of the server's worker pool, created once by _init_server_worker
+_worker = {}
+
+def _init_server_worker(designer_settings):
+    designer = TranscriptDesigner(**designer_settings)
+    designer.initiate()
+    # The operon designer shares the initiated transcript designer rather than initiating its own
+    operon_designer = OperonDesigner(optimal_rbs=True)
+    operon_designer.td = designer
+    _worker['designer'] = designer
+    _worker['operon_designer'] = operon_designer
+
+def _ping():
+    return True
+
+def _design_transcripts_in_worker(tasks):
+    peptides = [peptide for peptide, _ in tasks]
+    seeds = [seed for _, seed in tasks]
+    results = _worker['designer'].run_batch(peptides, seeds=seeds)
+    return [{'error': str(result.error)} if result.error else transcript_to_dict(result.transcript)
+            for result in results]
+
+def _design_operon_in_worker(proteins, promoter, terminator, seed):
+    operon_designer = _worker['operon_designer']
+    operon_designer.td.reseed(seed)
+    try:
+        operon = operon_designer.run(Composition(Host.Ecoli, promoter, proteins, terminator))
+    except Exception as e:
+        return {'error': str(e)}
+    return {'transcripts': [transcript_to_dict(transcript) for transcript in operon.transcripts],
+            'sequence': operon_to_seq(operon)}
+
+async def serve(args):
+    server = DesignServer(args.workers, args.max_batch, args.batch_window)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"Design server listening on {where} with {args.workers} workers")
+    try:
+        await listener.serve_forever()
+    finally:
+        await server.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serves transcript and operon design over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8134, help="TCP port to listen on")
+    parser.add_argument("--unix", help="Unix socket path to listen on instead of TCP")
+    parser.add_argument("--workers", type=int, default=1, help="Number of design worker processes")
+    parser.add_argument("--max-batch", type=int, default=16, help="Largest number of peptides designed in one batch")
+    parser.add_argument("--batch-window", type=float, default=0.005,
+                        help="Seconds a batch waits for more requests once a worker is free")
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -1,15 +1,65 @@
-import random
+import hashlib
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Set
+import numpy as np
+from genedesign import reference_data
 from genedesign.rbs_chooser import RBSChooser
+from genedesign.models.rbs_option import RBSOption
 from genedesign.models.transcript import Transcript
 from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
 from genedesign.checkers.internal_promoter_checker import PromoterChecker
-from genedesign.checkers.hairpin_checker import hairpin_checker
 from genedesign.checkers.codon_checker import CodonChecker
 from genedesign.checkers.gc_checker import GCContentChecker
+from genedesign.segment_evaluator import SegmentEvaluator, ACCEPT, SCORE
+from genedesign.beam_search import BeamSearchEngine
+from genedesign.design_cache import DesignCache, DEFAULT_MAX_ENTRIES, design_settings, design_key
+from genedesign.seq_utils.codon_sampler import CodonSampler
+from genedesign.seq_utils.dna_encoding import decode_codons, CODONS
+
+@dataclass(frozen=True)
+class DesignResult:
+    """
+    The outcome of one peptide of TranscriptDesigner.run_batch.
+
+    Attributes:
+        peptide (str): The peptide sequence.
+        transcript (Transcript or None): The designed transcript, None if the design failed.
+        error (Exception or None): The exception that stopped the design, None if it succeeded.
+    """
+    peptide: str
+    transcript: Optional[Transcript]
+    error: Optional[Exception]
+
+# Codon design engines of TranscriptDesigner
+MONTE_CARLO = "monte_carlo"
+BEAM_SEARCH = "beam"
+
+# Outcomes of a Monte Carlo window, counted in TranscriptDesigner.window_outcomes
+PASSED = "passed"             # A sampled candidate passed every checker
+MUTATED = "mutated"           # A targeted mutant of the best candidate passed
+STAGNATED = "stagnated"       # The score stopped rising before the attempt budget was spent
+INTRACTABLE = "intractable"   # A checker fails for every candidate; one passing all the others was found
+EXHAUSTED = "exhausted"       # Every attempt was scored without a passing candidate
 
 class TranscriptDesigner:
-    def __init__(self, codon_usage_file="genedesign/data/codon_usage.txt", seed=42):
-        random.seed(seed)
+    def __init__(self, codon_usage_file="genedesign/data/codon_usage.txt", seed=42, engine=MONTE_CARLO,
+                 beam_width=16, time_budget=None, cache_file=None, cache_size=DEFAULT_MAX_ENTRIES, window_memo_size=0,
+                 adaptive_search=False, min_progress=1):
+        if engine not in (MONTE_CARLO, BEAM_SEARCH):
+            raise ValueError(f"Unknown design engine '{engine}'.")
+        # The constructor arguments, to build identical designers in worker processes
+        self.settings = {'codon_usage_file': codon_usage_file, 'seed': seed, 'engine': engine,
+                         'beam_width': beam_width, 'time_budget': time_budget, 'cache_file': cache_file,
+                         'cache_size': cache_size, 'window_memo_size': window_memo_size,
+                         'adaptive_search': adaptive_search, 'min_progress': min_progress}
+        # Monte Carlo window decisions memoized by (seed, preamble, window, downstream), see monte_carlo_window
+        self.window_memo_size = window_memo_size
+        self.window_memo = OrderedDict()
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.reseed(seed)
         
         # Initialize components
         self.rbs_chooser = RBSChooser()
@@ -17,17 +67,44 @@ class TranscriptDesigner:
         self.promoter_checker = PromoterChecker()
         self.codon_checker = CodonChecker()
         self.gc_checker = GCContentChecker()
+        self.segment_evaluator = SegmentEvaluator(self.forbidden_checker, self.promoter_checker,
+                                                  self.codon_checker, self.gc_checker)
         
         # Parameters
         self.codon_usage_file = codon_usage_file
         self.window_size = 3
         self.downstream_size = 8
         self.max_attempts = 50
+        self.first_batch_size = 8  # Candidates scored together in the first batch, doubling afterwards
         self.preamble_codons_count = 8
-
-        # Codon weights and precomputed lists
+        self.adaptive_search = adaptive_search  # Adaptive attempt budget and targeted mutation, see search_window
+        self.min_progress = min_progress        # Gain over the best score a batch needs to score the next one
+        self.mutants_per_round = 8              # Targeted mutants in each batch after the first
+        self.window_attempts = Counter()  # Number of windows by the number of candidates they scored
+        self.window_outcomes = Counter()  # Number of windows by outcome (PASSED, MUTATED, ...)
+        self.engine = engine
+        self.beam_width = beam_width    # Partial CDSs kept by the beam search engine
+        self.time_budget = time_budget  # Seconds per peptide before the beam search turns greedy
+        self.beam_search = None
+        self.cache_file = cache_file    # Optional SQLite design cache shared across runs (see DesignCache)
+        self.cache_size = cache_size
+        self.design_cache = None
+
+        # Codon weights and their alias tables
         self.codon_weights = self.load_codon_usage(self.codon_usage_file)
-        self.weighted_codon_lists = self.precompute_weighted_codon_lists()
+        self.codon_sampler = CodonSampler(self.codon_weights)
+
+        # Per codon sampler row, the synonymous codons of least and most GC and their GC base counts,
+        # to bound and steer the GC content of candidates
+        gc_by_id = np.array([codon.count('G') + codon.count('C') for codon in CODONS])
+        sampler = self.codon_sampler
+        in_row = np.arange(sampler.codon_ids.shape[1]) < sampler.sizes[:, None]
+        row_gc = gc_by_id[sampler.codon_ids]
+        lowest = np.where(in_row, row_gc, 4).argmin(axis=1)
+        highest = np.where(in_row, row_gc, -1).argmax(axis=1)
+        rows = np.arange(len(sampler.amino_acids))
+        self.low_gc_ids, self.high_gc_ids = sampler.codon_ids[rows, lowest], sampler.codon_ids[rows, highest]
+        self.min_gc_counts, self.max_gc_counts = row_gc[rows, lowest], row_gc[rows, highest]
 
     def initiate(self):
         """Initialize all checkers."""
@@ -35,124 +112,212 @@ class TranscriptDesigner:
         self.promoter_checker.initiate()
         self.codon_checker.initiate()
         self.rbs_chooser.initiate()
+        self.beam_search = BeamSearchEngine(self.forbidden_checker, self.promoter_checker, self.codon_checker,
+                                            self.gc_checker, self.codon_weights, self.beam_width, self.time_budget)
+        if self.cache_file is not None and self.design_cache is None:
+            self.design_cache = DesignCache(self.cache_file, self.cache_size)
+
+    def reseed(self, seed):
+        """
+        Restart codon sampling from the given seed, so a design depends only on its own seed. The
+        stream belongs to this designer, so designers in other threads or processes do not affect it.
+
+        Parameters:
+            seed (int or np.random.SeedSequence): The seed of the stream, for instance one of
+                SeedSequence(seed).spawn(n) to give n parallel designers independent streams.
+        """
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
 
     def load_codon_usage(self, filepath):
-        """Load codon usage frequencies."""
-        codon_weights = {}
-        with open(filepath, 'r') as f:
-            for line in f:
-                parts = line.strip().split()
-                if len(parts) >= 3:
-                    codon, aa, freq = parts[0], parts[1], float(parts[2])
-                    if aa not in codon_weights:
-                        codon_weights[aa] = []
-                    codon_weights[aa].append((codon, freq))
-        return codon_weights
-
-    def precompute_weighted_codon_lists(self):
-        """Precompute weighted codon lists for each amino acid."""
-        weighted_codon_lists = {}
-        for aa, codons in self.codon_weights.items():
-            weighted_list = []
-            for codon, freq in codons:
-                count = max(int(round(freq * 100)), 1)  
-                weighted_list.extend([codon] * count)
-            weighted_codon_lists[aa] = weighted_list
-        return weighted_codon_lists
+        """Load codon usage frequencies: the shared (codon, frequency) pairs of each amino acid."""
+        return reference_data.codon_usage(filepath).codon_weights
+
+    def sample_codons(self, peptide, count):
+        """
+        Draw count codon choices for the peptide at once from the designer's random stream.
+
+        Returns:
+            np.ndarray: (count, len(peptide)) codon ids (see seq_utils.dna_encoding.CODONS).
+        """
+        return self.codon_sampler.sample(peptide, count, self.rng)
 
     def select_random_codon(self, aa):
         """Select a random codon for the given amino acid."""
-        return random.choice(self.weighted_codon_lists[aa])
+        return self.codon_sampler.sample_one(aa, self.rng)
 
     def segment_passes_all_checks(self, segment, codons):
         """Check if a segment passes all checks without scoring penalties."""
-        # Forbidden Sequence Checker
-        forbidden_passed, _ = self.forbidden_checker.run(segment)
-        if not forbidden_passed:
-            return False
-
-        # Internal Promoter Checker
-        promoter_passed, _ = self.promoter_checker.run(segment)
-        if not promoter_passed:
-            return False
-
-        # Hairpin Checker
-        hairpin_passed, _ = hairpin_checker(segment)
-        if not hairpin_passed:
-            return False
-
-        # Codon Usage Checker
-        codons_above_board, _, _, _ = self.codon_checker.run(codons)
-        if not codons_above_board:
-            return False
-
-        # GC Content Checker
-        gc_passed, _ = self.gc_checker.run(segment)
-        if not gc_passed:
-            return False
-
-        return True
+        return self.segment_evaluator.evaluate_segment(segment, codons, ACCEPT).passed
 
     def score_segment(self, segment, codons):
         """Score a DNA sequence segment based on various checkers."""
-        score = 0
-        forbidden_passed, _ = self.forbidden_checker.run(segment)
-        score += 30 if forbidden_passed else -50
-
-        promoter_passed, _ = self.promoter_checker.run(segment)
-        score += 30 if promoter_passed else -50
-
-        hairpin_passed, _ = hairpin_checker(segment)
-        score += 50 if hairpin_passed else -100
-
-        codons_above_board, diversity, rare_codons, cai = self.codon_checker.run(codons)
-        if codons_above_board:
-            score += int(diversity * 50) + int(cai * 100) - rare_codons * 10
-        else:
-            score -= 100
-
-        gc_passed, _ = self.gc_checker.run(segment)
-        score += 20 if gc_passed else -30
-
-        return score
+        return self.segment_evaluator.evaluate_segment(segment, codons, SCORE).score
 
     def max_score(self):
         """Calculate the maximum possible score based on scoring weights."""
         return 50 + 30 + 40 + 50 + 100 + 20
 
     def monte_carlo_window(self, window_peptide, codons_so_far, downstream_peptide):
-        """Finds the best codon sequence for a window."""
-        preamble_seq = ''.join(codons_so_far[-self.preamble_codons_count:] if codons_so_far else [])
-
-        best_codons, best_score = None, -float('inf')
-
-        for _ in range(self.max_attempts):
-            window_codons = [self.select_random_codon(aa) for aa in window_peptide]
-            downstream_codons = [self.select_random_codon(aa) for aa in downstream_peptide[:self.downstream_size]]
-            full_seq = preamble_seq + ''.join(window_codons) + ''.join(downstream_codons)
-            segment_codons = codons_so_far[-self.preamble_codons_count:] + window_codons
-
-            # Check if this segment passes all criteria
-            if self.segment_passes_all_checks(full_seq, segment_codons):
-                return window_codons  # Immediately accept if it passes all checks
-
-            # Otherwise, score the segment
-            score = self.score_segment(full_seq, segment_codons)
-            if score > best_score:
-                best_score = score
-                best_codons = window_codons
+        """
+        Finds the best codon sequence for a window.
+
+        With window_memo_size > 0, the candidates of a window are drawn from a stream seeded by the
+        designer's seed and the window's (preamble, window peptide, downstream peptide) key rather than
+        from the designer's stream, so the decision only depends on the seed and the key. Repeated
+        windows, as in linkers, tags and repeat domains, are then answered from a memo table of the
+        last window_memo_size decisions, with the same result as searching again.
+        """
+        if not self.window_memo_size:
+            return self.search_window(window_peptide, codons_so_far, downstream_peptide, self.rng)
+
+        preamble = tuple(codons_so_far[-self.preamble_codons_count:])
+        downstream_peptide = downstream_peptide[:self.downstream_size]
+        seed_key = (self.seed_sequence.entropy, self.seed_sequence.spawn_key)
+        key = (seed_key, preamble, window_peptide, downstream_peptide)
+        codons = self.window_memo.get(key)
+        if codons is not None:
+            self.window_memo.move_to_end(key)
+            self.memo_hits += 1
+            return list(codons)
+
+        self.memo_misses += 1
+        digest = hashlib.blake2b(repr(key[1:]).encode(), digest_size=8).digest()
+        rng = np.random.default_rng(np.random.SeedSequence(self.seed_sequence.entropy,
+                                                           spawn_key=self.seed_sequence.spawn_key
+                                                           + (int.from_bytes(digest, 'little'),)))
+        codons = self.search_window(window_peptide, codons_so_far, downstream_peptide, rng)
+        self.window_memo[key] = tuple(codons)
+        if len(self.window_memo) > self.window_memo_size:
+            self.window_memo.popitem(last=False)
+        return codons
+
+    def search_window(self, window_peptide, codons_so_far, downstream_peptide, rng):
+        """
+        Searches the best codon sequence for a window among candidates drawn from rng.
+
+        Candidates are scored in batches of growing size and the first passing one is accepted. With
+        adaptive_search, every batch after the first also holds mutants of the best candidate so far,
+        targeted at its failures (see mutate_candidate), and the next batch is only scored while the
+        best score rises by at least min_progress. Checkers that fail for every candidate, because they
+        fail inside the fixed preamble or the GC content cannot be brought in range, are ignored: the
+        search goes on with the other checkers and accepts the first candidate passing all of them. The
+        attempts and the outcome of every window are counted in window_attempts and window_outcomes.
+        """
+        # The preamble is fixed for every attempt, so the checkers only rescan the sampled codons
+        evaluator = self.segment_evaluator
+        evaluator.set_preamble(codons_so_far[-self.preamble_codons_count:] if codons_so_far else [])
+
+        # Draw every attempt up front; candidates are then scored in batches of growing size so that
+        # an early passing candidate does not pay for scoring all of them
+        downstream_peptide = downstream_peptide[:self.downstream_size]
+        peptide = window_peptide + downstream_peptide
+        width = len(window_peptide)
+        candidates = self.codon_sampler.sample(peptide, self.max_attempts, rng)
+        ignored = ()
+        if self.adaptive_search:
+            rows = self.codon_sampler.rows(peptide)
+            tail_gc_range = (self.min_gc_counts[rows].sum(), self.max_gc_counts[rows].sum(), 3 * len(peptide))
+            ignored = frozenset(evaluator.unavoidable_failures(tail_gc_range))
+
+        best_ids, best_score = None, -float('inf')
+        attempts, outcome = 0, EXHAUSTED
+        start, batch_size = 0, self.first_batch_size
+        while start < self.max_attempts:
+            stop = min(start + batch_size, self.max_attempts)
+            batch = candidates[start:stop]
+            mutated = 0
+            if self.adaptive_search and best_ids is not None:
+                # Targeted mutants of the best candidate take the place of the last random candidates
+                mutants = self.mutate_candidate(best_ids, peptide, width, rows, rng, ignored)
+                if mutants is not None:
+                    mutated = min(len(mutants), len(batch) - 1)
+                    batch = np.vstack([batch[:len(batch) - mutated], mutants[:mutated]])
+            passed, scores = evaluator.evaluate_batch(batch[:, :width], batch[:, width:], ignored)
+            attempts += len(batch)
+
+            passing = np.flatnonzero(passed)
+            if passing.size:
+                first = passing[0]
+                if ignored:
+                    outcome = INTRACTABLE
+                else:
+                    outcome = MUTATED if first >= len(batch) - mutated else PASSED
+                return self._window_result(batch[first], width, attempts, outcome)
+
+            # Otherwise, keep the highest scoring segment
+            best = int(scores.argmax())
+            progress = scores[best] >= best_score + self.min_progress
+            if scores[best] > best_score:
+                best_score, best_ids = scores[best], batch[best]
+
+            start, batch_size = stop, batch_size * 2
+            if self.adaptive_search and not progress:
+                outcome = STAGNATED
+                break
 
         # Return the highest scoring option if none fully passed
-        if best_codons is None:
+        if best_ids is None:
             raise RuntimeError("Unable to find valid codon sequence.")
-        
-        return best_codons
-
-    def run(self, peptide, ignores=set()):
-        """Designs a transcript for the peptide sequence."""
+        return self._window_result(best_ids, width, attempts, outcome)
+
+    def mutate_candidate(self, candidate_ids, peptide, width, rows, rng, ignored=()):
+        """
+        Draws mutants_per_round mutants of a failing candidate of the current window, targeted at its
+        failures: the codons its checkers point at (see SegmentEvaluator.failing_codons) are resampled,
+        and if the GC content is out of range, mutant k also swaps k + 1 random codons for their
+        synonym of least (or most) GC.
+
+        Parameters:
+            candidate_ids (np.ndarray): The window + downstream codon ids of the candidate.
+            peptide (str): The window + downstream peptide.
+            width (int): Number of window codons.
+            rows (np.ndarray): The codon sampler row of each amino acid of the peptide.
+            rng (np.random.Generator): The random stream to draw from.
+            ignored (collection): Checkers whose failures are not targeted (see SegmentEvaluator.evaluate_batch).
+
+        Returns:
+            np.ndarray: (mutants_per_round, len(peptide)) codon ids, or None if nothing can be mutated.
+        """
+        evaluator = self.segment_evaluator
+        codons = decode_codons(candidate_ids)
+        mutable = self.codon_sampler.sizes[rows] > 1
+        positions = [k for k in evaluator.failing_codons(codons[:width], codons[width:], ignored) if mutable[k]]
+        gc_passed, gc_content = self.gc_checker.run_incremental(evaluator.gc_state, ''.join(codons))
+        gc_passed = gc_passed or 'gc' in ignored
+        swappable = np.flatnonzero(mutable)
+        if not positions and (gc_passed or not swappable.size):
+            return None
+
+        count = self.mutants_per_round
+        mutants = np.repeat(candidate_ids[None, :], count, axis=0)
+        if positions:
+            mutants[:, positions] = self.codon_sampler.sample(''.join(peptide[k] for k in positions), count, rng)
+        if not gc_passed and swappable.size:
+            targets = (self.low_gc_ids if gc_content > self.gc_checker.max_gc else self.high_gc_ids)[rows]
+            order = rng.random((count, len(swappable))).argsort(axis=1)
+            for k in range(count):
+                swapped = swappable[order[k, :k + 1]]
+                mutants[k, swapped] = targets[swapped]
+        return mutants
+
+    def _window_result(self, candidate_ids, width, attempts, outcome):
+        """Counts the attempts and outcome of a window and returns the window codons of its chosen candidate."""
+        self.window_attempts[attempts] += 1
+        self.window_outcomes[outcome] += 1
+        return decode_codons(candidate_ids[:width])
+
+    def design_codons(self, peptide):
+        """Designs the codons of the peptide sequence, including the stop codon."""
         if self.codon_weights is None:
             raise RuntimeError("TranscriptDesigner not initiated. Please call 'initiate()' before 'run()'.")
 
+        if self.engine == BEAM_SEARCH:
+            if self.beam_search is None:
+                raise RuntimeError("TranscriptDesigner not initiated. Please call 'initiate()' before 'run()'.")
+            return self.beam_search.run(peptide) + ['TAA']
+
         codons = []
         current_index = 0
 
@@ -175,12 +340,147 @@ class TranscriptDesigner:
 
         # Add stop codon
         codons.append('TAA')  # You can choose the most frequent stop codon if preferred
+        return codons
+
+    def run(self, peptide, ignores=set()):
+        """
+        Designs a transcript for the peptide sequence. With a design cache, a design made before from
+        the same random stream state, ignores, parameters and data is returned from the cache, and the
+        stream continues as if it had been designed again. Designs with a time budget depend on timing,
+        so they are never cached.
+        """
+        if self.design_cache is None or self.time_budget is not None:
+            return self._design_transcript(peptide, ignores)
+
+        key = design_key(design_settings(self), peptide, self.rng.bit_generator.state, ignores)
+        cached = self.design_cache.get(key)
+        if cached is not None:
+            transcript, rng_state = cached
+            self.rng.bit_generator.state = rng_state
+            return transcript
+        transcript = self._design_transcript(peptide, ignores)
+        self.design_cache.put(key, transcript, self.rng.bit_generator.state)
+        return transcript
+
+    def _design_transcript(self, peptide, ignores):
+        """Designs a transcript for the peptide sequence, without the design cache."""
+        codons = self.design_codons(peptide)
 
         # Create the complete CDS
         cds = ''.join(codons)
 
-        # Select RBS (not using 'ignores' in this simplified version)
+        # Select RBS
         selected_rbs = self.rbs_chooser.run(cds, ignores)
 
         # Create the Transcript object
-        return Transcript(selected_rbs, peptide, codons)
\ No newline at end of file
+        return Transcript(selected_rbs, peptide, codons)
+
+    def run_batch(self, peptides, ignores: Set[RBSOption] = frozenset(), seeds=None, distinct_rbs=False,
+                  optimal_rbs=False, executor=None):
+        """
+        Designs transcripts for several peptide sequences, sharing the translation check and the RBS
+        scoring across them. A failing peptide does not stop the batch: its result carries the error.
+
+        Parameters:
+            peptides (list): The peptide sequences.
+            ignores (set): RBS options to ignore for every peptide.
+            seeds (list): Optional seed of each peptide, so that its design does not depend on the others.
+            distinct_rbs (bool): If True, no RBS is selected for two peptides: each peptide, in order, takes
+                the best RBS not selected for the ones before it. By default, every peptide takes its own
+                best RBS, independently of the others, so two peptides may share one.
+            optimal_rbs (bool): With distinct_rbs, assign the distinct RBSs of least total score over all
+                peptides (see RBSChooser.assign) instead, independently of the peptide order.
+            executor (concurrent.futures.Executor): Optional pool from make_executor designing the codons
+                of the peptides concurrently. Without seeds, each peptide's seed is drawn from this
+                designer's stream, so the designs do not depend on the number of workers.
+
+        Returns:
+            list: A DesignResult per peptide, in input order.
+        """
+        if self.codon_weights is None:
+            raise RuntimeError("TranscriptDesigner not initiated. Please call 'initiate()' before 'run_batch()'.")
+
+        if executor is not None:
+            if seeds is None:
+                seeds = self.rng.integers(np.iinfo(np.int64).max, size=len(peptides)).tolist()
+            outcomes = list(executor.map(_design_codons_in_worker, zip(peptides, seeds)))
+            codons_list = [codons for codons, _ in outcomes]
+            errors = [error for _, error in outcomes]
+        else:
+            codons_list, errors = [], []
+            for idx, peptide in enumerate(peptides):
+                if seeds is not None:
+                    self.reseed(seeds[idx])
+                codons, error = self._design_codons_or_error(peptide)
+                codons_list.append(codons)
+                errors.append(error)
+
+        # Check that every design translates back to its peptide in a single translation pass
+        designed = [idx for idx, error in enumerate(errors) if error is None]
+        cds_list = [''.join(codons_list[idx]) for idx in designed]
+        translator = self.rbs_chooser.translator
+        try:
+            translations = translator.run_batch(cds_list)
+        except ValueError:
+            translations = []
+            for cds in cds_list:
+                try:
+                    translations.append(translator.run(cds))
+                except ValueError as e:
+                    translations.append(e)
+        for idx, translation in zip(designed, translations):
+            if isinstance(translation, Exception):
+                errors[idx] = translation
+            elif translation != peptides[idx]:
+                errors[idx] = ValueError(f"Designed CDS translates to {translation} instead of {peptides[idx]}.")
+
+        # Score the RBS options of all remaining designs together
+        designed = [idx for idx, error in enumerate(errors) if error is None]
+        selected = self.rbs_chooser.run_batch([''.join(codons_list[idx]) for idx in designed], ignores, distinct_rbs,
+                                              optimal_rbs)
+        rbs_by_index = dict(zip(designed, selected))
+
+        results = []
+        for idx, peptide in enumerate(peptides):
+            error = errors[idx]
+            if error is None and rbs_by_index[idx] is None:
+                error = ValueError("No valid RBS options found after scoring.")
+            transcript = None if error else Transcript(rbs_by_index[idx], peptide, codons_list[idx])
+            results.append(DesignResult(peptide, transcript, error))
+        return results
+
+    def make_executor(self, workers):
+        """
+        Starts a pool of worker processes, each with an initiated designer configured like this one,
+        to design the codons of run_batch concurrently. The caller shuts it down.
+
+        Parameters:
+            workers (int): Number of worker processes.
+
+        Returns:
+            ProcessPoolExecutor: The pool.
+        """
+        # Forked workers inherit the reference data instead of each loading it again
+        reference_data.preload()
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_design_worker, initargs=(self.settings,))
+
+    def _design_codons_or_error(self, peptide):
+        """Designs the codons of the peptide, returning (codons, None), or (None, error) if it fails."""
+        try:
+            return self.design_codons(peptide), None
+        except Exception as e:
+            return None, e
+
+# Per-process designer of a make_executor pool, created once by _init_design_worker
+_worker = {}
+
+def _init_design_worker(settings):
+    designer = TranscriptDesigner(**settings)
+    designer.initiate()
+    _worker['designer'] = designer
+
+def _design_codons_in_worker(task):
+    peptide, seed = task
+    designer = _worker['designer']
+    designer.reseed(seed)
+    return designer._design_codons_or_error(peptide)
@@ -0,0 +1,263 @@
+import argparse
+import json
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from statistics import median
+import numpy as np
+from genedesign import reference_data
+from genedesign.transcript_designer import TranscriptDesigner
+from genedesign.rbs_chooser import RBSChooser
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.checkers.gc_checker import GCContentChecker
+from genedesign.seq_utils.hairpin_counter import hairpin_counter
+from genedesign.seq_utils.calc_edit_distance import calculate_edit_distance
+from genedesign.seq_utils.Translate import Translate
+from tests.benchmarking.proteome_benchmarker import iter_fasta, gene_seed
+
+PROTEOME_FILE = "tests/benchmarking/uniprotkb_proteome_UP000054015_2024_09_24.fasta"
+MIN_CDS_LENGTH = 900     # Length of the fixed CDS of the micro-benchmarks: the first source CDS this long
+MIN_REPEAT_TIME = 0.1    # Seconds a micro-benchmark repeat runs at least, calling the function as often as needed
+DEFAULT_THRESHOLD = 0.10 # Throughput loss beyond which compare reports a regression
+
+# Names of the micro-benchmarks, in the order micro_benchmarks builds them
+MICRO_BENCHMARKS = ('micro.forbidden_checker', 'micro.promoter_checker', 'micro.hairpin_checker',
+                    'micro.codon_checker', 'micro.gc_checker', 'micro.hairpin_counter',
+                    'micro.calculate_edit_distance', 'micro.translate', 'micro.rbs_chooser')
+
+class Benchmark:
+    """
+    One benchmark: a function called without arguments on fixed inputs.
+
+    Attributes:
+        name (str): The name of the benchmark, 'micro.*' or 'macro.*'.
+        function (callable): The timed function.
+        units (int): Work units per call (for instance the genes of a proteome), to report throughput.
+    """
+
+    def __init__(self, name, function, units=1):
+        self.name = name
+        self.function = function
+        self.units = units
+
+def fixed_inputs():
+    """
+    Returns the fixed inputs of the micro-benchmarks: a real E. coli CDS from the RBS source genes,
+    its codons, its protein and a second CDS to compare it to.
+    """
+    cdss = [cds for cds in reference_data.rbs_table().cdss if len(cds) >= MIN_CDS_LENGTH and len(cds) % 3 == 0]
+    cds, other = cdss[0], cdss[1]
+    translator = Translate()
+    translator.initiate()
+    return {
+        'cds': cds,
+        'codons': [cds[i:i + 3] for i in range(0, len(cds), 3)],
+        'protein': translator.run(cds),
+        'other_cds': other[:len(cds)],
+    }
+
+def micro_benchmarks():
+    """Builds the micro-benchmarks of each checker and sequence utility on the fixed inputs."""
+    inputs = fixed_inputs()
+    cds, codons = inputs['cds'], inputs['codons']
+
+    forbidden_checker = ForbiddenSequenceChecker()
+    forbidden_checker.initiate()
+    promoter_checker = PromoterChecker()
+    promoter_checker.initiate()
+    codon_checker = CodonChecker()
+    codon_checker.initiate()
+    gc_checker = GCContentChecker()
+    translator = Translate()
+    translator.initiate()
+    rbs_chooser = RBSChooser()
+    rbs_chooser.initiate()
+
+    functions = [
+        lambda: forbidden_checker.run(cds),
+        lambda: promoter_checker.run(cds),
+        lambda: hairpin_checker(cds),
+        lambda: codon_checker.run(codons),
+        lambda: gc_checker.run(cds),
+        lambda: hairpin_counter(cds),
+        lambda: calculate_edit_distance(cds, inputs['other_cds']),
+        lambda: translator.run(cds),
+        lambda: rbs_chooser.run(cds, set()),
+    ]
+    return [Benchmark(name, function) for name, function in zip(MICRO_BENCHMARKS, functions)]
+
+def macro_benchmarks(proteome_file=PROTEOME_FILE, genes=20, seed=42, engine="monte_carlo"):
+    """
+    Builds the macro-benchmarks: designing the first protein of the proteome, and its first genes
+    (the whole proteome with genes=None), each gene seeded as in proteome_benchmarker.
+    """
+    designer = TranscriptDesigner(engine=engine)
+    designer.initiate()
+    records = list(islice(iter_fasta(proteome_file), genes))
+    gene, protein = records[0]
+
+    def design_protein():
+        designer.reseed(gene_seed(seed, gene))
+        designer.run(protein, set())
+
+    def design_proteome():
+        for name, sequence in records:
+            designer.reseed(gene_seed(seed, name))
+            try:
+                designer.run(sequence, set())
+            except Exception:
+                pass  # Failing genes still cost their design time; correctness is proteome_benchmarker's job
+
+    protein_name, proteome_name = macro_benchmark_names(engine)
+    return [
+        Benchmark(protein_name, design_protein),
+        Benchmark(proteome_name, design_proteome, units=len(records)),
+    ]
+
+def macro_benchmark_names(engine="monte_carlo"):
+    """Returns the names of the macro-benchmarks of the engine, in the order macro_benchmarks builds them."""
+    return (f'macro.design_protein.{engine}', f'macro.design_proteome.{engine}')
+
+def is_selected(name, select):
+    """Returns True if the benchmark name contains one of the select strings, or if select is empty."""
+    return not select or any(pattern in name for pattern in select)
+
+def time_benchmark(benchmark, repeat, min_time=MIN_REPEAT_TIME):
+    """
+    Times a benchmark: after one warm-up call, each of repeat rounds calls the function as many times
+    as needed to run at least min_time seconds.
+
+    Returns:
+        dict: The calls per round, the best and median seconds per call, and the throughput in units per
+        second of the best round.
+    """
+    function = benchmark.function
+    start = time.perf_counter()
+    function()
+    number = max(1, int(min_time / max(time.perf_counter() - start, 1e-9)))
+
+    per_call = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        per_call.append((time.perf_counter() - start) / number)
+    best = min(per_call)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'best_s': best,
+        'median_s': median(per_call),
+        'units': benchmark.units,
+        'throughput': benchmark.units / best,
+    }
+
+def run_suite(select=None, repeat=5, macro_repeat=3, genes=20, engine="monte_carlo"):
+    """
+    Runs the micro- and macro-benchmarks whose names contain one of the select strings (all by default).
+
+    Returns:
+        dict: The environment ('meta') and the result of each benchmark ('benchmarks'), as time_benchmark gives it.
+    """
+    results = {}
+    suites = [(MICRO_BENCHMARKS, micro_benchmarks, repeat),
+              (macro_benchmark_names(engine), lambda: macro_benchmarks(genes=genes, engine=engine), macro_repeat)]
+    for names, build, rounds in suites:
+        # Building a suite initiates checkers or a designer, so suites without a selected benchmark are skipped
+        if not any(is_selected(name, select) for name in names):
+            continue
+        for benchmark in build():
+            if not is_selected(benchmark.name, select):
+                continue
+            results[benchmark.name] = time_benchmark(benchmark, rounds)
+            print(f"{benchmark.name:45s} {format_result(results[benchmark.name])}", file=sys.stderr)
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'genes': genes,
+        },
+        'benchmarks': results,
+    }
+
+def format_result(result):
+    """Formats the time per call and throughput of a time_benchmark result."""
+    return f"{result['best_s'] * 1000:10.3f} ms/call  {result['throughput']:12.1f} units/s"
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares the throughput of the benchmarks of two runs.
+
+    Parameters:
+        baseline (dict): The reference run_suite output.
+        current (dict): The run_suite output to check.
+        threshold (float): Relative throughput loss beyond which a benchmark regressed.
+
+    Returns:
+        list: A (name, baseline throughput, current throughput, relative change, regressed) tuple for
+        each benchmark of both runs, in name order.
+    """
+    rows = []
+    for name in sorted(baseline['benchmarks'].keys() & current['benchmarks'].keys()):
+        before = baseline['benchmarks'][name]['throughput']
+        after = current['benchmarks'][name]['throughput']
+        change = after / before - 1
+        rows.append((name, before, after, change, change < -threshold))
+    return rows
+
+def missing_benchmarks(baseline, current):
+    """Returns the names of the baseline benchmarks absent from the current run (removed, renamed or not selected)."""
+    return sorted(baseline['benchmarks'].keys() - current['benchmarks'].keys())
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro- and macro-benchmarks of the design pipeline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks and save the results as JSON")
+    run.add_argument("--output", default="benchmark_results.json", help="JSON file of the results (or baseline)")
+    run.add_argument("--select", nargs="*", help="Only run the benchmarks whose names contain one of these")
+    run.add_argument("--repeat", type=int, default=5, help="Timed rounds of each micro-benchmark")
+    run.add_argument("--macro-repeat", type=int, default=3, help="Timed rounds of each macro-benchmark")
+    run.add_argument("--genes", type=int, default=20, help="Genes of the proteome macro-benchmark (0 for all)")
+    run.add_argument("--engine", choices=["monte_carlo", "beam"], default="monte_carlo", help="Codon design engine")
+
+    check = commands.add_parser("compare", help="Flag throughput regressions against a baseline")
+    check.add_argument("baseline", help="JSON results of the reference run")
+    check.add_argument("current", help="JSON results of the run to check")
+    check.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help="Relative throughput loss flagged as a regression (0.10 for 10%%)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        results = run_suite(args.select, args.repeat, args.macro_repeat, args.genes or None, args.engine)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold)
+    for name, before, after, change, regressed in rows:
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:45s} {before:12.1f} -> {after:12.1f} units/s  {change:+7.1%}  {flag}")
+    missing = missing_benchmarks(baseline, current)
+    for name in missing:
+        print(f"{name:45s} {baseline['benchmarks'][name]['throughput']:12.1f} -> {'missing':>12s}")
+    regressions = [row for row in rows if row[4]]
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} in {len(rows)} benchmarks")
+    if missing:
+        print(f"{len(missing)} baseline benchmark(s) missing from the current run: {', '.join(missing)}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,26 @@
 import os
+import argparse
 import traceback
 import csv
+import json
 import time
+import zlib
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
 from statistics import mean
 from genedesign.seq_utils.Translate import Translate
+from genedesign import reference_data
+from genedesign.profiling import Profiler, instrument, instrument_methods
 from genedesign.transcript_designer import TranscriptDesigner
 from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
 from genedesign.checkers.internal_promoter_checker import PromoterChecker
-from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.hairpin_checker import hairpin_checker, hairpin_chunk_counts, OVERLAP
 from genedesign.checkers.codon_checker import CodonChecker
 
-def parse_fasta(fasta_file):
+def iter_fasta(fasta_file):
     """
-    Parses the FASTA file to extract gene names and protein sequences.
+    Streams (gene name, protein sequence) records from the FASTA file, one record in memory at a time.
     """
-    sequences = {}
     current_gene = None
     current_sequence = []
 
@@ -23,7 +29,7 @@ def parse_fasta(fasta_file):
             line = line.strip()
             if line.startswith(">"):
                 if current_gene:
-                    sequences[current_gene] = ''.join(current_sequence)
+                    yield current_gene, ''.join(current_sequence)
                 gene_name = None
                 parts = line.split()
                 for part in parts:
@@ -37,56 +43,124 @@ def parse_fasta(fasta_file):
             else:
                 current_sequence.append(line)
         if current_gene:
-            sequences[current_gene] = ''.join(current_sequence)
-    
-    return sequences
+            yield current_gene, ''.join(current_sequence)
+
+def gene_seed(seed, gene):
+    """
+    Derives the codon sampling seed of one gene from the run seed, so a gene's design does not depend
+    on which genes were designed before it or in which process.
+    """
+    return zlib.crc32(f"{seed}:{gene}".encode())
+
+def design_gene(designer, gene, protein, seed):
+    """
+    Designs the transcript of one gene, returning (success, result) where result is either the
+    successful result or the error record.
+    """
+    try:
+        print(f"Processing gene: {gene} with protein sequence: {protein[:30]}...")
+        designer.reseed(gene_seed(seed, gene))
+        ignores = set()
+        transcript = designer.run(protein, ignores)
+        return True, {
+            'gene': gene,
+            'protein': protein,
+            'transcript': transcript
+        }
+    except Exception as e:
+        return False, {
+            'gene': gene,
+            'protein': protein,
+            'error': f"Error: {str(e)}\nTraceback: {traceback.format_exc()}"
+        }
+
+def process_gene(designer, validators, gene, protein, seed):
+    """
+    Designs and validates one gene. Returns its record: the error record if the design failed
+    (None otherwise), its validation failures, and the time spent designing and validating.
+    """
+    design_start = time.time()
+    success, result = design_gene(designer, gene, protein, seed)
+    design_time = time.time() - design_start
+
+    validation_start = time.time()
+    failures = validate_transcript(result, validators) if success else []
+    return {
+        'gene': gene,
+        'error': None if success else result,
+        'failures': failures,
+        'design_time': design_time,
+        'validation_time': time.time() - validation_start
+    }
+
+# Per-process designer, checkers and profiler of the worker pool, created once by init_worker
+_worker = {}
 
-def benchmark_proteome(fasta_file):
+def init_worker(designer_options=None, profile=False):
     """
-    Benchmarks the proteome using TranscriptDesigner.
+    Initializes the TranscriptDesigner (with the designer_options keyword arguments) and the
+    validation checkers of a pool worker. With profile, both are instrumented with a Profiler.
     """
-    designer = TranscriptDesigner()
+    designer = TranscriptDesigner(**(designer_options or {}))
     designer.initiate()
+    validators = make_validators()
+    _worker['designer'] = designer
+    _worker['validators'] = validators
+    _worker['profiler'] = profile_worker(designer, validators) if profile else None
 
-    proteome = parse_fasta(fasta_file)
-    successful_results = []
-    error_results = []
-
-    for gene, protein in proteome.items():
-        try:
-            print(f"Processing gene: {gene} with protein sequence: {protein[:30]}...")
-            ignores = set()
-            transcript = designer.run(protein, ignores)
-            successful_results.append({
-                'gene': gene,
-                'protein': protein,
-                'transcript': transcript
-            })
-        except Exception as e:
-            error_results.append({
-                'gene': gene,
-                'protein': protein,
-                'error': f"Error: {str(e)}\nTraceback: {traceback.format_exc()}"
-            })
-    
-    return successful_results, error_results
+def profile_worker(designer, validators):
+    """
+    Instruments the designer and the validation checkers with a new Profiler; validation stages are
+    recorded as 'Validation.<checker>.run'.
+    """
+    profiler = instrument(designer)
+    for name in ('forbidden', 'promoter', 'translator', 'codon'):
+        instrument_methods(profiler, validators[name], ('run',), f"Validation.{type(validators[name]).__name__}")
+    validators['hairpin'] = profiler.timed('Validation.hairpin_checker', validators['hairpin'])
+    return profiler
+
+def _process_in_worker(task):
+    record = process_gene(_worker['designer'], _worker['validators'], *task)
+    if _worker.get('profiler') is not None:
+        # Send the measurements of this gene along with its record
+        record['profile'] = _worker['profiler'].drain()
+    return record
 
-def analyze_errors(error_results):
+def iter_tasks(function, tasks, workers, chunksize, designer_options=None, profile=False):
     """
-    Write the error analysis to a text file.
+    Lazily runs function over an iterable of tasks, yielding the results in task order. With workers > 1
+    the tasks run in a pool of initialized workers, taking only a few chunks per worker from the
+    iterable at a time so that memory does not grow with the number of tasks. With profile, the
+    workers are instrumented (see init_worker).
     """
-    error_summary = {}
-    with open('error_summary.txt', 'w') as f:
-        for error in error_results:
-            error_message = error['error'].split("\n")[0]
-            error_summary[error_message] = error_summary.get(error_message, 0) + 1
-            f.write(f"Gene: {error['gene']}\n{error['error']}\n\n")
-    
-    return error_summary
+    tasks = iter(tasks)
+    if workers <= 1:
+        init_worker(designer_options, profile)
+        for task in tasks:
+            yield function(task)
+        return
+
+    # Forked workers inherit the reference data instead of each loading it again
+    reference_data.preload()
+    batch_size = workers * chunksize * 4
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(designer_options, profile)) as executor:
+        batch = list(islice(tasks, batch_size))
+        while batch:
+            yield from executor.map(function, batch, chunksize=chunksize)
+            batch = list(islice(tasks, batch_size))
 
-def validate_transcripts(successful_results):
+def write_error(f, error, error_summary):
     """
-    Validate the successful transcripts using various checkers, now including CodonChecker.
+    Appends one error record to the error analysis and counts it in error_summary.
+    """
+    error_message = error['error'].split("\n")[0]
+    error_summary[error_message] = error_summary.get(error_message, 0) + 1
+    f.write(f"Gene: {error['gene']}\n{error['error']}\n\n")
+
+def make_validators():
+    """
+    Initializes the checkers used to validate transcripts.
     """
     forbidden_checker = ForbiddenSequenceChecker()
     forbidden_checker.initiate()
@@ -96,118 +170,138 @@ def validate_transcripts(successful_results):
     translator.initiate()
     codon_checker = CodonChecker()  # Initialize CodonChecker
     codon_checker.initiate()  # Load the codon usage data
+    return {
+        'forbidden': forbidden_checker,
+        'promoter': promoter_checker,
+        'translator': translator,
+        'codon': codon_checker,
+        'hairpin': hairpin_checker
+    }
+
+def validate_transcript(result, validators):
+    """
+    Validates one successful transcript, returning its validation failures.
+    """
+    forbidden_checker = validators['forbidden']
+    promoter_checker = validators['promoter']
+    translator = validators['translator']
+    codon_checker = validators['codon']
+    check_hairpins = validators['hairpin']
 
     validation_failures = []
-    for result in successful_results:
-        cds = ''.join(result['transcript'].codons)
-        try:
-            # Check if CDS length is a multiple of 3
-            if len(cds) % 3 != 0:
-                raise ValueError("CDS length is not a multiple of 3.")
-
-            # Verify that the translated protein matches the original protein
-            original_protein = result['protein']
-            translated_protein = translator.run(cds)
-            if original_protein != translated_protein:
-                raise ValueError(f"Translation mismatch: Original {original_protein}, Translated {translated_protein}")
-
-            # Ensure CDS starts with valid start codon and ends with stop codon
-            if not (cds.startswith(("ATG", "GTG", "TTG")) and cds.endswith(("TAA", "TGA", "TAG"))):
-                raise ValueError("CDS does not start with a valid start codon or end with a valid stop codon.")
-        except ValueError as e:
-            validation_failures.append({
-                'gene': result['gene'],
-                'protein': result['protein'],
-                'cds': cds,
-                'site': f"Translation or completeness error: {str(e)}"
-            })
-            continue
-
-        # Validate against hairpins, forbidden sequences, and internal promoters
-        transcript_dna = result['transcript'].rbs.utr.upper() + cds
-        passed_hairpin, hairpin_string = hairpin_checker(transcript_dna)
-        if not passed_hairpin:
-            formatted_hairpin = hairpin_string.replace('\n', ' ').replace('"', "'")
-            validation_failures.append({
-                'gene': result['gene'],
-                'protein': result['protein'],
-                'cds': transcript_dna,
-                'site': f"Hairpin detected: {formatted_hairpin}"
-            })
-
-        passed_forbidden, forbidden_site = forbidden_checker.run(transcript_dna)
-        if not passed_forbidden:
-            validation_failures.append({
-                'gene': result['gene'],
-                'protein': result['protein'],
-                'cds': transcript_dna,
-                'site': f"Forbidden sequence: {forbidden_site}"
-            })
-
-        passed_promoter, found_promoter = promoter_checker.run(transcript_dna)
-        if not passed_promoter:
-            validation_failures.append({
-                'gene': result['gene'],
-                'protein': result['protein'],
-                'cds': transcript_dna,
-                'site': f"Constitutive promoter detected: {found_promoter}" if found_promoter else "Constitutive promoter detected"
-            })
-
-        codons_above_board, codon_diversity, rare_codon_count, cai_value = codon_checker.run(result['transcript'].codons)
-        if not codons_above_board:
-            validation_failures.append({
-                'gene': result['gene'],
-                'protein': result['protein'],
-                'cds': cds,
-                'site': f"Codon usage check failed: Diversity={codon_diversity}, Rare Codons={rare_codon_count}, CAI={cai_value}"
-            })
+    cds = ''.join(result['transcript'].codons)
+    try:
+        # Check if CDS length is a multiple of 3
+        if len(cds) % 3 != 0:
+            raise ValueError("CDS length is not a multiple of 3.")
+
+        # Verify that the translated protein matches the original protein
+        original_protein = result['protein']
+        translated_protein = translator.run(cds)
+        if original_protein != translated_protein:
+            raise ValueError(f"Translation mismatch: Original {original_protein}, Translated {translated_protein}")
+
+        # Ensure CDS starts with valid start codon and ends with stop codon
+        if not (cds.startswith(("ATG", "GTG", "TTG")) and cds.endswith(("TAA", "TGA", "TAG"))):
+            raise ValueError("CDS does not start with a valid start codon or end with a valid stop codon.")
+    except ValueError as e:
+        validation_failures.append({
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'cds': cds,
+            'site': f"Translation or completeness error: {str(e)}"
+        })
+        return validation_failures
+
+    # Validate against hairpins, forbidden sequences, and internal promoters
+    transcript_dna = result['transcript'].rbs.utr.upper() + cds
+    passed_hairpin, hairpin_string = check_hairpins(transcript_dna)
+    if not passed_hairpin:
+        formatted_hairpin = hairpin_string.replace('\n', ' ').replace('"', "'")
+        # Locate the chunk where the hairpins concentrate
+        chunk_counts = hairpin_chunk_counts(transcript_dna)
+        worst_chunk = max(range(len(chunk_counts)), key=chunk_counts.__getitem__)
+        validation_failures.append({
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'cds': transcript_dna,
+            'site': f"Hairpin detected: {formatted_hairpin}(max {chunk_counts[worst_chunk]} hairpins in chunk at bp {worst_chunk * OVERLAP})"
+        })
+
+    passed_forbidden, forbidden_site = forbidden_checker.run(transcript_dna)
+    if not passed_forbidden:
+        validation_failures.append({
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'cds': transcript_dna,
+            'site': f"Forbidden sequence: {forbidden_site}"
+        })
+
+    passed_promoter, found_promoter = promoter_checker.run(transcript_dna)
+    if not passed_promoter:
+        validation_failures.append({
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'cds': transcript_dna,
+            'site': f"Constitutive promoter detected: {found_promoter}" if found_promoter else "Constitutive promoter detected"
+        })
+
+    codons_above_board, codon_diversity, rare_codon_count, cai_value = codon_checker.run(result['transcript'].codons)
+    if not codons_above_board:
+        validation_failures.append({
+            'gene': result['gene'],
+            'protein': result['protein'],
+            'cds': cds,
+            'site': f"Codon usage check failed: Diversity={codon_diversity}, Rare Codons={rare_codon_count}, CAI={cai_value}"
+        })
     
     return validation_failures
 
-def write_validation_report(validation_failures):
+def checker_of_failure(site):
     """
-    Writes validation results to a TSV file.
+    Returns the checker category of a validation failure site, or None if it matches none.
     """
-    with open('validation_failures.tsv', 'w', newline='') as f:
-        writer = csv.writer(f, delimiter='\t')
-        writer.writerow(['gene', 'protein', 'cds', 'site'])
-        for failure in validation_failures:
-            writer.writerow([failure['gene'], failure['protein'], failure['cds'], failure['site']])
+    if "Forbidden sequence" in site:
+        return 'Forbidden Sequence Checker'
+    elif "Hairpin detected" in site:
+        return 'Hairpin Checker'
+    elif "Codon usage check failed" in site:
+        return 'Codon Usage Checker'
+    elif "Constitutive promoter detected" in site:
+        return 'Promoter Checker'
+    elif "Translation or completeness error" in site:
+        return 'Translation/Completeness Checker'
+    return None
 
-def generate_summary(total_genes, parsing_time, execution_time, errors_summary, validation_failures):
+def count_checker_failures(validation_failures, checker_failures=None):
     """
-    Generates a streamlined summary report categorizing validation failures by checker.
+    Counts validation failures by checker type, adding to checker_failures if given.
     """
-    total_validation_failures = len(validation_failures)
-    
-    # Categorize failures by checker type
-    checker_failures = {
-        'Forbidden Sequence Checker': 0,
-        'Hairpin Checker': 0,
-        'Codon Usage Checker': 0,
-        'Promoter Checker': 0,
-        'Translation/Completeness Checker': 0
-    }
-
-    # Increment the appropriate checker category based on the failure site
+    if checker_failures is None:
+        checker_failures = {
+            'Forbidden Sequence Checker': 0,
+            'Hairpin Checker': 0,
+            'Codon Usage Checker': 0,
+            'Promoter Checker': 0,
+            'Translation/Completeness Checker': 0
+        }
     for failure in validation_failures:
-        site = failure['site']
-        if "Forbidden sequence" in site:
-            checker_failures['Forbidden Sequence Checker'] += 1
-        elif "Hairpin detected" in site:
-            checker_failures['Hairpin Checker'] += 1
-        elif "Codon usage check failed" in site:
-            checker_failures['Codon Usage Checker'] += 1
-        elif "Constitutive promoter detected" in site:
-            checker_failures['Promoter Checker'] += 1
-        elif "Translation or completeness error" in site:
-            checker_failures['Translation/Completeness Checker'] += 1
+        checker = checker_of_failure(failure['site'])
+        if checker:
+            checker_failures[checker] += 1
+    return checker_failures
 
+def generate_summary(total_genes, design_time, validation_time, errors_summary, total_validation_failures,
+                     checker_failures):
+    """
+    Generates a streamlined summary report categorizing validation failures by checker. The runtimes
+    are the design and validation times summed over genes.
+    """
     # Generate the summary report
     with open('summary_report.txt', 'w') as f:
         f.write(f"Total genes processed: {total_genes}\n")
-        f.write(f"Parsing runtime: {parsing_time:.2f} seconds\n")
-        f.write(f"Execution runtime: {execution_time:.2f} seconds\n")
+        f.write(f"Design runtime: {design_time:.2f} seconds\n")
+        f.write(f"Validation runtime: {validation_time:.2f} seconds\n")
         f.write(f"Total exceptions: {sum(errors_summary.values())}\n")
 
         if errors_summary:
@@ -224,32 +318,151 @@ def generate_summary(total_genes, parsing_time, execution_time, errors_summary,
         for checker, count in checker_failures.items():
             f.write(f"- {checker}: {count} occurrences\n")
 
-def run_benchmark(fasta_file):
+REPORT_FILES = ['validation_failures.tsv', 'error_summary.txt']
+VALIDATION_COLUMNS = ['gene', 'protein', 'cds', 'site']  # Columns of validation_failures.tsv
+
+def load_checkpoint(checkpoint_file, fasta_file, seed, designer_options=None):
+    """
+    Loads the progress of an interrupted run of the same FASTA file, seed and designer options, or
+    None if there is none.
+    """
+    if not os.path.exists(checkpoint_file):
+        return None
+    with open(checkpoint_file, 'r') as f:
+        progress = json.load(f)
+    if (progress['fasta_file'] != fasta_file or progress['seed'] != seed
+            or progress.get('designer_options', {}) != (designer_options or {})):
+        return None
+    return progress
+
+def save_checkpoint(checkpoint_file, progress):
+    """
+    Atomically replaces the checkpoint with the current progress.
+    """
+    temp_file = checkpoint_file + '.tmp'
+    with open(temp_file, 'w') as f:
+        json.dump(progress, f)
+    os.replace(temp_file, checkpoint_file)
+
+def open_reports(progress):
+    """
+    Opens the report files for appending, truncated to the size recorded in the checkpoint so that
+    records written after the last checkpoint are not duplicated when resuming.
+    """
+    reports = {}
+    for path in REPORT_FILES:
+        offset = progress['report_offsets'].get(path, 0)
+        if offset and os.path.exists(path):
+            os.truncate(path, offset)
+            reports[path] = open(path, 'a', newline='')
+        else:
+            reports[path] = open(path, 'w', newline='')
+    return reports
+
+def run_benchmark(fasta_file, workers=1, chunksize=8, seed=42, checkpoint_file='benchmark_checkpoint.json',
+                  checkpoint_every=100, designer_options=None, profile_file=None):
     """
     Runs the complete benchmark process: parsing, running TranscriptDesigner, validating, and generating reports.
+
+    The proteome is processed as a stream: each FASTA record is designed and validated (in a pool of
+    workers processes when workers > 1) and its errors and validation failures are appended to the
+    reports right away, so memory does not grow with the proteome. Every checkpoint_every genes the
+    progress is saved to checkpoint_file; a rerun after a crash resumes from there. The runtimes are
+    the design and validation times summed over genes. designer_options are keyword arguments of
+    TranscriptDesigner, such as the design engine. With profile_file, the designer and validation
+    stages are profiled (see genedesign.profiling) and the merged measurements written there as JSON.
     """
-    start_time = time.time()
-    
-    # Benchmark the proteome
-    parsing_start = time.time()
-    successful_results, error_results = benchmark_proteome(fasta_file)
-    parsing_time = time.time() - parsing_start
-    
-    # Analyze and log errors
-    errors_summary = analyze_errors(error_results)
-    
-    # Validate the successful transcripts
-    validation_start = time.time()
-    validation_failures = validate_transcripts(successful_results)
-    execution_time = time.time() - validation_start
+    progress = load_checkpoint(checkpoint_file, fasta_file, seed, designer_options) or {
+        'fasta_file': fasta_file,
+        'seed': seed,
+        'designer_options': designer_options or {},
+        'records': 0,
+        'report_offsets': {},
+        'design_time': 0.0,
+        'validation_time': 0.0,
+        'errors_summary': {},
+        'validation_failures': 0,
+        'checker_failures': count_checker_failures([])
+    }
+
+    profiler = None
+    if profile_file:
+        profiler = Profiler()
+        if 'profile' in progress:
+            profiler.merge(progress['profile'])
+
+    reports = open_reports(progress)
+    error_file = reports['error_summary.txt']
+    validation_file = reports['validation_failures.tsv']
+    validation_writer = csv.writer(validation_file, delimiter='\t')
+    if not progress['records']:
+        validation_writer.writerow(VALIDATION_COLUMNS)
+
+    try:
+        records = islice(iter_fasta(fasta_file), progress['records'], None)
+        tasks = ((gene, protein, seed) for gene, protein in records)
+        for record in iter_tasks(_process_in_worker, tasks, workers, chunksize, designer_options,
+                                 profile=profiler is not None):
+            # Append the outcome of the gene to the reports
+            if record['error']:
+                write_error(error_file, record['error'], progress['errors_summary'])
+            for failure in record['failures']:
+                validation_writer.writerow([failure[column] for column in VALIDATION_COLUMNS])
+            count_checker_failures(record['failures'], progress['checker_failures'])
+
+            progress['records'] += 1
+            progress['validation_failures'] += len(record['failures'])
+            progress['design_time'] += record['design_time']
+            progress['validation_time'] += record['validation_time']
+            if profiler is not None:
+                profiler.merge(record['profile'])
+
+            if progress['records'] % checkpoint_every == 0:
+                for f in reports.values():
+                    f.flush()
+                progress['report_offsets'] = {path: f.tell() for path, f in reports.items()}
+                if profiler is not None:
+                    progress['profile'] = profiler.to_dict()
+                save_checkpoint(checkpoint_file, progress)
+    finally:
+        for f in reports.values():
+            f.close()
 
-    # Write validation and error reports
-    write_validation_report(validation_failures)
-    
     # Generate the summary report
-    total_genes = len(successful_results) + len(error_results)
-    generate_summary(total_genes, parsing_time, execution_time, errors_summary, validation_failures)
+    generate_summary(progress['records'], progress['design_time'], progress['validation_time'],
+                     progress['errors_summary'], progress['validation_failures'], progress['checker_failures'])
+    if profiler is not None:
+        profiler.save(profile_file)
+
+    # The run is complete, the next one starts over
+    if os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
 
 if __name__ == "__main__":
-    fasta_file = "tests/benchmarking/uniprotkb_proteome_UP000054015_2024_09_24.fasta"
-    run_benchmark(fasta_file)
+    parser = argparse.ArgumentParser(description="Benchmarks TranscriptDesigner on a proteome.")
+    parser.add_argument("fasta_file", nargs="?", default="tests/benchmarking/uniprotkb_proteome_UP000054015_2024_09_24.fasta")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes (1 runs serially)")
+    parser.add_argument("--chunksize", type=int, default=8, help="Number of genes sent to a worker at a time")
+    parser.add_argument("--checkpoint", default="benchmark_checkpoint.json", help="Progress file used to resume a crashed run")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="Number of genes between checkpoints")
+    parser.add_argument("--engine", choices=["monte_carlo", "beam"], default="monte_carlo", help="Codon design engine")
+    parser.add_argument("--beam-width", type=int, default=16, help="Partial CDSs kept by the beam search engine")
+    parser.add_argument("--time-budget", type=float, help="Seconds per gene before the beam search turns greedy")
+    parser.add_argument("--window-memo", type=int, default=0, help="Monte Carlo window decisions memoized per worker")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Adaptive attempt budget and targeted mutation in the Monte Carlo windows")
+    parser.add_argument("--cache", help="SQLite design cache file reused across runs")
+    parser.add_argument("--profile", nargs="?", const="profile.json",
+                        help="Profile the design and validation stages, writing them to this JSON file (profile.json)")
+    args = parser.parse_args()
+    designer_options = {'engine': args.engine}
+    if args.engine == "beam":
+        designer_options.update(beam_width=args.beam_width, time_budget=args.time_budget)
+    if args.window_memo:
+        designer_options['window_memo_size'] = args.window_memo
+    if args.adaptive:
+        designer_options['adaptive_search'] = True
+    if args.cache:
+        designer_options['cache_file'] = args.cache
+    run_benchmark(args.fasta_file, args.workers, args.chunksize, checkpoint_file=args.checkpoint,
+                  checkpoint_every=args.checkpoint_every, designer_options=designer_options, profile_file=args.profile)
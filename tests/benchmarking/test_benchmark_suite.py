@@ -0,0 +1,35 @@
+import pytest
+from tests.benchmarking import benchmark_suite
+from tests.benchmarking.benchmark_suite import compare, missing_benchmarks, micro_benchmarks, run_suite, MICRO_BENCHMARKS
+
+def results(**throughputs):
+    return {'benchmarks': {name: {'throughput': throughput} for name, throughput in throughputs.items()}}
+
+def test_compare_flags_losses_beyond_threshold():
+    baseline = results(a=100.0, b=100.0, c=100.0, d=100.0)
+    current = results(a=95.0, b=80.0, c=150.0, d=100.0)
+
+    rows = compare(baseline, current)
+    assert [(name, regressed) for name, _, _, _, regressed in rows] == [('a', False), ('b', True), ('c', False),
+                                                                        ('d', False)]
+    assert rows[1][1:4] == (100.0, 80.0, pytest.approx(-0.2))
+    assert not any(row[4] for row in compare(baseline, current, threshold=0.25))
+
+def test_missing_benchmarks_are_listed():
+    baseline = results(kept=1.0, renamed=1.0, removed=1.0)
+    current = results(kept=1.0, renamed_new=1.0)
+
+    assert [row[0] for row in compare(baseline, current)] == ['kept']
+    assert missing_benchmarks(baseline, current) == ['removed', 'renamed']
+    assert missing_benchmarks(baseline, baseline) == []
+
+def test_micro_benchmark_names():
+    assert [benchmark.name for benchmark in micro_benchmarks()] == list(MICRO_BENCHMARKS)
+
+def test_run_suite_only_builds_selected_suites(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("macro benchmarks built without a selected macro benchmark")
+    monkeypatch.setattr(benchmark_suite, 'macro_benchmarks', fail)
+
+    suite = run_suite(select=['micro.gc_checker'], repeat=1)
+    assert list(suite['benchmarks']) == ['micro.gc_checker']
@@ -52,3 +52,25 @@ def test_allowed_sites(checker):
         result, site = checker.run(seq)
         print(f"result: {result} on {seq}")
         assert result == True
+
+def test_find_sites_reports_position_and_strand(checker):
+    # BsaI (GGTCTC) on the forward strand and again on the reverse strand (GAGACC)
+    seq = "ATGGGTCTCATGAGACCAT"
+    sites = checker.find_sites(seq)
+
+    assert [(hit.position, hit.site, hit.strand) for hit in sites] == [(3, "GGTCTC", '+'), (11, "GGTCTC", '-')]
+
+def test_find_sites_reports_every_hit(checker):
+    # EcoRI is palindromic, so each occurrence is reported on both strands
+    seq = "GAATTCAAGAATTCGCGGCCGC"
+    sites = checker.find_sites(seq)
+
+    assert [hit.position for hit in sites if hit.site == "GAATTC"] == [0, 0, 8, 8]
+    assert [hit.position for hit in sites if hit.site == "GCGGCCGC"] == [14, 14]
+    assert checker.run(seq) == (False, "GAATTC")
+
+def test_find_sites_incremental(checker):
+    seq = "ATGGGTCTCATGAGACCATGAATTC"
+    for cut in range(len(seq) + 1):
+        state = checker.prepare(seq[:cut])
+        assert checker.find_sites_incremental(state, seq[cut:]) == checker.find_sites(seq)
@@ -0,0 +1,39 @@
+import pytest
+from genedesign.checkers.hairpin_checker import (hairpin_checker, hairpin_chunk_counts, crowded_hairpins,
+                                                 prefix_fails_hairpins, prepare_hairpin_state, MIN_STEM)
+from genedesign.seq_utils.hairpin_counter import hairpin_counter
+
+def chunked_counts(dna):
+    """Hairpin counts of each 50 bp chunk, counted chunk by chunk."""
+    return [hairpin_counter(dna[i:i + 50])[0] for i in range(0, len(dna) - 50 + 1, 25)]
+
+@pytest.mark.parametrize("dna", [
+    "A" * 49,
+    "A" * 120,
+    "A" * 54 + "CCCCAAAAAAAGGGG" + "A" * 38,
+    "ATGCCCAAAAGGGTTTAGCGCTAAAGCGCAATTGCCCTTTAGGGCATGCATCCATGGACCCTTAGGGAAA",
+    "GCGTTACCGATCAGGCATTGACCTAGTTCGAACGTTAGCCATTGACGGTACCATGGACTTAGCAAGCTTGGCATGCC",
+])
+def test_chunk_counts_match_chunk_by_chunk(dna):
+    assert hairpin_chunk_counts(dna) == chunked_counts(dna)
+
+def test_short_sequence_has_no_chunks():
+    assert hairpin_chunk_counts("CCCCAAAAAAAGGGG") == []
+    assert hairpin_checker("CCCCAAAAAAAGGGG") == (True, None)
+
+def test_failing_chunk_reports_its_hairpins():
+    dna = "A" * 54 + "CCCCAAAAAAAGGGG" + "A" * 38
+    passed, hairpins = hairpin_checker(dna)
+
+    assert hairpin_chunk_counts(dna) == [0, 4, 4]
+    assert passed == False
+    assert hairpins == hairpin_counter(dna[25:75])[1]
+
+def test_crowded_hairpins_lie_in_failing_chunks():
+    dna = "A" * 54 + "CCCCAAAAAAAGGGG" + "A" * 38
+    crowded = crowded_hairpins(dna)
+
+    assert crowded and all(25 <= i < j and j + MIN_STEM <= 100 for i, j in crowded)
+    assert crowded_hairpins("A" * 120) == []
+    assert prefix_fails_hairpins(prepare_hairpin_state(dna)) == True
+    assert prefix_fails_hairpins(prepare_hairpin_state(dna[:60])) == False
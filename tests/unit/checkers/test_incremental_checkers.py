@@ -0,0 +1,100 @@
+import random
+import numpy as np
+import pytest
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.hairpin_checker import (hairpin_checker, prepare_hairpin_state, hairpin_checker_incremental,
+                                                 hairpin_checker_batch)
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.checkers.gc_checker import GCContentChecker
+from genedesign.seq_utils.dna_encoding import encode_dna, CODONS
+
+def random_splits(count=200, seed=134):
+    """
+    Random (prefix, suffix) pairs shaped like Monte Carlo segments: up to 8 preamble codons
+    followed by up to 11 sampled codons, with a few known promoter and forbidden motifs mixed in.
+    """
+    rng = random.Random(seed)
+    motifs = ["TTGACAATTAATCATCGAACTAGTATAAT", "GAATTC", "AAAAAAAAA", "CCCCCTTTCCCCCCAAACCCCCC"]
+    splits = []
+    for _ in range(count):
+        seq = ''.join(rng.choice("ACGT") for _ in range(rng.randint(0, 60)))
+        if rng.random() < 0.3:
+            pos = rng.randint(0, len(seq))
+            seq = seq[:pos] + rng.choice(motifs) + seq[pos:]
+        cut = rng.randint(0, len(seq))
+        splits.append((seq[:cut], seq[cut:]))
+    return splits
+
+@pytest.mark.parametrize("prefix, suffix", random_splits())
+def test_sequence_checkers_match_full_scan(prefix, suffix):
+    forbidden_checker = ForbiddenSequenceChecker()
+    forbidden_checker.initiate()
+    promoter_checker = PromoterChecker()
+    promoter_checker.initiate()
+    gc_checker = GCContentChecker()
+
+    seq = prefix + suffix
+    assert forbidden_checker.run_incremental(forbidden_checker.prepare(prefix), suffix) == forbidden_checker.run(seq)
+    assert promoter_checker.run_incremental(promoter_checker.prepare(prefix), suffix) == promoter_checker.run(seq)
+    assert hairpin_checker_incremental(prepare_hairpin_state(prefix), suffix) == hairpin_checker(seq)
+    assert gc_checker.run_incremental(gc_checker.prepare(prefix), suffix) == gc_checker.run(seq)
+
+def test_prefix_state_is_reusable():
+    promoter_checker = PromoterChecker()
+    promoter_checker.initiate()
+    prefix = "TTGACAATTAATCATCGAAC"
+    state = promoter_checker.prepare(prefix)
+    for suffix in ["TAGTATAAT", "GCGCGCGCG", "TAGTATAATGCGCGC", ""]:
+        assert promoter_checker.run_incremental(state, suffix) == promoter_checker.run(prefix + suffix)
+
+def test_codon_checker_matches_full_run():
+    codon_checker = CodonChecker()
+    codon_checker.initiate()
+    rng = random.Random(42)
+    codons = list(codon_checker.codon_frequencies)
+    for _ in range(100):
+        cds = [rng.choice(codons) for _ in range(rng.randint(0, 11))]
+        cut = rng.randint(0, len(cds))
+        state = codon_checker.prepare(cds[:cut])
+        assert codon_checker.run_incremental(state, cds[cut:]) == codon_checker.run(cds)
+
+def test_batch_checkers_match_incremental():
+    forbidden_checker = ForbiddenSequenceChecker()
+    forbidden_checker.initiate()
+    promoter_checker = PromoterChecker()
+    promoter_checker.initiate()
+    gc_checker = GCContentChecker()
+
+    rng = random.Random(11)
+    for prefix, _ in random_splits(count=40, seed=3):
+        suffixes = [''.join(rng.choice("ACGT") for _ in range(24)) for _ in range(10)]
+        suffixes[0] = "TTGACAATTAATCATCGAACTAGT"
+        suffixes[1] = "GCAGGAATTCAAGCTTCCTAGCGC"
+        codes = np.stack([encode_dna(suffix) for suffix in suffixes])
+
+        forbidden_state = forbidden_checker.prepare(prefix)
+        promoter_state = promoter_checker.prepare(prefix)
+        hairpin_state = prepare_hairpin_state(prefix)
+        gc_state = gc_checker.prepare(prefix)
+        gc_passed, gc_content = gc_checker.run_incremental_batch(gc_state, codes)
+        for row, suffix in enumerate(suffixes):
+            assert forbidden_checker.run_incremental_batch(forbidden_state, codes)[row] == \
+                forbidden_checker.run_incremental(forbidden_state, suffix)[0]
+            assert promoter_checker.run_incremental_batch(promoter_state, codes)[row] == \
+                promoter_checker.run_incremental(promoter_state, suffix)[0]
+            assert hairpin_checker_batch(hairpin_state, codes)[row] == \
+                hairpin_checker_incremental(hairpin_state, suffix)[0]
+            assert (gc_passed[row], gc_content[row]) == gc_checker.run_incremental(gc_state, suffix)
+
+def test_codon_checker_batch_matches_incremental():
+    codon_checker = CodonChecker()
+    codon_checker.initiate()
+    rng = random.Random(8)
+    for _ in range(50):
+        prefix = [rng.choice(CODONS) for _ in range(rng.randint(0, 8))]
+        codon_ids = np.array([[rng.randrange(len(CODONS)) for _ in range(3)] for _ in range(5)])
+        results = codon_checker.run_incremental_batch(codon_checker.prepare(prefix), codon_ids)
+        for row in range(len(codon_ids)):
+            expected = codon_checker.run_incremental(codon_checker.prepare(prefix), [CODONS[i] for i in codon_ids[row]])
+            assert tuple(result[row] for result in results) == expected
@@ -75,3 +75,33 @@ def test_j23119_promoters(promoter_checker):
         result, promoter = promoter_checker.run(seq)
         print(f"Sequence: {seq}, Expected: {expected}, Got: {result}, Promoter: {promoter}")
         assert result == expected, f"Test failed for sequence: {seq}. Expected {expected} but got {result}."
+
+def test_scan_reports_position_and_strand(promoter_checker):
+    promoter = "TTGACAATTAATCATCGAACTAGTATAAT"
+    promoter_rc = "ATTATACTAGTTCGATGATTAATTGTCAA"
+
+    score, position, strand = promoter_checker.scan("GCGC" + promoter + "GC")
+    assert score >= promoter_checker.threshold
+    assert (position, strand) == (4, '+')
+
+    score, position, strand = promoter_checker.scan("GC" + promoter_rc + "GCGCGC")
+    assert score >= promoter_checker.threshold
+    assert (position, strand) == (2, '-')
+
+def test_scan_short_sequence(promoter_checker):
+    assert promoter_checker.scan("TTGACA") == (float('-inf'), None, None)
+
+def test_scan_batch_matches_scan(promoter_checker):
+    seqs = [
+        "TTGACAATTAATCATCGAACTAGTATAAT",
+        "GCCTCTCTGAGACGCCGTATGAATTAATAGCGCTT",
+        "TTGACA",
+        "CCATTATACTAGTTCGATGATTAATTGTCAAGGCC",
+        "",
+    ]
+    scores, positions, strands = promoter_checker.scan_batch(seqs)
+    for seq, score, position, strand in zip(seqs, scores, positions, strands):
+        expected_score, expected_position, expected_strand = promoter_checker.scan(seq)
+        assert score == pytest.approx(expected_score)
+        assert position == (-1 if expected_position is None else expected_position)
+        assert strand == (expected_strand or '')
@@ -0,0 +1,49 @@
+import pytest
+from genedesign.transcript_designer import TranscriptDesigner
+from genedesign.seq_utils.Translate import Translate
+
+PEPTIDE = "MSKGEELFTGVVPILVELDGDVNGHKFSVSGEGEGDATYGKLTLKFICTTGKLPVPWPTLVTTFSYGVQCFSRYPDHMKQHDFFKSAMPEGYVQERTIFFKDDGNYKTRAEVKFEGDTLVNRIELKGIDFKEDGNILGHKLEYNYNSHNVYIMADKQKNGIKVNFKIRHNIEDGSVQLADHYQQNTPIGDGPVLLPDNHYLSTQSALSKDPNEKRDHMVLLEFVTAAGITHGMDELYK"
+
+@pytest.fixture(scope="module")
+def designer():
+    designer = TranscriptDesigner(engine="beam")
+    designer.initiate()
+    return designer
+
+@pytest.fixture(scope="module")
+def translator():
+    translator = Translate()
+    translator.initiate()
+    return translator
+
+def test_beam_design_translates_to_peptide(designer, translator):
+    transcript = designer.run(PEPTIDE)
+    assert transcript.codons[-1] == 'TAA'
+    assert translator.run(''.join(transcript.codons[:-1])) == PEPTIDE
+
+def test_beam_design_is_deterministic(designer):
+    assert designer.design_codons(PEPTIDE) == designer.design_codons(PEPTIDE)
+
+def test_beam_design_avoids_forbidden_sites(designer):
+    passed, site = designer.forbidden_checker.run(''.join(designer.design_codons("MKKKKKKKKKKSG")))
+    assert passed, site
+
+def test_exhausted_time_budget_designs_greedily(designer):
+    greedy = TranscriptDesigner(engine="beam", beam_width=1)
+    greedy.initiate()
+    timed_out = TranscriptDesigner(engine="beam", time_budget=0)
+    timed_out.initiate()
+    assert timed_out.design_codons(PEPTIDE) == greedy.design_codons(PEPTIDE)
+
+def test_unknown_amino_acid_raises_like_monte_carlo(designer):
+    monte_carlo = TranscriptDesigner()
+    monte_carlo.initiate()
+    for engine_designer in (designer, monte_carlo):
+        with pytest.raises(ValueError, match="Unknown amino acid 'B' in peptide."):
+            engine_designer.run("MKBLA")
+    errors = [engine_designer.run_batch(["MKBLA"])[0].error for engine_designer in (designer, monte_carlo)]
+    assert [(type(error), str(error)) for error in errors] == [(ValueError, "Unknown amino acid 'B' in peptide.")] * 2
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        TranscriptDesigner(engine="simulated_annealing")
@@ -0,0 +1,66 @@
+import pytest
+from genedesign.design_cache import DesignCache
+from genedesign.transcript_designer import TranscriptDesigner
+
+PEPTIDE = "MYPFIRTARMTVCAKKHVHLTRAAGLK"
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "designs.sqlite")
+
+def make_designer(cache_file, **kwargs):
+    designer = TranscriptDesigner(cache_file=cache_file, **kwargs)
+    designer.initiate()
+    return designer
+
+def test_hit_matches_design_and_continues_the_stream(cache_file):
+    plain = TranscriptDesigner()
+    plain.initiate()
+    plain.reseed(5)
+    expected = [plain.run(PEPTIDE), plain.run(PEPTIDE)]
+
+    first = make_designer(cache_file)
+    first.reseed(5)
+    assert [first.run(PEPTIDE), first.run(PEPTIDE)] == expected
+    assert (first.design_cache.hits, first.design_cache.misses) == (0, 2)
+
+    # Another designer sharing the file is served both designs, including the one from the advanced stream
+    second = make_designer(cache_file)
+    second.reseed(5)
+    assert [second.run(PEPTIDE), second.run(PEPTIDE)] == expected
+    assert (second.design_cache.hits, second.design_cache.misses) == (2, 0)
+    assert second.rng.random() == plain.rng.random()
+
+def test_parameters_and_ignores_are_part_of_the_key(cache_file):
+    designer = make_designer(cache_file)
+    designer.reseed(5)
+    transcript = designer.run(PEPTIDE)
+
+    designer.reseed(5)
+    designer.run(PEPTIDE, {transcript.rbs})
+    designer.max_attempts = 20
+    designer.reseed(5)
+    designer.run(PEPTIDE)
+    assert designer.design_cache.hits == 0
+    assert len(designer.design_cache) == 3
+
+def test_time_budget_designs_are_not_cached(cache_file):
+    designer = make_designer(cache_file, engine="beam", time_budget=10.0)
+    designer.run("MKKKKKKKKKKSG")
+    assert len(designer.design_cache) == 0
+
+def test_least_recently_used_design_is_evicted(cache_file):
+    designer = make_designer(cache_file)
+    designer.reseed(5)
+    transcript = designer.run(PEPTIDE)
+    state = designer.rng.bit_generator.state
+
+    cache = DesignCache(cache_file, max_entries=2)
+    cache.clear()
+    cache.put('a', transcript, state)
+    cache.put('b', transcript, state)
+    assert cache.get('a') == (transcript, state)
+    cache.put('c', transcript, state)
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
@@ -0,0 +1,16 @@
+from genedesign.operon_designer import OperonDesigner
+from genedesign.models.composition import Composition
+from genedesign.models.host import Host
+
+PROTEINS = ["MYPFIRTARMTVCAKKHVHL", "MSKGEELFTGVVPILV", "MKKKKKKKKHHHH", "MALLSSSLSSQIPTGSHPLT"]
+
+def test_parallel_mode_assigns_distinct_rbs():
+    comp = Composition(Host.Ecoli, "TTGACAATTAATCATCGAACTAGTATAAT", PROTEINS, "TGCCTGGCGGCAGTAGCGC")
+    designer = OperonDesigner(workers=2)
+    designer.initiate()
+    try:
+        operon = designer.run(comp)
+    finally:
+        designer.close()
+    assert [transcript.peptide for transcript in operon.transcripts] == PROTEINS
+    assert len({transcript.rbs for transcript in operon.transcripts}) == len(PROTEINS)
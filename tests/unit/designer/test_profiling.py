@@ -0,0 +1,56 @@
+import json
+import pytest
+from genedesign.profiling import Profiler, instrument, ATTEMPTS_PER_WINDOW
+from genedesign.transcript_designer import TranscriptDesigner
+
+PEPTIDE = "MYPFIRTARMTVCAKKHVHLTRAAGLK"
+
+@pytest.fixture
+def designer():
+    designer = TranscriptDesigner()
+    designer.initiate()
+    return designer
+
+def test_instrumented_designer_records_stages_and_attempts(designer):
+    profiler = instrument(designer)
+    designer.reseed(3)
+    transcript = designer.run(PEPTIDE, set())
+    data = profiler.to_dict()
+
+    windows = len(PEPTIDE) // designer.window_size
+    assert data['stages']['TranscriptDesigner.run']['calls'] == 1
+    assert data['stages']['TranscriptDesigner.monte_carlo_window']['calls'] == windows
+    assert data['stages']['SegmentEvaluator.check_hairpins_batch']['calls'] >= windows
+    assert data['stages']['PromoterChecker.run_incremental_batch']['calls'] >= windows
+    assert data['stages']['RBSChooser.run']['calls'] == 1
+    attempts = data['histograms'][ATTEMPTS_PER_WINDOW]
+    assert sum(attempts.values()) == windows
+    assert all(designer.first_batch_size <= int(value) <= designer.max_attempts for value in attempts)
+
+    # Profiling does not change the design, and leaves other designers untouched
+    plain = TranscriptDesigner()
+    plain.initiate()
+    plain.reseed(3)
+    assert plain.run(PEPTIDE, set()).codons == transcript.codons
+    assert not hasattr(plain.monte_carlo_window, 'profiled')
+
+def test_instrumenting_twice_fails(designer):
+    instrument(designer)
+    with pytest.raises(ValueError):
+        instrument(designer)
+
+def test_merge_and_drain_round_trip():
+    profiler = Profiler()
+    profiler.record('stage', 0.5)
+    profiler.record('stage', 0.25)
+    profiler.observe('histogram', 8)
+    data = json.loads(json.dumps(profiler.drain()))
+    assert profiler.to_dict() == {'stages': {}, 'histograms': {}}
+
+    total = Profiler()
+    total.merge(data)
+    total.merge(data)
+    assert total.calls == {'stage': 4}
+    assert total.seconds['stage'] == pytest.approx(1.5)
+    assert total.histograms == {'histogram': {8: 2}}
+    assert total.to_dict()['stages']['stage']['mean_ms'] == pytest.approx(375)
@@ -0,0 +1,147 @@
+import itertools
+import pickle
+import shutil
+import numpy as np
+import pytest
+from genedesign import reference_data
+from genedesign.rbs_chooser import (RBSChooser, compile_rbs_library, load_rbs_library, rbs_library_file,
+                                    save_rbs_library, min_cost_assignment)
+from genedesign.seq_utils.hairpin_counter import count_hairpins
+from genedesign.seq_utils.calc_edit_distance import calculate_edit_distance
+
+@pytest.fixture(scope="module")
+def chooser():
+    chooser = RBSChooser()
+    chooser.initiate()
+    return chooser
+
+CDS = [
+    "ATGGCTAGCAAAGGAGAAGAACTTTTCACTGGAGTTGTCCCAATTCTTGTTGAATTAGATGGTGATGTTAATGGGCACAAATTTTCT",
+    "GCTGGGATGCCCCCCCGTATG",
+    "ATGCCCAAAAAAAGGGCCCTTTTTTTAAG",
+]
+
+@pytest.mark.parametrize("cds", CDS)
+def test_precomputed_scores_match_full_scoring(chooser, cds):
+    first_six_aas = chooser.translator.run(cds[:18])
+    expected = [count_hairpins(rbs.utr + cds[:30]) + calculate_edit_distance(rbs.first_six_aas, first_six_aas)
+                for rbs in chooser.options]
+    scores = chooser.hairpin_scores(cds) + chooser.edit_distances(first_six_aas)
+    assert list(scores) == expected
+
+def test_run_returns_best_option_not_ignored(chooser):
+    cds = CDS[0]
+    scores = chooser.hairpin_scores(cds) + chooser.edit_distances(chooser.translator.run(cds[:18]))
+    best = chooser.run(cds, set())
+    assert scores[chooser.options.index(best)] == scores.min()
+
+    second = chooser.run(cds, {best})
+    assert second != best
+    assert scores[chooser.options.index(second)] >= scores.min()
+
+def test_run_queries_the_peptide_index_once_per_peptide(chooser, monkeypatch):
+    queries = []
+    distances = chooser.peptide_index.distances
+    monkeypatch.setattr(chooser.peptide_index, 'distances', lambda peptide: queries.append(peptide) or distances(peptide))
+    chooser.distance_cache.clear()
+
+    first_six_aas = chooser.translator.run(CDS[0][:18])
+    chooser.run(CDS[0], set())
+    chooser.run(CDS[0], set(chooser.options[:3]))
+    chooser.top_k(CDS[0], 5)
+    assert queries == [first_six_aas]
+    assert first_six_aas in chooser.distance_cache
+
+def test_run_raises_when_every_option_is_ignored(chooser):
+    with pytest.raises(ValueError):
+        chooser.run(CDS[0], set(chooser.options))
+
+@pytest.mark.parametrize("cds", CDS)
+def test_top_k_matches_full_sort(chooser, cds):
+    first_six_aas = chooser.translator.run(cds[:18])
+    scores = [count_hairpins(rbs.utr + cds[:30]) + calculate_edit_distance(rbs.first_six_aas, first_six_aas)
+              for rbs in chooser.options]
+    ignores = set(chooser.options[:10])
+    ranked = sorted((score, idx) for idx, score in enumerate(scores) if chooser.options[idx] not in ignores)
+    expected = [chooser.options[idx] for _, idx in ranked[:5]]
+    assert chooser.top_k(cds, 5, ignores) == expected
+    assert chooser.run(cds, ignores) == expected[0]
+
+def test_top_k_returns_fewer_when_options_run_out(chooser):
+    ignores = set(chooser.options[2:])
+    assert set(chooser.top_k(CDS[0], 5, ignores)) == set(chooser.options[:2])
+
+def test_run_batch_matches_run(chooser):
+    ignores = set(chooser.options[:3])
+    assert chooser.run_batch(CDS, ignores) == [chooser.run(cds, ignores) for cds in CDS]
+
+def test_run_batch_distinct(chooser):
+    selected = chooser.run_batch([CDS[0]] * 3, distinct=True)
+    assert selected[0] == chooser.run(CDS[0], set())
+    assert len(set(selected)) == 3
+    assert chooser.run_batch([CDS[0]], set(chooser.options)) == [None]
+
+def test_precompiled_library_matches_compiled(chooser):
+    compiled = compile_rbs_library(reference_data.MERGED_DATA_FILE)
+    loaded = load_rbs_library()
+    assert loaded.options == compiled.options == tuple(chooser.options)
+    assert np.array_equal(loaded.utr_hairpins, compiled.utr_hairpins)
+    assert np.array_equal(loaded.utr_tails, compiled.utr_tails)
+    assert not loaded.utr_tails.flags.writeable
+
+def test_stale_library_is_recompiled(tmp_path):
+    merged_data_file = str(tmp_path / "merged_data.csv")
+    shutil.copy(reference_data.MERGED_DATA_FILE, merged_data_file)
+    library = compile_rbs_library(merged_data_file)
+    save_rbs_library(library, merged_data_file)
+
+    # An outdated version stamp makes the loader compile and save the library again
+    with open(rbs_library_file(merged_data_file), 'rb') as f:
+        payload = pickle.load(f)
+    payload['version'] = -1
+    with open(rbs_library_file(merged_data_file), 'wb') as f:
+        pickle.dump(payload, f)
+    assert load_rbs_library(merged_data_file).options == library.options
+    with open(rbs_library_file(merged_data_file), 'rb') as f:
+        assert pickle.load(f)['version'] != -1
+
+def test_unreadable_library_is_recompiled(tmp_path):
+    merged_data_file = str(tmp_path / "merged_data.csv")
+    shutil.copy(reference_data.MERGED_DATA_FILE, merged_data_file)
+
+    # A pickle referring to a missing module fails with ModuleNotFoundError rather than UnpicklingError
+    with open(rbs_library_file(merged_data_file), 'wb') as f:
+        f.write(b"\x80\x04cmissing_module\nLibrary\n.")
+    assert load_rbs_library(merged_data_file).options == compile_rbs_library(merged_data_file).options
+    with open(rbs_library_file(merged_data_file), 'rb') as f:
+        assert isinstance(pickle.load(f), dict)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["merged_data.csv", "merged_data.rbslib"]
+
+def test_min_cost_assignment_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        n = int(rng.integers(1, 5))
+        m = int(rng.integers(n, 7))
+        costs = rng.integers(0, 6, (n, m))
+        assignment = min_cost_assignment(costs)
+        assert len(set(assignment)) == n
+        best = min(sum(costs[row, columns[row]] for row in range(n))
+                   for columns in itertools.permutations(range(m), n))
+        assert sum(costs[row, assignment[row]] for row in range(n)) == best
+
+def test_assign_beats_greedy_distinct_selection(chooser):
+    cds_list = CDS * 3
+    def total(selected):
+        return sum(chooser.hairpin_scores(cds)[chooser.options.index(rbs)]
+                   + chooser.edit_distances(chooser.translator.run(cds[:18]))[chooser.options.index(rbs)]
+                   for cds, rbs in zip(cds_list, selected))
+
+    assigned = chooser.run_batch(cds_list, distinct=True, optimal=True)
+    assert len(set(assigned)) == len(cds_list)
+    assert total(assigned) <= total(chooser.run_batch(cds_list, distinct=True))
+    assert total(chooser.assign(cds_list[::-1])[::-1]) == total(assigned)
+
+def test_assign_skips_ignored_options(chooser):
+    ignores = set(chooser.options[:-2])
+    assert chooser.assign(CDS, ignores).count(None) == 1
+    assert set(chooser.assign(CDS, ignores)) - {None} == set(chooser.options[-2:])
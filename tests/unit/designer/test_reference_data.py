@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from genedesign import reference_data
+from genedesign.rbs_chooser import RBSChooser
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.seq_utils.dna_encoding import CODONS
+
+def test_datasets_are_loaded_once():
+    assert reference_data.codon_usage() is reference_data.codon_usage()
+    assert reference_data.rbs_table() is reference_data.rbs_table()
+
+def test_codon_usage_is_immutable():
+    usage = reference_data.codon_usage()
+    with pytest.raises(TypeError):
+        usage.frequencies['TTT'] = 1.0
+    with pytest.raises(ValueError):
+        usage.frequency_by_id[0] = 1.0
+
+def test_codon_usage_views_agree():
+    usage = reference_data.codon_usage()
+    assert len(usage.frequencies) == 64
+    for aa, codons in usage.codon_weights.items():
+        for codon, freq in codons:
+            assert usage.amino_acids[codon] == aa
+            assert usage.frequency_by_id[CODONS.index(codon)] == freq == usage.frequencies[codon]
+
+def test_rbs_table_columns():
+    table = reference_data.rbs_table()
+    assert len(table.locus_tags) == len(table.genes) == len(table.utrs) == len(table.cdss) == 187
+    assert (table.locus_tags[0], table.genes[0]) == ("b3495", "uspA")
+
+def test_rbs_options_do_not_accumulate_across_instances():
+    first = RBSChooser()
+    first.initiate()
+    second = RBSChooser()
+    second.initiate()
+    second.initiate()
+    assert len(second.options) == len(first.options) == 187
+
+def test_codon_checker_uses_shared_frequencies():
+    checker = CodonChecker()
+    checker.initiate()
+    assert checker.codon_frequencies is reference_data.codon_usage().frequencies
+    assert np.all(checker.frequency_by_id == np.nan_to_num(reference_data.codon_usage().frequency_by_id, nan=0.01))
+    assert [codon for codon, rare in zip(CODONS, checker.rare_by_id) if rare] == sorted(checker.rare_codons,
+                                                                                         key=CODONS.index)
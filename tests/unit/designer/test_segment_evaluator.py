@@ -0,0 +1,102 @@
+import random
+import numpy as np
+import pytest
+from genedesign.checkers.forbidden_sequence_checker import ForbiddenSequenceChecker
+from genedesign.checkers.internal_promoter_checker import PromoterChecker
+from genedesign.checkers.hairpin_checker import hairpin_checker
+from genedesign.checkers.codon_checker import CodonChecker
+from genedesign.checkers.gc_checker import GCContentChecker
+from genedesign.segment_evaluator import SegmentEvaluator, score_checks, ACCEPT, SCORE, FORBIDDEN_SCORES
+from genedesign.seq_utils.dna_encoding import CODONS, decode_codons
+
+@pytest.fixture(scope="module")
+def evaluator():
+    forbidden_checker = ForbiddenSequenceChecker()
+    forbidden_checker.initiate()
+    promoter_checker = PromoterChecker()
+    promoter_checker.initiate()
+    codon_checker = CodonChecker()
+    codon_checker.initiate()
+    return SegmentEvaluator(forbidden_checker, promoter_checker, codon_checker, GCContentChecker())
+
+def random_candidates(evaluator, count=100, seed=7):
+    rng = random.Random(seed)
+    codons = [codon for codon in evaluator.codon_checker.codon_frequencies if codon not in ("TAA", "TAG", "TGA")]
+    for _ in range(count):
+        yield ([rng.choice(codons) for _ in range(rng.randint(0, 8))],
+               [rng.choice(codons) for _ in range(3)],
+               [rng.choice(codons) for _ in range(rng.randint(0, 8))])
+
+def test_score_mode_matches_individual_checkers(evaluator):
+    for preamble, window, downstream in random_candidates(evaluator):
+        segment = ''.join(preamble + window + downstream)
+        expected = (evaluator.forbidden_checker.run(segment), evaluator.promoter_checker.run(segment),
+                    hairpin_checker(segment), evaluator.codon_checker.run(preamble + window),
+                    evaluator.gc_checker.run(segment))
+
+        evaluator.set_preamble(preamble)
+        evaluation = evaluator.evaluate(window, downstream, SCORE)
+
+        assert evaluation.passed == all(result[0] for result in expected)
+        assert list(evaluation.checks.values()) == [result[0] for result in expected]
+        assert evaluation.metrics['gc_content'] == expected[4][1]
+        assert evaluation.score == score_checks(expected[0][0], expected[1][0], expected[2][0], expected[3], expected[4][0])
+        assert evaluation == evaluator.evaluate_segment(segment, preamble + window, SCORE)
+
+def test_accept_mode_stops_at_first_failure(evaluator):
+    evaluator.set_preamble(["GAA", "TTC"])  # EcoRI site in the preamble
+    evaluation = evaluator.evaluate(["GCT", "GCC", "GCA"], [], ACCEPT)
+
+    assert evaluation.passed == False
+    assert evaluation.checks == {'forbidden': False}
+    assert evaluation.metrics == {'forbidden_site': "GAATTC"}
+    assert evaluation.score is None
+
+def test_unknown_mode(evaluator):
+    evaluator.set_preamble([])
+    with pytest.raises(ValueError):
+        evaluator.evaluate(["GCT"], [], "fast")
+
+def test_evaluate_batch_matches_evaluate(evaluator):
+    rng = random.Random(21)
+    for preamble, _, _ in random_candidates(evaluator, count=30):
+        downstream_length = rng.randint(0, 8)
+        window_ids = np.array([[rng.randrange(len(CODONS)) for _ in range(3)] for _ in range(8)])
+        downstream_ids = np.array([[rng.randrange(len(CODONS)) for _ in range(downstream_length)] for _ in range(8)],
+                                  dtype=np.int64).reshape(8, downstream_length)
+
+        evaluator.set_preamble(preamble)
+        passed, scores = evaluator.evaluate_batch(window_ids, downstream_ids)
+        for row in range(len(window_ids)):
+            evaluation = evaluator.evaluate(decode_codons(window_ids[row]), decode_codons(downstream_ids[row]), SCORE)
+            assert (passed[row], scores[row]) == (evaluation.passed, evaluation.score)
+
+def test_unavoidable_failures_of_the_preamble(evaluator):
+    evaluator.set_preamble(["GCT", "GAA", "TTC", "GCT"])  # EcoRI site in the preamble
+    assert evaluator.unavoidable_failures() == ['forbidden']
+
+    # A GC-only preamble cannot be balanced by three AT-only bases, but can be by thirty
+    evaluator.set_preamble(["GCC", "GGC", "CGC", "GCG"] * 2)
+    assert evaluator.unavoidable_failures((0, 3, 3)) == ['gc']
+    assert evaluator.unavoidable_failures((0, 30, 30)) == []
+
+def test_evaluate_batch_ignores_unavoidable_failures(evaluator):
+    rng = np.random.default_rng(3)
+    sense_ids = [k for k, codon in enumerate(CODONS) if codon not in ("TAA", "TAG", "TGA")]
+    window_ids, downstream_ids = rng.choice(sense_ids, (16, 3)), rng.choice(sense_ids, (16, 4))
+    evaluator.set_preamble(["GCT", "GAA", "TTC", "GCT"])  # EcoRI site in the preamble
+    passed, scores = evaluator.evaluate_batch(window_ids, downstream_ids)
+    ignoring_passed, ignoring_scores = evaluator.evaluate_batch(window_ids, downstream_ids, {'forbidden'})
+
+    assert not passed.any() and ignoring_passed.any()
+    # The forbidden checker fails for every candidate, so ignoring it shifts every score alike
+    assert (ignoring_scores - scores == FORBIDDEN_SCORES[0] - FORBIDDEN_SCORES[1]).all()
+    for row in np.flatnonzero(ignoring_passed):
+        checks = evaluator.evaluate(decode_codons(window_ids[row]), decode_codons(downstream_ids[row]), SCORE).checks
+        assert checks == {'forbidden': False, 'promoter': True, 'hairpin': True, 'codon': True, 'gc': True}
+
+def test_failing_codons_point_at_the_failures(evaluator):
+    evaluator.set_preamble(["GCT", "AAA", "CTG"])
+    assert evaluator.failing_codons(["GCT", "GAA", "TTC"], ["AAA", "CTG"]) == [1, 2]  # EcoRI site
+    assert evaluator.evaluate(["GCT", "GAA", "ACC"], ["AAA", "CTG"], SCORE).passed
+    assert evaluator.failing_codons(["GCT", "GAA", "ACC"], ["AAA", "CTG"]) == []
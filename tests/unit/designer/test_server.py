@@ -0,0 +1,79 @@
+import asyncio
+import json
+import os
+import tempfile
+from genedesign.server import DesignServer
+from genedesign.transcript_designer import TranscriptDesigner
+
+PEPTIDES = ["MYPFIRTARMTVCAKKHVHL", "MSKGEELFTGVVPILV", "MKKKKKKKKHHHH", "MALLSSSLSSQIPTGSHPLT"]
+
+async def request(connect, method, path, body=None):
+    reader, writer = await connect()
+    data = json.dumps(body).encode() if body is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nContent-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(payload)
+
+def run_with_server(scenario, **kwargs):
+    async def main():
+        server = DesignServer(**kwargs)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            return await scenario(server, lambda: asyncio.open_connection('127.0.0.1', port))
+        finally:
+            await server.close()
+    return asyncio.run(main())
+
+def test_concurrent_requests_are_batched_and_match_direct_design():
+    async def scenario(server, connect):
+        return await asyncio.gather(*[request(connect, 'POST', '/design/transcript', {'peptide': p, 'seed': 7})
+                                      for p in PEPTIDES]), server.metrics.snapshot()
+    responses, metrics = run_with_server(scenario)
+
+    designer = TranscriptDesigner()
+    designer.initiate()
+    for peptide, (status, body) in zip(PEPTIDES, responses):
+        expected = designer.run_batch([peptide], seeds=[7])[0].transcript
+        assert status == 200
+        assert body['peptide'] == peptide
+        assert body['codons'] == expected.codons
+        assert body['rbs']['gene_name'] == expected.rbs.gene_name
+    assert metrics['endpoints']['/design/transcript']['count'] == len(PEPTIDES)
+    assert metrics['batches']['max_size'] > 1
+
+def test_operon_health_and_errors():
+    async def scenario(server, connect):
+        operon = await request(connect, 'POST', '/design/operon', {
+            'proteins': PEPTIDES[:3], 'promoter': "TTGACAATTAATCATCGAACTAGTATAAT", 'terminator': "TGCCTGGCGGCAGTAGCGC"})
+        return (operon,
+                await request(connect, 'GET', '/health'),
+                await request(connect, 'GET', '/nowhere'),
+                await request(connect, 'POST', '/design/transcript', {'protein': 'MK'}),
+                await request(connect, 'POST', '/design/transcript', {'peptide': 'MZZ'}),
+                await request(connect, 'GET', '/metrics'))
+    operon, health, missing, malformed, invalid, metrics = run_with_server(scenario)
+
+    status, body = operon
+    assert status == 200
+    assert [t['peptide'] for t in body['transcripts']] == PEPTIDES[:3]
+    assert len({t['rbs']['gene_name'] for t in body['transcripts']}) == 3
+    assert health == (200, {'status': 'ok'})
+    assert missing[0] == 404
+    assert malformed[0] == 400
+    assert invalid[0] == 422
+    assert metrics[1]['endpoints']['/design/transcript']['errors'] == 2
+
+def test_unix_socket():
+    async def main(path):
+        server = DesignServer()
+        await server.start(path=path)
+        try:
+            return await request(lambda: asyncio.open_unix_connection(path), 'GET', '/health')
+        finally:
+            await server.close()
+    with tempfile.TemporaryDirectory() as tmp:
+        assert asyncio.run(main(os.path.join(tmp, 'design.sock'))) == (200, {'status': 'ok'})
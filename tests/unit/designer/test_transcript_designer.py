@@ -0,0 +1,121 @@
+import random
+import numpy as np
+import pytest
+from genedesign.transcript_designer import TranscriptDesigner
+from genedesign.seq_utils.dna_encoding import CODONS
+from genedesign.seq_utils.Translate import Translate
+
+PEPTIDES = ["MYPFIRTARMTVCAKKHVHL", "MKKKKKKKKHHHH", "MSKGEELFTGVVPILV"]
+
+@pytest.fixture(scope="module")
+def designer():
+    designer = TranscriptDesigner()
+    designer.initiate()
+    return designer
+
+def test_run_batch_matches_run(designer):
+    designer.reseed(3)
+    expected = [designer.run(peptide) for peptide in PEPTIDES]
+    designer.reseed(3)
+    results = designer.run_batch(PEPTIDES)
+    assert [result.transcript for result in results] == expected
+    assert all(result.error is None for result in results)
+
+def test_run_batch_reports_errors_per_peptide(designer):
+    results = designer.run_batch([PEPTIDES[0], "MZZ", PEPTIDES[1]])
+    assert [result.peptide for result in results] == [PEPTIDES[0], "MZZ", PEPTIDES[1]]
+    assert results[1].transcript is None and results[1].error is not None
+    assert results[0].transcript is not None and results[2].transcript is not None
+
+def test_run_batch_seeds_make_designs_independent(designer):
+    forward = designer.run_batch(PEPTIDES, seeds=[1, 2, 3])
+    backward = designer.run_batch(PEPTIDES[::-1], seeds=[3, 2, 1])
+    assert [result.transcript for result in forward] == [result.transcript for result in backward[::-1]]
+
+def test_run_batch_distinct_rbs(designer):
+    results = designer.run_batch([PEPTIDES[0]] * 3, seeds=[5, 5, 5], distinct_rbs=True)
+    assert len({result.transcript.rbs for result in results}) == 3
+
+def test_run_batch_selects_rbs_per_peptide_by_default(designer):
+    results = designer.run_batch([PEPTIDES[0]] * 2, seeds=[7, 7])
+    assert results[0].transcript == results[1].transcript
+
+def test_sample_codons_follows_codon_weights(designer):
+    designer.reseed(0)
+    samples = designer.sample_codons("L" * 4, 5000)
+    assert samples.shape == (5000, 4)
+
+    weights = dict(designer.codon_weights['L'])
+    total = sum(weights.values())
+    for codon, weight in weights.items():
+        frequency = (samples == CODONS.index(codon)).mean()
+        assert abs(frequency - weight / total) < 0.02
+
+def test_reseed_ignores_global_random_state(designer):
+    designer.reseed(7)
+    expected = designer.run(PEPTIDES[0])
+    designer.reseed(7)
+    random.seed(123)
+    np.random.seed(123)
+    assert designer.run(PEPTIDES[0]) == expected
+
+def test_run_batch_in_executor_matches_serial(designer):
+    with designer.make_executor(2) as executor:
+        parallel = designer.run_batch(PEPTIDES, seeds=[1, 2, 3], executor=executor)
+    serial = designer.run_batch(PEPTIDES, seeds=[1, 2, 3])
+    assert [result.transcript for result in parallel] == [result.transcript for result in serial]
+
+def test_window_memo_is_reproducible_and_reused():
+    linker = "M" + "GGGGS" * 60
+    memoized = TranscriptDesigner(window_memo_size=4096)
+    memoized.initiate()
+    # A memo holding a single decision recomputes nearly every window, with the same outcome
+    tiny = TranscriptDesigner(window_memo_size=1)
+    tiny.initiate()
+
+    memoized.reseed(3)
+    first = memoized.run(linker)
+    misses = memoized.memo_misses
+    memoized.reseed(3)
+    assert memoized.run(linker) == first
+    assert memoized.memo_misses == misses and memoized.memo_hits >= len(linker) // memoized.window_size
+
+    tiny.reseed(3)
+    assert tiny.run(linker) == first
+    assert len(tiny.window_memo) == 1
+    memoized.reseed(4)
+    assert memoized.run(linker).codons != first.codons
+
+def test_adaptive_search_is_reproducible_and_counts_windows():
+    adaptive = TranscriptDesigner(adaptive_search=True)
+    adaptive.initiate()
+    fixed = TranscriptDesigner()
+    fixed.initiate()
+    translator = Translate()
+    translator.initiate()
+
+    for peptide in PEPTIDES:
+        adaptive.reseed(5)
+        first = adaptive.run(peptide)
+        adaptive.reseed(5)
+        assert adaptive.run(peptide) == first
+        assert translator.run(''.join(first.codons[:-1])) == peptide
+    assert sum(adaptive.window_outcomes.values()) == sum(adaptive.window_attempts.values()) > 0
+    assert set(adaptive.window_outcomes) <= {'passed', 'mutated', 'stagnated', 'intractable', 'exhausted'}
+
+    # Only low-GC codons code for this peptide, so no window can pass the GC check and the adaptive search stops early
+    peptide = "M" + "KFNIY" * 20
+    for designer in (adaptive, fixed):
+        designer.window_attempts.clear()
+        designer.reseed(5)
+        designer.run(peptide)
+    spent = lambda designer: sum(attempts * count for attempts, count in designer.window_attempts.items())
+    assert spent(adaptive) < spent(fixed)
+
+def test_min_progress_limits_batches_without_progress():
+    # No batch can raise the best score by a million, so every window stops after its second batch
+    designer = TranscriptDesigner(adaptive_search=True, min_progress=10 ** 6)
+    designer.initiate()
+    designer.run(PEPTIDES[1])
+    assert max(designer.window_attempts) <= 3 * designer.first_batch_size
+    assert designer.settings['min_progress'] == 10 ** 6
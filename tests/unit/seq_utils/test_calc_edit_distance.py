@@ -0,0 +1,39 @@
+import random
+import pytest
+from genedesign.seq_utils.calc_edit_distance import calculate_edit_distance, EditDistanceIndex
+
+def matrix_edit_distance(s1, s2):
+    dist = [[i + j if i == 0 or j == 0 else 0 for j in range(len(s2) + 1)] for i in range(len(s1) + 1)]
+    for i in range(1, len(s1) + 1):
+        for j in range(1, len(s2) + 1):
+            if s1[i - 1] == s2[j - 1]:
+                dist[i][j] = dist[i - 1][j - 1]
+            else:
+                dist[i][j] = 1 + min(dist[i - 1][j], dist[i][j - 1], dist[i - 1][j - 1])
+    return dist[-1][-1]
+
+@pytest.mark.parametrize("s1, s2, expected", [
+    ("AACAAGATAT", "AACATGATAT", 1),
+    ("AACAAGTTAT", "ATCAAGTTCT", 2),
+    ("", "MSKGEE", 6),
+    ("MSKGEE", "", 6),
+    ("MSKGEE", "MSKGEE", 0),
+    ("KITTEN", "SITTING", 3),
+])
+def test_known_distances(s1, s2, expected):
+    assert calculate_edit_distance(s1, s2) == expected
+
+def test_matches_dynamic_programming():
+    rng = random.Random(9)
+    for _ in range(500):
+        s1 = ''.join(rng.choice("ACDE") for _ in range(rng.randint(0, 80)))
+        s2 = ''.join(rng.choice("ACDEF") for _ in range(rng.randint(0, 80)))
+        assert calculate_edit_distance(s1, s2) == matrix_edit_distance(s1, s2)
+
+def test_index_matches_pairwise_distances():
+    rng = random.Random(134)
+    targets = [''.join(rng.choice("MSKGE") for _ in range(rng.choice([0, 1, 6, 6, 64, 70]))) for _ in range(100)]
+    index = EditDistanceIndex(targets)
+    for _ in range(20):
+        query = ''.join(rng.choice("MSKGEL") for _ in range(rng.randint(0, 8)))
+        assert list(index.distances(query)) == [matrix_edit_distance(target, query) for target in targets]
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+from genedesign.seq_utils.codon_sampler import CodonSampler, build_alias_table
+from genedesign.seq_utils.dna_encoding import CODONS
+
+CODON_WEIGHTS = {
+    'K': [('AAA', 0.76), ('AAG', 0.24)],
+    'L': [('CTG', 0.5), ('TTA', 0.13), ('TTG', 0.13), ('CTT', 0.1), ('CTC', 0.1), ('CTA', 0.04)],
+    'W': [('TGG', 1.0)],
+    'R': [('CGT', 0.36), ('CGC', 0.36), ('AGA', 0.07), ('CGG', 0.1), ('CGA', 0.07), ('AGG', 0.04)],
+}
+
+def test_alias_table_reproduces_weights():
+    weights = [0.5, 0.13, 0.13, 0.1, 0.1, 0.04]
+    prob, alias = build_alias_table(weights)
+    # Each outcome gets its own share of its slot plus the leftovers of the slots aliasing to it
+    implied = prob.copy()
+    for slot in range(len(weights)):
+        implied[alias[slot]] += 1 - prob[slot]
+    assert np.allclose(implied / len(weights), np.array(weights) / sum(weights))
+
+def test_sample_follows_frequencies():
+    sampler = CodonSampler(CODON_WEIGHTS)
+    samples = sampler.sample("LRK", 20000, np.random.default_rng(1))
+    assert samples.shape == (20000, 3)
+    for column, aa in enumerate("LRK"):
+        total = sum(weight for _, weight in CODON_WEIGHTS[aa])
+        for codon, weight in CODON_WEIGHTS[aa]:
+            assert abs((samples[:, column] == CODONS.index(codon)).mean() - weight / total) < 0.015
+
+def test_sample_is_reproducible_per_stream():
+    sampler = CodonSampler(CODON_WEIGHTS)
+    first = sampler.sample("KLWR" * 5, 10, np.random.default_rng(5))
+    np.random.seed(0)
+    assert (sampler.sample("KLWR" * 5, 10, np.random.default_rng(5)) == first).all()
+    assert sampler.sample_one('W', np.random.default_rng(5)) == 'TGG'
+
+def test_unknown_amino_acid_raises():
+    sampler = CodonSampler(CODON_WEIGHTS)
+    with pytest.raises(ValueError):
+        sampler.sample("KZ", 1, np.random.default_rng(0))
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
-from genedesign.seq_utils.hairpin_counter import hairpin_counter
+from genedesign.seq_utils.hairpin_counter import hairpin_counter, count_hairpins, find_hairpins, find_hairpins_batch
+from genedesign.seq_utils.dna_encoding import encode_dna
 
 def test_no_hairpin():
     sequence = "AAAAAAAAAAAAAAAAAAAAAAAAAAA"
@@ -38,3 +40,39 @@ def test_varied_hairpins(sequence):
         assert hairpins is not None, "Expected a hairpin string, but got None."
     else:
         assert hairpins is None, "Expected no hairpin string, but got one."
+
+@pytest.mark.parametrize("sequence", [
+    "",
+    "ACG",
+    "AAAAACCCCCAAAAAAAAGGGGGAAA",
+    "GGCTAATTTAGCCATTAAGGCTAATAGGCTAA",
+    "CCCCCTTTCCCCCCAAACCCCCC",
+    "AAAAACACGAAAAAAAACGTGAAAAAANNNCCCAAAAAAAGGG",
+])
+def test_count_hairpins_matches_hairpin_counter(sequence):
+    count, _ = hairpin_counter(sequence)
+    assert count_hairpins(sequence) == count
+    assert len(find_hairpins(sequence)) == count
+
+def test_find_hairpins_positions():
+    sequence = "AAAAACCCAAAAAAAAAGGGAAAAAA"  # CCC-N9-GGG
+    assert find_hairpins(sequence) == [(5, 17)]
+    assert find_hairpins(sequence, start=6) == []
+
+    count, hairpins = hairpin_counter(sequence)
+    assert hairpins == "Hairpin 1: CCC(AAAAAAAAA)GGG\n"
+
+def test_unknown_bases_do_not_pair():
+    assert count_hairpins("CCCAAAAAGGG") == 1
+    assert count_hairpins("CCCAAAAANGG") == 0
+    assert count_hairpins("CCCNNNNNGGG") == 1  # Unknown bases in the loop are fine
+
+def test_find_hairpins_batch_matches_find_hairpins():
+    sequences = ["AAAAACCCAAAAAAAAAGGGAAAAAA", "GGCTAATTTAGCCATTAAGGCTAATA", "CCCAAAAANGGCCCCCTTTCCCCCCA"]
+    codes = np.stack([encode_dna(sequence) for sequence in sequences])
+    pairs = [[] for _ in sequences]
+    for d, mask in find_hairpins_batch(codes):
+        for row, i in zip(*np.nonzero(mask)):
+            pairs[row].append((int(i), int(i) + d))
+    for sequence, found in zip(sequences, pairs):
+        assert sorted(found) == sorted(find_hairpins(sequence))
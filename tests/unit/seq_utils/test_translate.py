@@ -0,0 +1,52 @@
+import pytest
+from genedesign.seq_utils.Translate import Translate
+
+@pytest.fixture(scope="module")
+def translator():
+    translator = Translate()
+    translator.initiate()
+    return translator
+
+@pytest.mark.parametrize("dna, protein", [
+    ("ATGCGACGTTAA", "MRR"),
+    ("ATGTTTCCC", "MFP"),
+    ("", ""),
+    ("TGA", ""),
+])
+def test_run(translator, dna, protein):
+    assert translator.run(dna) == protein
+
+@pytest.mark.parametrize("dna, message", [
+    ("ATGTT", "multiple of 3"),
+    ("ATGTTTTGACCC", "after stop codon"),
+    ("ATGNNNTGA", "Invalid codon 'NNN'"),
+    ("ATGatgTGA", "Invalid codon 'atg'"),
+    ("ATGTGANNN", "after stop codon"),
+    ("ATGNNNTGACCC", "Invalid codon 'NNN'"),
+])
+def test_run_errors(translator, dna, message):
+    with pytest.raises(ValueError, match=message):
+        translator.run(dna)
+
+def test_run_batch_matches_run(translator):
+    sequences = ["ATGCGACGTTAA", "ATGTTTCCC", "", "GCTGGGATGCCCCCCCGTATGTAG", "TAA"]
+    assert translator.run_batch(sequences) == [translator.run(seq) for seq in sequences]
+
+def test_run_batch_raises_for_first_bad_sequence(translator):
+    with pytest.raises(ValueError, match="Invalid codon 'NNN'"):
+        translator.run_batch(["ATGCCC", "ATGNNN", "ATGTT"])
+    with pytest.raises(ValueError, match="multiple of 3"):
+        translator.run_batch(["ATGCCC", "ATGTT", "ATGNNN"])
+
+@pytest.mark.parametrize("dna, message", [
+    ("GCT" * 60 + "NNN", "Invalid codon 'NNN'"),
+    ("GCT" * 60 + "TAAGCT", "after stop codon"),
+    ("GCT" * 60 + "TAANNN", "after stop codon"),
+])
+def test_long_sequence_errors(translator, dna, message):
+    with pytest.raises(ValueError, match=message):
+        translator.run(dna)
+
+def test_short_and_long_sequences_match_batch(translator):
+    sequences = ["ATGGCTAAACCCGGGTTT", "ATG" + "GCTAAACCC" * 50 + "TGA", "GCT" * 40, "GCT" * 41]
+    assert [translator.run(seq) for seq in sequences] == translator.run_batch(sequences)